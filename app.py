@@ -1,6 +1,10 @@
 import streamlit as st
-from datetime import datetime, timedelta
-import random
+from datetime import date, datetime, timedelta
+from autobot_store import TaskStore, PaymentStore
+from autobot_intents import IntentMatcher, INTENTS, LazyContext, DEFAULT_INTENT
+from autobot_classifier import IntentClassifier, entities
+import autobot_commands
+from autobot_notify import NotificationLog
 
 # ------------------------------
 # Page Config
@@ -10,40 +14,51 @@ st.set_page_config(page_title="AutoBot Dashboard", page_icon="🤖", layout="wid
 # ------------------------------
 # Initialize Session State
 # ------------------------------
+# Tasks and payments are keyed by real dates and keep their own counters
+# (see autobot_store.py), so the sidebar stats never rescan them.
 if "tasks" not in st.session_state:
-    st.session_state.tasks = {
-        (datetime.today()).strftime("%Y-%m-%d"): ["Finish project report", "Team meeting 5 PM"],
-        (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d"): ["Client follow-up", "Submit assignment"]
-    }
+    st.session_state.tasks = TaskStore()
+    for task in ["Finish project report", "Team meeting 5 PM"]:
+        st.session_state.tasks.add(date.today(), task)
+    for task in ["Client follow-up", "Submit assignment"]:
+        st.session_state.tasks.add(date.today() + timedelta(days=1), task)
 
 if "payments" not in st.session_state:
-    st.session_state.payments = [
-        {"name": "Electricity Bill", "amount": "₹800", "due": (datetime.today()).strftime("%Y-%m-%d"), "paid": False},
-        {"name": "Netflix Subscription", "amount": "₹499", "due": (datetime.today() + timedelta(days=2)).strftime("%Y-%m-%d"), "paid": False},
-        {"name": "Internet Bill", "amount": "₹699", "due": (datetime.today() + timedelta(days=5)).strftime("%Y-%m-%d"), "paid": True},
-    ]
-
-if "notifications" not in st.session_state:
-    st.session_state.notifications = []
+    st.session_state.payments = PaymentStore()
+    st.session_state.payments.add("Electricity Bill", "₹800", date.today())
+    st.session_state.payments.add("Netflix Subscription", "₹499", date.today() + timedelta(days=2))
+    st.session_state.payments.add("Internet Bill", "₹699", date.today() + timedelta(days=5), paid=True)
 
 if "user_name" not in st.session_state:
     st.session_state.user_name = "Sabarni Guha"
 
+# Notifications keep only the newest few in memory; everything is appended
+# to the user's own on-disk log that the "older notifications" view pages through.
+if "notifications" not in st.session_state:
+    st.session_state.notifications = NotificationLog(st.session_state.user_name)
+
 # ------------------------------
 # Helper: Update Stats
 # ------------------------------
 def update_stats():
-    today = datetime.today().date()
-    tasks_completed = sum(
-        1 for date, task_list in st.session_state.tasks.items()
-        if datetime.strptime(date, "%Y-%m-%d").date() < today
-    )
-    upcoming_tasks = sum(
-        len(task_list) for date, task_list in st.session_state.tasks.items()
-        if datetime.strptime(date, "%Y-%m-%d").date() >= today
-    )
-    pending_payments = sum(1 for p in st.session_state.payments if not p["paid"])
-    return tasks_completed, upcoming_tasks, pending_payments
+    store = st.session_state.tasks
+    store.roll(date.today())          # no-op unless the day changed since the last rerun
+    return store.completed, store.upcoming, st.session_state.payments.pending
+
+# ------------------------------
+# Apply Queued Chat Commands
+# ------------------------------
+# Commands typed in the chat (see autobot_commands.py) are queued by the Send
+# button and applied here in one batch, before any widget is drawn, so the
+# single rerun shows every change. Payment checkboxes whose state changed
+# drop their stale widget state and pick the new value up again.
+if "pending_commands" in st.session_state:
+    result = autobot_commands.run(st.session_state.pop("pending_commands"),
+                                  st.session_state.tasks, st.session_state.payments)
+    for idx in result["payments"]:
+        st.session_state.pop(f"pay_{idx}", None)
+    st.session_state.notifications.extend(result["lines"])
+    st.session_state.chat_reply = result["lines"]
 
 # ------------------------------
 # Sidebar: Profile + Summary
@@ -74,15 +89,18 @@ st.subheader("📅 Calendar and Task Manager")
 selected_date = st.date_input("Select a date to view tasks", datetime.today())
 selected_date_str = selected_date.strftime("%Y-%m-%d")
 
-tasks = st.session_state.tasks.get(selected_date_str, [])
+tasks = st.session_state.tasks.on(selected_date)
 if tasks:
-    for i, task in enumerate(tasks.copy()):
-        checked = st.checkbox(task, value=False, key=f"task_{selected_date_str}_{i}")
+    done = 0
+    for i, task in enumerate(tasks):
+        # keyed by text too: completing a task shifts the ones after it up
+        checked = st.checkbox(task, value=False, key=f"task_{selected_date_str}_{i}_{task}")
         if checked:
             st.session_state.notifications.append(f"✅ Task '{task}' completed on {selected_date_str}")
-            # Mark it completed by removing from upcoming tasks
-            tasks.remove(task)
-            st.session_state.tasks[selected_date_str] = tasks
+            # Mark it completed by removing it from the open tasks
+            st.session_state.tasks.complete(selected_date, i - done)
+            done += 1
+    tasks = st.session_state.tasks.on(selected_date)
 else:
     st.info("No tasks scheduled for this date.")
 
@@ -90,30 +108,35 @@ else:
 new_task = st.text_input("Add a new task")
 if st.button("➕ Add Task"):
     if new_task.strip() != "":
-        if selected_date_str in st.session_state.tasks:
-            st.session_state.tasks[selected_date_str].append(new_task)
-        else:
-            st.session_state.tasks[selected_date_str] = [new_task]
+        st.session_state.tasks.add(selected_date, new_task)
         st.success(f"Task '{new_task}' added to {selected_date_str}!")
         st.session_state.notifications.append(f"🗓️ New Task Added: {new_task} on {selected_date_str}")
     else:
         st.warning("Please type a task!")
 
+with st.expander("🗓️ Next 7 days"):
+    week = st.session_state.tasks.next_days(7)
+    for day, day_tasks in week:
+        st.markdown(f"**{day.strftime('%a %d %b')}** — " + ", ".join(day_tasks))
+    for p in st.session_state.payments.due_between(date.today(), date.today() + timedelta(days=7), unpaid_only=True):
+        st.markdown(f"💰 **{p['due'].strftime('%a %d %b')}** — {p['name']} ({p['amount']})")
+    if not week:
+        st.caption("No tasks in the next 7 days.")
+
 # ------------------------------
 # Payments Section
 # ------------------------------
 st.subheader("💳 Payments and Dues")
 
 for idx, payment in enumerate(st.session_state.payments):
-    label = f"{payment['name']} — {payment['amount']} — Due: {payment['due']}"
+    label = f"{payment['name']} — {payment['amount']} — Due: {payment['due']:%Y-%m-%d}"
     paid = st.checkbox(label, value=payment["paid"], key=f"pay_{idx}")
 
-    if paid and not payment["paid"]:
-        payment["paid"] = True
-        st.session_state.notifications.append(f"✅ Payment completed: {payment['name']}")
-    elif not paid and payment["paid"]:
-        payment["paid"] = False
-        st.session_state.notifications.append(f"⚠️ Payment marked as pending: {payment['name']}")
+    if st.session_state.payments.set_paid(idx, paid):
+        if paid:
+            st.session_state.notifications.append(f"✅ Payment completed: {payment['name']}")
+        else:
+            st.session_state.notifications.append(f"⚠️ Payment marked as pending: {payment['name']}")
 
 # Add new payment
 with st.expander("➕ Add a new payment"):
@@ -122,12 +145,7 @@ with st.expander("➕ Add a new payment"):
     pay_due = st.date_input("Due Date", datetime.today() + timedelta(days=3))
     if st.button("Add Payment Now"):
         if pay_name.strip() != "" and pay_amount.strip() != "":
-            st.session_state.payments.append({
-                "name": pay_name,
-                "amount": pay_amount,
-                "due": pay_due.strftime("%Y-%m-%d"),
-                "paid": False
-            })
+            st.session_state.payments.add(pay_name, pay_amount, pay_due)
             st.success(f"Payment '{pay_name}' added successfully!")
             st.session_state.notifications.append(f"💰 New Payment Added: {pay_name} due on {pay_due.strftime('%Y-%m-%d')}")
         else:
@@ -138,72 +156,74 @@ with st.expander("➕ Add a new payment"):
 # ------------------------------
 st.subheader("💬 Chat with AutoBot")
 
-claude_responses_map = {
-    "greeting": [
-        "Hii! How can I help you today?",
-        f"Hello {st.session_state.user_name}! What would you like to do?",
-        "Hey there! Ready to manage your tasks and payments?"
-    ],
-    "schedule": [
-        f"Meeting scheduled. Your tasks for {selected_date_str}: {tasks}" if tasks else "Meeting scheduled! Your calendar is free today.",
-        "Meeting confirmed 📅",
-        "Scheduled successfully! Check your agenda 🗓️"
-    ],
-    "remind": [
-        f"Reminder set. Pending payments: {[p['name'] for p in st.session_state.payments if not p['paid']]}",
-        "Got it! I will remind you at the scheduled time ⏰",
-        "Reminder confirmed! You won't forget this task ✅"
-    ],
-    "payment": [
-        f"Payment info: {[p['name']+' ('+p['amount']+')' for p in st.session_state.payments]}",
-        "Payment scheduled successfully 💳",
-        "Payment recorded in your dashboard ✅"
-    ],
-    "task": [
-        f"Task list updated for {selected_date_str}: {tasks}" if tasks else "No tasks yet, but new task added ✅",
-        "New task added to your list 📝",
-        "Task logged successfully! Stay productive 💪"
-    ],
-    "default": [
-        "Got it! ✅",
-        "Understood! Logged successfully 🗒️",
-        "Noted! I’ll keep track of this 📝",
-        "Okay! Added to your dashboard 📌",
-        "Message received! You’re all set 🌟",
-        "Done! Your instructions are saved ✅"
-    ]
-}
+# Intents are matched by one regex compiled once per process (see
+# autobot_intents.py); messages without a keyword go to the offline
+# TF-IDF classifier (autobot_classifier.py). Only the template picked is
+# ever rendered.
+@st.cache_resource
+def intent_matcher():
+    return IntentMatcher(INTENTS)
+
+@st.cache_resource
+def intent_classifier():
+    return IntentClassifier.load()
 
 user_msg = st.text_input("Type your message here")
 if st.button("Send"):
+    commands = autobot_commands.parse(user_msg, date.today(), selected_date)
+    if commands:
+        st.session_state.pending_commands = commands
+        st.rerun()
     if user_msg.strip() != "":
-        user_lower = user_msg.lower()
-        bot_response = random.choice(claude_responses_map["default"])
-
-        # Greeting check first
-        if any(greet in user_lower for greet in ["hi", "hello", "hey", "hii"]):
-            bot_response = random.choice(claude_responses_map["greeting"])
-        else:
-            for key, resp_list in claude_responses_map.items():
-                if key != "greeting" and key in user_lower:
-                    bot_response = random.choice(resp_list)
-                    break
+        context = LazyContext(
+            user=lambda: st.session_state.user_name,
+            day=lambda: selected_date_str,
+            tasks=lambda: tasks,
+            pending=lambda: [p['name'] for p in st.session_state.payments if not p['paid']],
+            payments=lambda: [p['name'] + ' (' + p['amount'] + ')' for p in st.session_state.payments],
+        )
+        intent = intent_matcher().match(user_msg)
+        if intent == DEFAULT_INTENT:
+            intent, _ = intent_classifier().predict(user_msg)
+        bot_response = intent_matcher().render(intent, context)
+        found = entities(user_msg)
 
         st.markdown(f"**AutoBot:** {bot_response}")
+        detected = []
+        if found["date"]:
+            detected.append(f"📅 {found['date']:%a %d %b %Y}")
+        if found["amount"]:
+            detected.append(f"💰 {found['amount']}")
+        if detected:
+            st.caption(" · ".join(detected))
         st.session_state.notifications.append(f"💬 AutoBot says: {bot_response}")
     else:
         st.warning("Please type a message first!")
 
+for line in st.session_state.pop("chat_reply", []):
+    st.markdown(f"**AutoBot:** {line}")
+
 # ------------------------------
 # Notifications Section
 # ------------------------------
 st.subheader("🔔 Notifications")
 if st.session_state.notifications:
-    for note in st.session_state.notifications[-6:]:
+    for note in st.session_state.notifications.latest(6):
         st.info(note)
 else:
     st.write("No notifications yet.")
 
+# Older ones are read back from the log file only while this is switched on
+if st.toggle("🗂️ Show older notifications", key="older_notes"):
+    log = st.session_state.notifications
+    pages = log.pages(10, skip=6)
+    if pages:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="notes_page")
+        for entry in log.page(page - 1, 10, skip=6):
+            st.caption(f"{entry['t'].replace('T', ' ')} — {entry['text']}")
+    else:
+        st.caption("Nothing older yet.")
+
 # ------------------------------
 # Update Stats dynamically
 # ------------------------------
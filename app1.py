@@ -3,8 +3,18 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-import json
 import math
+import numpy as np
+from arena_store import ModelStore, DIMS, DIM_LABELS, BENCHMARKS
+from arena_cache import LRUCache, ResponseCache, SQLiteTier, fingerprint
+from arena_db import ArenaDB, RESPONSE_ORDER, sync, wrote
+import arena_snapshot as snapshot
+from arena_export import (ExportCache, lazy, render, render_bytes, write_json, write_chunks, GZIP_MIME,
+                          TABLE_COLUMNS, table_columns, csv_chunks, markdown_chunks, ndjson_chunks)
+from arena_eval import EchoBackend, HTTPBackend, ECHO_PORT, count_tokens, evaluate, read_prompts
+from arena_scheduler import Scheduler, RATE_LIMITS, DEFAULT_LIMIT
+from arena_analytics import QUANTILES, MIN_SAMPLES, measured_speeds, summary_rows
+from arena_scoring import DEFAULT_WEIGHTS, compute_overall, rescore, score, rank_order, rank_of, slider_weights
 
 # ═══════════════════════════════════════════════════════
 # PAGE CONFIG
@@ -123,8 +133,10 @@ div[data-testid="stMetric"] div[data-testid="stMetricValue"]{
 # CONSTANTS & HELPERS
 # ═══════════════════════════════════════════════════════
 PALETTE = ["#7c6fff","#00d4aa","#ff5e7d","#ffb340","#4dc9f6","#a78bfa","#34d399","#f87171","#60a5fa","#fbbf24"]
-DIMS       = ["accuracy","speed","reasoning","creativity","safety","cost_eff","multilingual","instruction"]
-DIM_LABELS = ["Accuracy","Speed","Reasoning","Creativity","Safety","Cost Eff.","Multilingual","Instruction"]
+LB_PAGE = 25    # leaderboard cards per page
+RS_PAGE = 12    # logged-response cards per page
+GL_THRESHOLD = 50       # above this many points, scatter charts use one WebGL trace
+MAX_CHART_POINTS = 2000 # default cap before scatter points get binned
 
 PRESET_MODELS = [
     dict(name="GPT-4o",provider="OpenAI",version="2024-11",category="Multimodal",
@@ -164,10 +176,6 @@ PRESET_MODELS = [
          notes="Best code model per dollar.",tags=["code","multilingual","efficient"]),
 ]
 
-def compute_overall(m):
-    w = dict(accuracy=.25,speed=.15,reasoning=.22,creativity=.10,safety=.10,cost_eff=.10,multilingual=.05,instruction=.03)
-    return round(sum(m.get(k,0)*v for k,v in w.items()), 1)
-
 # Base layout dict WITHOUT margin — callers add margin themselves
 def pd_():
     return dict(
@@ -196,16 +204,17 @@ def ax_(title="", color="#eeeef8", title_color="#5a5a80", extra=None):
 def col_(i):
     return PALETTE[i % len(PALETTE)]
 
-def make_radar(ml):
+def make_radar(store, rows):
     fig = go.Figure()
     cats = DIM_LABELS + [DIM_LABELS[0]]
-    for i, m in enumerate(ml):
-        vals = [m.get(d, 0) for d in DIMS] + [m.get(DIMS[0], 0)]
+    Z = store.cols(DIMS, rows).tolist()
+    for i, (name, z) in enumerate(zip(store.names(rows), Z)):
+        vals = z + z[:1]
         c = col_(i)
         r = int(c[1:3], 16); g = int(c[3:5], 16); b = int(c[5:7], 16)
         fill = f"rgba({r},{g},{b},0.13)"
         fig.add_trace(go.Scatterpolar(
-            r=vals, theta=cats, fill='toself', name=m["name"],
+            r=vals, theta=cats, fill='toself', name=name,
             line=dict(color=c, width=2.5), fillcolor=fill
         ))
     fig.update_layout(
@@ -226,31 +235,32 @@ def make_radar(ml):
     )
     return fig
 
-def make_heatmap(ml):
-    z = [[m.get(d, 0) for d in DIMS] for m in ml]
-    y = [m["name"] for m in ml]
+def make_heatmap(store, rows):
+    z = store.cols(DIMS, rows)
+    y = store.names(rows)
     fig = go.Figure(go.Heatmap(
         z=z, x=DIM_LABELS, y=y,
         colorscale=[[0,"#0c0c14"],[0.5,"#7c6fff"],[1,"#00d4aa"]],
-        text=[[str(v) for v in row] for row in z],
+        text=z.astype(int).astype(str),
         texttemplate="%{text}", textfont=dict(size=11, family="JetBrains Mono"),
         hovertemplate="%{y} · %{x}: %{z}<extra></extra>", zmin=0, zmax=100
     ))
     fig.update_layout(
         **pd_(),
-        height=max(250, len(ml)*55+80),
+        height=max(250, len(rows)*55+80),
         xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10), side="top"),
         yaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10))
     )
     return fig
 
-def make_bar(ml, key, label):
+def make_bar(store, rows, key, label):
+    y = store.col(key, rows, decimals=1)
     fig = go.Figure(go.Bar(
-        x=[m["name"] for m in ml],
-        y=[m.get(key, 0) for m in ml],
-        text=[str(m.get(key, 0)) for m in ml],
+        x=store.names(rows),
+        y=y,
+        text=[f"{v:g}" for v in y.tolist()],
         textposition="outside",
-        marker=dict(color=[col_(i) for i in range(len(ml))], line=dict(color="rgba(0,0,0,0)")),
+        marker=dict(color=[col_(i) for i in range(len(rows))], line=dict(color="rgba(0,0,0,0)")),
         textfont=dict(color="#eeeef8", family="JetBrains Mono", size=11)
     ))
     fig.update_layout(
@@ -262,23 +272,75 @@ def make_bar(ml, key, label):
     )
     return fig
 
-def make_bubble(ml):
-    fig = go.Figure()
-    for i, m in enumerate(ml):
-        fig.add_trace(go.Scatter(
-            x=[m.get("price_in", 0)],
-            y=[m.get("overall", 0)],
-            mode="markers+text",
-            name=m["name"],
-            text=[m["name"]],
-            textposition="top center",
-            marker=dict(
-                size=max(m.get("context", 10000)/15000, 12),
-                color=col_(i), opacity=0.85,
-                line=dict(color="#eeeef8", width=1)
-            ),
-            textfont=dict(color="#eeeef8", family="JetBrains Mono", size=10)
+def _grid_bins(x, y, bins):
+    """Bin points into a bins × bins grid → (centre x, centre y, count) per non-empty cell."""
+    xi = np.clip(((x - x.min()) / (np.ptp(x) or 1) * bins).astype(np.int64), 0, bins - 1)
+    yi = np.clip(((y - y.min()) / (np.ptp(y) or 1) * bins).astype(np.int64), 0, bins - 1)
+    _, inv, counts = np.unique(xi * bins + yi, return_inverse=True, return_counts=True)
+    return np.bincount(inv, weights=x) / counts, np.bincount(inv, weights=y) / counts, counts
+
+def large_scatter(x, y, names, sizes, symbol, max_points):
+    """Traces for a big scatter: one Scattergl with per-point colours and labels.
+
+    Above ``max_points`` only the best quarter by ``y`` stays exact; the rest
+    is binned into a count grid drawn as a second, muted Scattergl trace.
+    Only the ten best points get an on-chart label, every point keeps its
+    name in the hover.
+    """
+    n = len(y)
+    names = np.asarray(names, dtype=object)
+    colors = np.array([col_(i) for i in range(n)], dtype=object)
+    by_score = np.argsort(-y, kind="stable")
+    exact = np.sort(by_score[:max_points // 4]) if n > max_points else np.arange(n)
+    labels = np.full(n, "", dtype=object)
+    labels[by_score[:10]] = names[by_score[:10]]
+    traces = [go.Scattergl(
+        x=x[exact], y=y[exact],
+        mode="markers+text",
+        text=labels[exact], hovertext=names[exact], hoverinfo="text+x+y",
+        textposition="top center",
+        marker=dict(size=sizes[exact], color=colors[exact], symbol=symbol, opacity=0.85,
+                    line=dict(color="#eeeef8", width=1)),
+        textfont=dict(color="#eeeef8", family="JetBrains Mono", size=10)
+    )]
+    if n > max_points:
+        rest = np.setdiff1d(np.arange(n), exact, assume_unique=True)
+        is_date = x.dtype.kind == "M"
+        xv = x[rest].astype(np.int64).astype(np.float64) if is_date else x[rest].astype(np.float64)
+        cx, cy, counts = _grid_bins(xv, y[rest].astype(np.float64), int(np.sqrt(max_points - len(exact))))
+        traces.append(go.Scattergl(
+            x=cx.astype(np.int64).astype(x.dtype) if is_date else cx, y=cy,
+            mode="markers",
+            hovertext=[f"{c} models" for c in counts.tolist()], hoverinfo="text+x+y",
+            marker=dict(size=np.clip(4 + 3 * np.log2(counts), 4, 30), color="#5a5a80", opacity=0.5,
+                        symbol=symbol)
         ))
+    return traces
+
+def make_bubble(store, rows, max_points=MAX_CHART_POINTS):
+    fig = go.Figure()
+    names   = store.names(rows)
+    price   = store.col("price_in", rows, decimals=4)
+    overall = store.col("overall", rows, decimals=1)
+    context = store.col("context", rows)
+    if len(names) > GL_THRESHOLD:
+        fig.add_traces(large_scatter(price, overall, names, np.maximum(context / 15000, 12), "circle", max_points))
+    else:
+        for i, name in enumerate(names):
+            fig.add_trace(go.Scatter(
+                x=[price[i]],
+                y=[overall[i]],
+                mode="markers+text",
+                name=name,
+                text=[name],
+                textposition="top center",
+                marker=dict(
+                    size=max(context[i]/15000, 12),
+                    color=col_(i), opacity=0.85,
+                    line=dict(color="#eeeef8", width=1)
+                ),
+                textfont=dict(color="#eeeef8", family="JetBrains Mono", size=10)
+            ))
     fig.update_layout(
         **pd_(),
         height=380,
@@ -294,24 +356,31 @@ def make_bubble(ml):
     )
     return fig
 
-def make_timeline(ml):
-    rows = [m for m in ml if m.get("release_date")]
+def make_timeline(store, rows, max_points=MAX_CHART_POINTS):
+    rows = [i for i in rows if store[i].get("release_date")]
     if not rows:
         return None
-    rows.sort(key=lambda m: m["release_date"])
+    rows.sort(key=lambda i: store[i]["release_date"])
+    overall = store.col("overall", rows, decimals=1)
     fig = go.Figure()
-    for i, m in enumerate(rows):
-        fig.add_trace(go.Scatter(
-            x=[m["release_date"]],
-            y=[m.get("overall", 0)],
-            mode="markers+text",
-            name=m["name"],
-            text=[m["name"]],
-            textposition="top center",
-            marker=dict(size=14, color=col_(i), symbol="diamond",
-                        line=dict(color="#eeeef8", width=1)),
-            textfont=dict(color="#eeeef8", family="JetBrains Mono", size=10)
-        ))
+    if len(rows) > GL_THRESHOLD:
+        dates = pd.to_datetime([store[i]["release_date"] for i in rows], errors="coerce").to_numpy()
+        ok = ~np.isnat(dates)
+        names = np.asarray(store.names(rows), dtype=object)[ok]
+        fig.add_traces(large_scatter(dates[ok], overall[ok], names, np.full(len(names), 14), "diamond", max_points))
+    else:
+        for i, m in enumerate(store.take(rows)):
+            fig.add_trace(go.Scatter(
+                x=[m["release_date"]],
+                y=[overall[i]],
+                mode="markers+text",
+                name=m["name"],
+                text=[m["name"]],
+                textposition="top center",
+                marker=dict(size=14, color=col_(i), symbol="diamond",
+                            line=dict(color="#eeeef8", width=1)),
+                textfont=dict(color="#eeeef8", family="JetBrains Mono", size=10)
+            ))
     fig.update_layout(
         **pd_(),
         height=320,
@@ -327,6 +396,106 @@ def make_timeline(ml):
     )
     return fig
 
+def make_benchmarks(store, rows):
+    fig = go.Figure()
+    names = store.names(rows)
+    for bench, bc in [("mmlu","#7c6fff"),("gsm8k","#00d4aa"),("humaneval","#ffb340")]:
+        vals = store.col(bench, rows, decimals=1)
+        fig.add_trace(go.Bar(
+            name=bench.upper(),
+            x=names,
+            y=vals,
+            marker_color=bc,
+            text=[f"{v:.1f}" for v in vals.tolist()],
+            textposition="outside",
+            textfont=dict(color="#eeeef8", size=10)
+        ))
+    fig.update_layout(
+        barmode="group", **pd_(), height=300,
+        yaxis=dict(range=[0,115], gridcolor="#1f1f38", tickfont=dict(color="#5a5a80", size=10)),
+        xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10)),
+        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color="#eeeef8"))
+    )
+    return fig
+
+def make_parcoords(store, rows):
+    par = store.cols(DIMS + ["overall"], rows)
+    fig = go.Figure(go.Parcoords(
+        line=dict(color=par[:, -1],
+                  colorscale=[[0,"#1f1f38"],[0.5,"#7c6fff"],[1,"#00d4aa"]],
+                  showscale=True),
+        dimensions=[dict(label=l, values=par[:, j]) for j, l in enumerate(DIM_LABELS)] +
+                   [dict(label="Overall", values=par[:, -1])]
+    ))
+    fig.update_layout(**pd_(), height=320)
+    return fig
+
+def make_pricing(store, rows):
+    names = store.names(rows)
+    p_in, p_out = store.col("price_in", rows, decimals=4), store.col("price_out", rows, decimals=4)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name="Input $/1M", x=names, y=p_in,
+        marker_color="#7c6fff",
+        text=[f'${v:.2f}' for v in p_in.tolist()],
+        textposition="outside", textfont=dict(color="#eeeef8", size=10)
+    ))
+    fig.add_trace(go.Bar(
+        name="Output $/1M", x=names, y=p_out,
+        marker_color="#00d4aa",
+        text=[f'${v:.2f}' for v in p_out.tolist()],
+        textposition="outside", textfont=dict(color="#eeeef8", size=10)
+    ))
+    fig.update_layout(
+        barmode="group", **pd_(), height=300,
+        yaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#5a5a80", size=10)),
+        xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10)),
+        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color="#eeeef8"))
+    )
+    return fig
+
+# ── figure cache ────────────────────────────────────
+# One LRU per server process, shared by every session: a figure is a pure
+# function of (builder, model slice, params), so identical inputs reuse the
+# already-built Figure instead of rebuilding it on every rerun.
+@st.cache_resource
+def figure_cache():
+    return LRUCache(max_entries=256, max_bytes=64 * 2**20)
+
+# ── response cache ──────────────────────────────────
+# Eval answers keyed on (model, prompt, backend params): an in-memory LRU per
+# process in front of a table in arena.db, so a repeat run is free even after
+# a restart. Entries live for a day.
+@st.cache_resource
+def response_cache():
+    return ResponseCache(disk=SQLiteTier(arena_db().path, ttl=24 * 3600))
+
+def _fig_bytes(fig):
+    return len(fig.to_json()) if fig is not None else 0
+
+def chart(builder, store, rows, *params, extra=()):
+    """``builder(store, rows, *params)``, memoized on a content hash of its inputs."""
+    rows = np.asarray(rows, dtype=np.intp)
+    key = fingerprint(builder.__name__, store.X[rows], store.names(rows), params, extra)
+    return figure_cache().get_or_build(key, lambda: builder(store, rows, *params), sizeof=_fig_bytes)
+
+# ── table gradient ──────────────────────────────────
+# dark purple (#1a1535) → bright purple (#7c6fff), pre-rendered as a CSS lookup
+# table so a whole column is coloured with one NumPy index instead of a
+# Python call per cell.
+GRADIENT_LEVELS = 256
+_ratio = np.linspace(0.0, 1.0, GRADIENT_LEVELS)
+GRADIENT_CSS = np.array([
+    f"background-color: rgb({r},{g},{b}); color: {t}; font-weight: 600;"
+    for r, g, b, t in zip((26 + _ratio * (124 - 26)).astype(int), (21 + _ratio * (111 - 21)).astype(int),
+                          (53 + _ratio * (255 - 53)).astype(int), np.where(_ratio > 0.3, "#eeeef8", "#8888b0"))
+], dtype=object)
+
+def gradient_css(values, lo, hi):
+    """Cell CSS for ``values`` placed on the gradient between ``lo`` and ``hi``."""
+    ratio = np.clip((values - lo) / (hi - lo + 1e-9), 0.0, 1.0)
+    return GRADIENT_CSS[(ratio * (GRADIENT_LEVELS - 1)).round().astype(np.int64)]
+
 def score_ring_html(score, color, size=80):
     r = (size - 10) / 2
     circ = 2 * math.pi * r
@@ -342,15 +511,32 @@ def score_ring_html(score, color, size=80):
 # ═══════════════════════════════════════════════════════
 # SESSION STATE
 # ═══════════════════════════════════════════════════════
+# One SQLite handle (and connection pool) per server process; sessions share
+# the catalog and response log through it and reload only what changed.
+@st.cache_resource
+def arena_db():
+    return ArenaDB()
+
 for k, v in {
-    "models": [],
+    "models": ModelStore(),
     "prompt": "",
-    "responses": {},
-    "weights": {d: 1.0 for d in DIMS}
+    "response_stats": {},         # {model: ModelStats}, aggregated in the DB as responses are logged
+    "weights": {d: 1.0 for d in DIMS},
+    "applied_weights": DEFAULT_WEIGHTS,  # last weights passed to rescore (Apply Weights)
+    "profiles": {},               # saved weight profiles, {name: {dim: weight}}
+    "lazy_tabs": True,            # only build the open tab on each rerun
+    "max_points": MAX_CHART_POINTS,
+    "exports": ExportCache(),     # download payloads for the current store.version
 }.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+db = arena_db()
+sync(st.session_state, db, {
+    "models":    ("models",    lambda: ModelStore(db.load_models())),
+    "responses": ("response_stats", db.load_response_stats),
+})
+
 # ═══════════════════════════════════════════════════════
 # SIDEBAR
 # ═══════════════════════════════════════════════════════
@@ -363,16 +549,16 @@ with st.sidebar:
 
     cp1, cp2 = st.columns(2)
     if cp1.button("Load Presets", use_container_width=True):
-        ps = []
-        for p in PRESET_MODELS:
-            p2 = p.copy()
-            p2["overall"] = compute_overall(p2)
-            ps.append(p2)
-        st.session_state.models = ps
+        st.session_state.models.replace(p.copy() for p in PRESET_MODELS)
+        rescore(st.session_state.models)
+        st.session_state.applied_weights = DEFAULT_WEIGHTS
+        wrote(st.session_state, "models", db.save_models(st.session_state.models.records), replaced=True)
         st.rerun()
     if cp2.button("Clear All", use_container_width=True):
-        st.session_state.models = []
-        st.session_state.responses = {}
+        st.session_state.models.clear()
+        wrote(st.session_state, "models", db.save_models([]), replaced=True)
+        wrote(st.session_state, "responses", db.clear_responses(), replaced=True)
+        st.session_state.response_stats = {}
         st.rerun()
 
     st.divider()
@@ -437,6 +623,7 @@ with st.sidebar:
                     )
                     m["overall"] = compute_overall(m)
                     st.session_state.models.append(m)
+                    wrote(st.session_state, "models", db.add_models([m]))
                     st.success(f"✓ {name} added!")
                     st.rerun()
 
@@ -450,16 +637,27 @@ with st.sidebar:
                     0.1, key=f"w_{d}"
                 )
             if st.button("Apply Weights", use_container_width=True):
-                w = st.session_state.weights
-                total = sum(w.values()) or 1
-                for m in st.session_state.models:
-                    m["overall"] = round(sum(m.get(d, 0) * w[d] / total * 8 for d in DIMS), 1)
+                st.session_state.applied_weights = slider_weights(st.session_state.weights)
+                rescore(st.session_state.models, st.session_state.applied_weights)
+                wrote(st.session_state, "models", db.save_models(st.session_state.models.records), replaced=True)
+                st.rerun()
+            pn1, pn2 = st.columns([3, 2])
+            profile_name = pn1.text_input("Profile name", placeholder="e.g. cheap & fast",
+                                          label_visibility="collapsed")
+            if pn2.button("Save Profile", use_container_width=True) and profile_name.strip():
+                st.session_state.profiles[profile_name.strip()] = slider_weights(st.session_state.weights)
                 st.rerun()
 
+    st.toggle("Lazy tabs", key="lazy_tabs",
+              help="Only build the open tab on each rerun instead of all ten.")
+    st.number_input("Max plotted points", 200, 100_000, step=200, key="max_points",
+                    help=f"Value map and timeline switch to a single WebGL trace above {GL_THRESHOLD} "
+                         "models and bin everything past this many points.")
+
 # ═══════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════
-models = st.session_state.models
+models = store = st.session_state.models
 
 st.markdown("""
 <div style="text-align:center;padding:2rem 0 1.5rem">
@@ -476,8 +674,11 @@ if not models:
     </div>""", unsafe_allow_html=True)
     st.stop()
 
-sorted_models = sorted(models, key=lambda m: m["overall"], reverse=True)
-winner = sorted_models[0]
+def ranked_rows():
+    """Every row, best overall first — read off the rank index, no re-sort."""
+    return np.asarray(store.top(), dtype=np.intp)
+
+winner = store[store.top(1)[0]]
 
 # Hero strip
 license_chip = "green" if winner.get("open_source") else "yellow"
@@ -519,23 +720,27 @@ st.markdown(f"""
 kc = st.columns(6)
 kc[0].metric("Models", len(models))
 kc[1].metric("Leader Score", f"{winner['overall']}")
-kc[2].metric("Avg Accuracy", f"{sum(m.get('accuracy',0) for m in models)/len(models):.1f}")
-kc[3].metric("Lowest Cost", f"${min(m.get('price_in',999) for m in models):.2f}/1M")
-kc[4].metric("Max Context", f"{max(m.get('context',0) for m in models)//1000}K")
-kc[5].metric("Open Source", sum(1 for m in models if m.get("open_source")))
+kc[2].metric("Avg Accuracy", f"{store.col('accuracy').mean():.1f}")
+kc[3].metric("Lowest Cost", f"${store.col('price_in').min():.2f}/1M")
+kc[4].metric("Max Context", f"{int(store.col('context').max())//1000}K")
+kc[5].metric("Open Source", int(store.col("open_source").sum()))
 
 st.markdown("<div style='height:.5rem'></div>", unsafe_allow_html=True)
 
 # ═══════════════════════════════════════════════════════
 # TABS
 # ═══════════════════════════════════════════════════════
-tabs = st.tabs(["📊 Leaderboard","🕸 Radar & Heat","📈 Analytics","💰 Cost Lab",
-                "💬 Responses","⚔️ Head-to-Head","📅 Timeline","🔬 Deep Dive","📋 Full Data"])
+# Each tab body is a render_* function; the tab strip at the bottom of the
+# page decides which of them actually run on a given rerun.
 
 # ── TAB 0: LEADERBOARD ──────────────────────────────
-with tabs[0]:
+def render_leaderboard():
+    order = ranked_rows()
     st.markdown('<p class="section-label" style="margin-top:.5rem">RANKED LEADERBOARD</p>', unsafe_allow_html=True)
-    for rank, m in enumerate(sorted_models):
+    n_pages = (len(store) - 1) // LB_PAGE + 1
+    lb_page = min(st.session_state.get("lb_page", 0), n_pages - 1)
+    lb_start = lb_page * LB_PAGE
+    for rank, m in enumerate(store.take(store.top(LB_PAGE, lb_start)), lb_start):
         color = col_(rank)
         pct = min(int(m["overall"]), 100)
         medal = ["🥇","🥈","🥉"][rank] if rank < 3 else f"#{rank+1}"
@@ -577,50 +782,50 @@ with tabs[0]:
           </div>
         </div>""", unsafe_allow_html=True)
 
-    bench_data = [m for m in sorted_models if m.get("mmlu",0)>0 or m.get("gsm8k",0)>0 or m.get("humaneval",0)>0]
-    if bench_data:
-        st.markdown('<p class="section-label" style="margin-top:1.5rem">BENCHMARK SCORES</p>', unsafe_allow_html=True)
-        fig_b = go.Figure()
-        for bench, bc in [("mmlu","#7c6fff"),("gsm8k","#00d4aa"),("humaneval","#ffb340")]:
-            fig_b.add_trace(go.Bar(
-                name=bench.upper(),
-                x=[m["name"] for m in bench_data],
-                y=[m.get(bench, 0) for m in bench_data],
-                marker_color=bc,
-                text=[f"{m.get(bench,0):.1f}" for m in bench_data],
-                textposition="outside",
-                textfont=dict(color="#eeeef8", size=10)
-            ))
-        fig_b.update_layout(
-            barmode="group", **pd_(), height=300,
-            yaxis=dict(range=[0,115], gridcolor="#1f1f38", tickfont=dict(color="#5a5a80", size=10)),
-            xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10)),
-            legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color="#eeeef8"))
+    if n_pages > 1:
+        pg1, pg2, pg3 = st.columns([1, 2, 1])
+        if pg1.button("◀ Prev", use_container_width=True, disabled=lb_page == 0, key="lb_prev"):
+            st.session_state.lb_page = lb_page - 1
+            st.rerun()
+        pg2.markdown(
+            f'<div style="text-align:center;font-family:JetBrains Mono,monospace;font-size:.75rem;color:#5a5a80;padding-top:.5rem">'
+            f'#{lb_start+1}–{min(lb_start+LB_PAGE, len(store))} of {len(store)} · page {lb_page+1}/{n_pages}</div>',
+            unsafe_allow_html=True
         )
-        st.plotly_chart(fig_b, use_container_width=True, config={"displayModeBar": False})
+        if pg3.button("Next ▶", use_container_width=True, disabled=lb_page >= n_pages - 1, key="lb_next"):
+            st.session_state.lb_page = lb_page + 1
+            st.rerun()
+
+    bench_rows = order[(store.cols(BENCHMARKS, order) > 0).any(axis=1)]
+    if len(bench_rows):
+        st.markdown('<p class="section-label" style="margin-top:1.5rem">BENCHMARK SCORES</p>', unsafe_allow_html=True)
+        st.plotly_chart(chart(make_benchmarks, store, bench_rows), use_container_width=True, config={"displayModeBar": False})
 
 # ── TAB 1: RADAR & HEAT ─────────────────────────────
-with tabs[1]:
+def render_radar_heat():
+    order = ranked_rows()
     cr, ch = st.columns([1, 1])
     with cr:
         st.markdown('<p class="section-label">RADAR CHART</p>', unsafe_allow_html=True)
         sel_r = st.multiselect(
             "Models",
-            [m["name"] for m in models],
-            default=[m["name"] for m in models[:min(4, len(models))]],
+            store.names(),
+            default=store.names(range(min(4, len(models)))),
             key="radar_sel"
         )
-        selected_radar = [m for m in models if m["name"] in sel_r]
+        sel_set = set(sel_r)
+        selected_radar = [i for i, n in enumerate(store.names()) if n in sel_set]
         if selected_radar:
-            st.plotly_chart(make_radar(selected_radar), use_container_width=True, config={"displayModeBar": False})
+            st.plotly_chart(chart(make_radar, store, selected_radar), use_container_width=True, config={"displayModeBar": False})
         else:
             st.info("Select at least one model to display the radar chart.")
     with ch:
         st.markdown('<p class="section-label">PERFORMANCE HEATMAP</p>', unsafe_allow_html=True)
-        st.plotly_chart(make_heatmap(sorted_models), use_container_width=True, config={"displayModeBar": False})
+        st.plotly_chart(chart(make_heatmap, store, order), use_container_width=True, config={"displayModeBar": False})
 
 # ── TAB 2: ANALYTICS ────────────────────────────────
-with tabs[2]:
+def render_analytics():
+    order = ranked_rows()
     st.markdown('<p class="section-label">PER-METRIC BREAKDOWN</p>', unsafe_allow_html=True)
     for row_i in range(2):
         cols_row = st.columns(4)
@@ -629,63 +834,50 @@ with tabs[2]:
             if dim_idx < len(DIMS):
                 d, l = DIMS[dim_idx], DIM_LABELS[dim_idx]
                 with cols_row[col_i]:
-                    st.plotly_chart(make_bar(sorted_models, d, l), use_container_width=True, config={"displayModeBar": False})
+                    st.plotly_chart(chart(make_bar, store, order, d, l), use_container_width=True, config={"displayModeBar": False})
 
     if len(models) >= 2:
         st.markdown('<p class="section-label" style="margin-top:1rem">PARALLEL COORDINATES</p>', unsafe_allow_html=True)
-        df_par = pd.DataFrame([{**{d: m.get(d,0) for d in DIMS}, "overall": m.get("overall",0)} for m in models])
-        fig_par = go.Figure(go.Parcoords(
-            line=dict(color=df_par["overall"],
-                      colorscale=[[0,"#1f1f38"],[0.5,"#7c6fff"],[1,"#00d4aa"]],
-                      showscale=True),
-            dimensions=[dict(label=l, values=df_par[d]) for d, l in zip(DIMS, DIM_LABELS)] +
-                       [dict(label="Overall", values=df_par["overall"])]
-        ))
-        fig_par.update_layout(**pd_(), height=320)
-        st.plotly_chart(fig_par, use_container_width=True, config={"displayModeBar": False})
+        st.plotly_chart(chart(make_parcoords, store, range(len(store))), use_container_width=True, config={"displayModeBar": False})
+
+    st.markdown('<p class="section-label" style="margin-top:1rem">WEIGHT PROFILES · SIDE BY SIDE</p>', unsafe_allow_html=True)
+    profiles = {"Default": DEFAULT_WEIGHTS, "Sliders": slider_weights(st.session_state.weights),
+                **st.session_state.profiles}
+    sel_p = st.multiselect("Profiles", list(profiles), default=list(profiles)[:4], key="profile_sel")
+    if sel_p:
+        S = score(store.X, [profiles[p] for p in sel_p])          # N × K in one product
+        prof_order = rank_order(S[:, 0])
+        df_prof = pd.DataFrame({"Model": store.names(prof_order)})
+        for k, p in enumerate(sel_p):
+            df_prof[p] = S[prof_order, k]
+            df_prof[f"{p} rank"] = rank_of(S[:, k])[prof_order]
+        st.dataframe(df_prof, use_container_width=True, hide_index=True, height=min(420, 38 + 35 * len(df_prof)))
 
 # ── TAB 3: COST LAB ─────────────────────────────────
-with tabs[3]:
+def render_cost_lab():
+    order = ranked_rows()
     cl1, cl2 = st.columns([3, 2])
     with cl1:
         st.markdown('<p class="section-label">VALUE MAP: COST VS. SCORE</p>', unsafe_allow_html=True)
-        st.plotly_chart(make_bubble(sorted_models), use_container_width=True, config={"displayModeBar": False})
+        st.plotly_chart(chart(make_bubble, store, order, st.session_state.max_points), use_container_width=True, config={"displayModeBar": False})
     with cl2:
         st.markdown('<p class="section-label">COST EFFICIENCY RANKING</p>', unsafe_allow_html=True)
-        for i, m in enumerate(sorted(models, key=lambda m: m.get("cost_eff",0), reverse=True)):
-            pct = m.get("cost_eff", 0)
+        ce_order = np.argsort(-store.col("cost_eff"), kind="stable")
+        ce_vals  = store.col("cost_eff", ce_order).astype(int).tolist()
+        for i, (name, pct) in enumerate(zip(store.names(ce_order), ce_vals)):
             c = col_(i)
             st.markdown(
                 f'<div style="margin-bottom:.7rem">'
                 f'<div style="display:flex;justify-content:space-between;margin-bottom:.25rem">'
-                f'<span style="font-family:JetBrains Mono,monospace;font-size:.78rem">{m["name"]}</span>'
+                f'<span style="font-family:JetBrains Mono,monospace;font-size:.78rem">{name}</span>'
                 f'<span style="font-family:Outfit,sans-serif;font-weight:800;color:{c}">{pct}</span></div>'
                 f'<div class="rank-bar"><div class="rank-bar-fill" style="width:{pct}%;background:{c}"></div></div></div>',
                 unsafe_allow_html=True
             )
 
     st.markdown('<p class="section-label">PRICING COMPARISON ($/1M TOKENS)</p>', unsafe_allow_html=True)
-    sp = sorted(models, key=lambda m: m.get("price_in", 0))
-    fig_p = go.Figure()
-    fig_p.add_trace(go.Bar(
-        name="Input $/1M", x=[m["name"] for m in sp], y=[m.get("price_in",0) for m in sp],
-        marker_color="#7c6fff",
-        text=[f'${m.get("price_in",0):.2f}' for m in sp],
-        textposition="outside", textfont=dict(color="#eeeef8", size=10)
-    ))
-    fig_p.add_trace(go.Bar(
-        name="Output $/1M", x=[m["name"] for m in sp], y=[m.get("price_out",0) for m in sp],
-        marker_color="#00d4aa",
-        text=[f'${m.get("price_out",0):.2f}' for m in sp],
-        textposition="outside", textfont=dict(color="#eeeef8", size=10)
-    ))
-    fig_p.update_layout(
-        barmode="group", **pd_(), height=300,
-        yaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#5a5a80", size=10)),
-        xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10)),
-        legend=dict(bgcolor="rgba(0,0,0,0)", font=dict(color="#eeeef8"))
-    )
-    st.plotly_chart(fig_p, use_container_width=True, config={"displayModeBar": False})
+    sp = np.argsort(store.col("price_in"), kind="stable")
+    st.plotly_chart(chart(make_pricing, store, sp), use_container_width=True, config={"displayModeBar": False})
 
     st.markdown('<p class="section-label" style="margin-top:1rem">💡 COST CALCULATOR</p>', unsafe_allow_html=True)
     cc1, cc2, cc3, cc4 = st.columns(4)
@@ -696,8 +888,9 @@ with tabs[3]:
     mult = {"Day":1,"Week":7,"Month":30,"Year":365}[days_sel]
     num_calc_cols = min(5, len(models))
     calc_cols = st.columns(num_calc_cols)
-    for i, m in enumerate(sorted_models[:num_calc_cols]):
-        per_call = (in_tok/1_000_000 * m.get("price_in",0)) + (out_tok/1_000_000 * m.get("price_out",0))
+    top = store.top(num_calc_cols)
+    per_calls = (in_tok/1_000_000 * store.col("price_in", top, decimals=4)) + (out_tok/1_000_000 * store.col("price_out", top, decimals=4))
+    for i, (m, per_call) in enumerate(zip(store.take(top), per_calls.tolist())):
         total = per_call * calls * mult
         c = col_(i)
         with calc_cols[i]:
@@ -712,7 +905,7 @@ with tabs[3]:
             )
 
 # ── TAB 4: RESPONSES ────────────────────────────────
-with tabs[4]:
+def render_responses():
     st.markdown('<p class="section-label">SHARED PROMPT</p>', unsafe_allow_html=True)
     prompt = st.text_area("Prompt used to test all models", value=st.session_state.prompt,
                            placeholder="What is the speed of light?", height=80)
@@ -727,7 +920,7 @@ with tabs[4]:
 
     with st.expander("➕ Log a Response", expanded=False):
         rl1, rl2, rl3 = st.columns(3)
-        log_model   = rl1.selectbox("Model", [m["name"] for m in models], key="log_m")
+        log_model   = rl1.selectbox("Model", store.names(), key="log_m")
         log_latency = rl2.number_input("Latency (ms)", 0, 120000, 500)
         log_tokens  = rl3.number_input("Tokens Used", 0, 100000, 500)
         log_text    = st.text_area("Response Text", height=110, placeholder="Paste the model response…")
@@ -736,22 +929,75 @@ with tabs[4]:
         if st.button("Log Response", key="log_btn"):
             if log_text.strip():
                 key = prompt or "general"
-                st.session_state.responses.setdefault(key, []).append(dict(
+                entry = dict(
                     model=log_model, response=log_text, latency=log_latency,
                     tokens=log_tokens, rating=log_rating, notes=log_notes,
                     ts=datetime.now().strftime("%H:%M:%S")
-                ))
+                )
+                db.log_response(key, entry)
                 st.success("Logged!")
                 st.rerun()
             else:
                 st.warning("Paste a response first.")
 
-    resp_models = [m for m in models if m.get("public_resp","").strip()]
-    if resp_models:
+    # Runs fan the prompts out to the selected models concurrently and log the
+    # measured latency / tokens in one batch, so a whole run costs one rerun.
+    with st.expander("⚙️ Run Evaluation", expanded=False):
+        ev1, ev2, ev3 = st.columns([2, 3, 1])
+        ev_backend = ev1.selectbox("Backend", ["Echo (offline mock)", "Local HTTP (OpenAI-compatible)"], key="ev_backend")
+        ev_url = ev2.text_input("Server URL", f"http://127.0.0.1:{ECHO_PORT}", key="ev_url",
+                                disabled=ev_backend.startswith("Echo"),
+                                help="Any local /v1/chat/completions server — or `python arena_eval.py serve`.")
+        ev_conc = ev3.number_input("Concurrency", 1, 64, 8, key="ev_conc", help="Requests in flight per backend.")
+        ev_models = st.multiselect("Models", store.names(), default=store.names(), key="ev_models")
+        ev_file = st.file_uploader("Prompt file (optional)", type=["txt", "jsonl", "json"], key="ev_prompts",
+                                   help="One prompt per line, JSON lines or a JSON array. Without it the shared prompt is used.")
+        ev_prompts = read_prompts(ev_file) if ev_file is not None else [prompt.strip()] if prompt.strip() else []
+        evt1, evt2 = st.columns(2)
+        ev_limits = evt1.toggle("Respect provider rate limits", True, key="ev_limits",
+                                help="Requests/min and tokens/min per provider, with retries and backoff on 429s.")
+        ev_cache = evt2.toggle("Reuse cached answers", True, key="ev_cache",
+                               help="Skip (model, prompt) calls already answered by the same backend in the last 24 h.")
+        if ev_limits:
+            used = sorted({store[store.row(n)].get("provider") or "Custom" for n in ev_models})
+            st.caption(" · ".join(f"{p}: {RATE_LIMITS.get(p, DEFAULT_LIMIT)[0]:,} req/min, "
+                                  f"{RATE_LIMITS.get(p, DEFAULT_LIMIT)[1]:,} tok/min" for p in used[:6])
+                       + (f" · +{len(used) - 6} more" if len(used) > 6 else ""))
+        st.caption(f"{len(ev_prompts):,} prompt(s) × {len(ev_models):,} model(s) = {len(ev_prompts) * len(ev_models):,} request(s)")
+        if st.button("▶ Run Evaluation", key="ev_run", disabled=not (ev_prompts and ev_models)):
+            backend = (EchoBackend(ev_conc) if ev_backend.startswith("Echo")
+                       else HTTPBackend(ev_url, concurrency=ev_conc))
+            sched = Scheduler(None if ev_limits else {}, usage=lambda e: e["tokens"] + count_tokens(e["prompt"]))
+            cache = response_cache() if ev_cache else None
+            hits0 = cache.stats()["hits"] if cache else 0
+            bar = st.progress(0.0, text="Running…")
+            entries, errors = evaluate(store.take([store.row(n) for n in ev_models]), ev_prompts, lambda m: backend,
+                                       lambda done, total: bar.progress(done / total, text=f"{done:,}/{total:,} done"),
+                                       scheduler=sched, cache=cache)
+            if entries:
+                db.log_responses(entries)
+            st.session_state.ev_result = (len(entries), errors, sched.stats,
+                                          cache.stats()["hits"] - hits0 if cache else 0)
+            st.rerun()
+        if "ev_result" in st.session_state:
+            n_ok, ev_errors, ev_stats, n_cached = st.session_state.ev_result
+            if n_ok:
+                st.success(f"Logged {n_ok:,} response(s).")
+            st.caption(f'{ev_stats["requests"]:,} request(s) sent · {n_cached:,} served from cache · '
+                       f'{ev_stats["retries"]:,} retried · {ev_stats["coalesced"]:,} duplicate(s) coalesced'
+                       + (f' · {ev_stats["capped"]:,} Retry-After wait(s) capped' if ev_stats["capped"] else ''))
+            for e in ev_errors[:10]:
+                st.warning(e)
+            if len(ev_errors) > 10:
+                st.caption(f"… and {len(ev_errors) - 10:,} more failed request(s)")
+
+    resp_rows = [i for i, m in enumerate(models) if m.get("public_resp","").strip()]
+    if resp_rows:
         st.markdown('<p class="section-label" style="margin-top:1rem">MODEL OUTPUTS</p>', unsafe_allow_html=True)
-        cols_r = st.columns(min(2, len(resp_models)))
-        for i, m in enumerate(resp_models):
-            c = col_(models.index(m))
+        cols_r = st.columns(min(2, len(resp_rows)))
+        for i, mi in enumerate(resp_rows):
+            m = store[mi]
+            c = col_(mi)
             benchmark_part = (
                 f"<div style='margin-top:.6rem;font-family:JetBrains Mono,monospace;font-size:.7rem;color:#5a5a80'>{m.get('benchmark','')}</div>"
                 if m.get("benchmark") else ""
@@ -772,58 +1018,140 @@ with tabs[4]:
                     unsafe_allow_html=True
                 )
 
-    if st.session_state.responses:
+    # The log stays in SQLite: filters, full-text search and paging run as
+    # one indexed query, and only the visible page is fetched and rendered.
+    logged_models = db.response_models()
+    if logged_models:
         st.markdown('<p class="section-label" style="margin-top:1rem">LOGGED SESSIONS</p>', unsafe_allow_html=True)
-        for prompt_key, entries in st.session_state.responses.items():
-            with st.expander(f"📌 {prompt_key[:80]}"):
-                cols_e = st.columns(min(3, len(entries)))
-                for j, e in enumerate(entries):
-                    mi = next((idx for idx, m in enumerate(models) if m["name"] == e["model"]), j)
-                    c = col_(mi)
-                    notes_e = (
-                        f"<div style='font-family:JetBrains Mono,monospace;font-size:.68rem;color:#5a5a80;margin-top:.4rem'>{e['notes']}</div>"
-                        if e.get("notes") else ""
-                    )
-                    with cols_e[j % len(cols_e)]:
-                        st.markdown(
-                            f'<div class="glass-card" style="border-color:{c}">'
-                            f'<div style="display:flex;justify-content:space-between;margin-bottom:.5rem">'
-                            f'<span style="font-family:Outfit,sans-serif;font-weight:800;color:{c}">{e["model"]}</span>'
-                            f'<span style="font-family:JetBrains Mono,monospace;font-size:.65rem;color:#5a5a80">{e["ts"]}</span></div>'
-                            f'<div style="background:var(--s1);border-radius:8px;padding:.7rem;font-family:JetBrains Mono,monospace;'
-                            f'font-size:.75rem;color:#c8c8e8;line-height:1.6;white-space:pre-wrap;max-height:140px;overflow:auto">'
-                            f'{e["response"][:400]}{"…" if len(e["response"])>400 else ""}</div>'
-                            f'<div style="display:flex;gap:.3rem;margin-top:.5rem;flex-wrap:wrap">'
-                            f'<span class="glow-chip chip-purple">⭐ {e["rating"]}/10</span>'
-                            f'<span class="glow-chip chip-green">⚡ {e["latency"]}ms</span>'
-                            f'<span class="glow-chip chip-yellow">🪙 {e["tokens"]} tok</span></div>'
-                            f'{notes_e}</div>',
-                            unsafe_allow_html=True
-                        )
-
-# ── TAB 5: HEAD-TO-HEAD ─────────────────────────────
-with tabs[5]:
+        rs1, rs2, rs3, rs4, rs5 = st.columns([3, 2, 1.4, 1.4, 1.4])
+        rs_text    = rs1.text_input("Search", placeholder="prompt, response or notes — e.g. hallucinat", key="rs_text")
+        rs_model   = rs2.selectbox("Model", ["All models"] + logged_models, key="rs_model")
+        rs_rating  = rs3.number_input("Min rating", 1, 10, 1, key="rs_rating")
+        rs_latency = rs4.number_input("Max latency (ms)", 0, 120000, 0, step=100, key="rs_latency",
+                                      help="0 = no limit")
+        rs_order   = rs5.selectbox("Sort", list(RESPONSE_ORDER), key="rs_order")
+        filters = dict(text=rs_text, model=None if rs_model == "All models" else rs_model,
+                       min_rating=rs_rating if rs_rating > 1 else None,
+                       max_latency=rs_latency or None, order=rs_order)
+        if st.session_state.get("rs_filters") != filters:       # new query → back to page 1
+            st.session_state.rs_filters = filters
+            st.session_state.rs_page = 0
+        rs_page = st.session_state.get("rs_page", 0)
+        entries, total = db.query_responses(**filters, limit=RS_PAGE, offset=rs_page * RS_PAGE)
+        n_pages = max(1, (total - 1) // RS_PAGE + 1)
+
+        if not entries:
+            st.info("No logged responses match these filters.")
+        cols_e = st.columns(3)
+        for j, e in enumerate(entries):
+            mi = store.row(e["model"])
+            c = col_(j if mi is None else mi)
+            notes_e = (
+                f"<div style='font-family:JetBrains Mono,monospace;font-size:.68rem;color:#5a5a80;margin-top:.4rem'>{e['notes']}</div>"
+                if e.get("notes") else ""
+            )
+            with cols_e[j % 3]:
+                st.markdown(
+                    f'<div class="glass-card" style="border-color:{c};margin-bottom:1rem">'
+                    f'<div style="display:flex;justify-content:space-between;margin-bottom:.3rem">'
+                    f'<span style="font-family:Outfit,sans-serif;font-weight:800;color:{c}">{e["model"]}</span>'
+                    f'<span style="font-family:JetBrains Mono,monospace;font-size:.65rem;color:#5a5a80">{e["ts"]}</span></div>'
+                    f'<div style="font-family:JetBrains Mono,monospace;font-size:.65rem;color:#8888b0;margin-bottom:.5rem">📌 {e["prompt"][:80]}</div>'
+                    f'<div style="background:var(--s1);border-radius:8px;padding:.7rem;font-family:JetBrains Mono,monospace;'
+                    f'font-size:.75rem;color:#c8c8e8;line-height:1.6;white-space:pre-wrap;max-height:140px;overflow:auto">'
+                    f'{e["response"][:400]}{"…" if len(e["response"])>400 else ""}</div>'
+                    f'<div style="display:flex;gap:.3rem;margin-top:.5rem;flex-wrap:wrap">'
+                    f'<span class="glow-chip chip-purple">⭐ {"–" if e["rating"] is None else e["rating"]}/10</span>'
+                    f'<span class="glow-chip chip-green">⚡ {e["latency"]}ms</span>'
+                    f'<span class="glow-chip chip-yellow">🪙 {e["tokens"]} tok</span></div>'
+                    f'{notes_e}</div>',
+                    unsafe_allow_html=True
+                )
+
+        if n_pages > 1:
+            rp1, rp2, rp3 = st.columns([1, 2, 1])
+            if rp1.button("◀ Prev", use_container_width=True, disabled=rs_page == 0, key="rs_prev"):
+                st.session_state.rs_page = rs_page - 1
+                st.rerun()
+            rp2.markdown(
+                f'<div style="text-align:center;font-family:JetBrains Mono,monospace;font-size:.75rem;color:#5a5a80;padding-top:.5rem">'
+                f'{rs_page*RS_PAGE+1}–{min((rs_page+1)*RS_PAGE, total)} of {total} · page {rs_page+1}/{n_pages}</div>',
+                unsafe_allow_html=True
+            )
+            if rp3.button("Next ▶", use_container_width=True, disabled=rs_page >= n_pages - 1, key="rs_next"):
+                st.session_state.rs_page = rs_page + 1
+                st.rerun()
+
+# ── TAB 5: RESPONSE STATS ───────────────────────────
+# Aggregates arrive pre-computed from the DB (one row per model), so this tab
+# costs the same with ten logged responses or ten million.
+def make_latency_bars(rows):
+    fig = go.Figure()
+    for q, c in zip(QUANTILES, ["#00d4aa", "#ffb340", "#ff5e7d"]):
+        col = f"p{round(q * 100)} ms"
+        fig.add_trace(go.Bar(x=[r["Model"] for r in rows], y=[r[col] for r in rows], name=col,
+                             marker=dict(color=c, line=dict(color="rgba(0,0,0,0)"))))
+    fig.update_layout(
+        **pd_(),
+        barmode="group", height=320,
+        legend=dict(bgcolor="rgba(12,12,20,.8)", bordercolor="#1f1f38", font=dict(color="#eeeef8", size=11)),
+        yaxis=dict(type="log", title="latency (ms)", gridcolor="#1f1f38", tickfont=dict(color="#5a5a80", size=10)),
+        xaxis=dict(gridcolor="#1f1f38", tickfont=dict(color="#eeeef8", size=10))
+    )
+    return fig
+
+def render_response_stats():
+    stats = st.session_state.response_stats
+    if not stats:
+        st.info("Log responses in the 💬 Responses tab to see per-model latency, throughput and ratings.")
+        return
+    rows = summary_rows(stats)
+    rs1, rs2, rs3 = st.columns(3)
+    rs1.metric("Responses Logged", f"{sum(s.n for s in stats.values()):,}")
+    rs2.metric("Models Measured", len(stats))
+    rs3.metric("Fastest p50", f'{min(r["p50 ms"] for r in rows):,.0f} ms')
+
+    st.markdown('<p class="section-label" style="margin-top:1rem">LATENCY PERCENTILES</p>', unsafe_allow_html=True)
+    st.plotly_chart(make_latency_bars(rows), use_container_width=True, config={"displayModeBar": False})
+
+    st.markdown('<p class="section-label">PER-MODEL SUMMARY</p>', unsafe_allow_html=True)
+    df_stats = pd.DataFrame(rows)
+    df_stats.insert(len(df_stats.columns) - 1, "Arena speed",
+                    [store[i].get("speed", 0) if (i := store.row(n)) is not None else None for n in df_stats["Model"]])
+    st.dataframe(df_stats, use_container_width=True, hide_index=True, height=min(420, 38 + 35 * len(df_stats)))
+    st.caption("Percentiles come from a streaming sketch (±1% relative error). "
+               "Measured speed maps the median latency onto 0–100 (≤100 ms → 100, 1 s → 70, 10 s → 40).")
+
+    speeds = {n: v for n, v in measured_speeds(stats).items() if store.row(n) is not None}
+    if st.button(f"Apply measured speed to {len(speeds)} Arena model(s)", disabled=not speeds,
+                 help=f"Models with at least {MIN_SAMPLES} logged responses get their speed "
+                      f"dimension (and overall score) from the measured median latency."):
+        for n, v in speeds.items():
+            store.upsert(dict(name=n, speed=v))
+        rescore(store, st.session_state.applied_weights)     # keep any applied weight profile
+        wrote(st.session_state, "models", db.save_models(store.records), replaced=True)
+        st.success(f"Speed updated for {len(speeds)} model(s).")
+        st.rerun()
+
+# ── TAB 6: HEAD-TO-HEAD ─────────────────────────────
+def render_head_to_head():
     if len(models) < 2:
         st.warning("Add at least 2 models.")
     else:
         hh1, hh2 = st.columns(2)
-        m1n = hh1.selectbox("Model A", [m["name"] for m in models], key="hha")
-        remaining = [m["name"] for m in models if m["name"] != m1n]
+        m1n = hh1.selectbox("Model A", store.names(), key="hha")
+        remaining = [n for n in store.names() if n != m1n]
         if not remaining:
             st.warning("Need at least 2 different models.")
         else:
             m2n = hh2.selectbox("Model B", remaining, key="hhb")
-            ma = next(m for m in models if m["name"] == m1n)
-            mb = next(m for m in models if m["name"] == m2n)
-            ca = col_(models.index(ma))
-            cb = col_(models.index(mb))
-            wins_a = wins_b = 0
-            rows_hh = []
-            for d, l in zip(DIMS, DIM_LABELS):
-                va, vb = ma.get(d, 0), mb.get(d, 0)
-                if va > vb: wins_a += 1
-                elif vb > va: wins_b += 1
-                rows_hh.append((l, va, vb))
+            ia, ib = store.row(m1n), store.row(m2n)
+            ma, mb = store[ia], store[ib]
+            ca, cb = col_(ia), col_(ib)
+            hh = store.cols(DIMS, [ia, ib]).astype(int)
+            wins_a = int((hh[0] > hh[1]).sum())
+            wins_b = int((hh[1] > hh[0]).sum())
+            rows_hh = list(zip(DIM_LABELS, hh[0].tolist(), hh[1].tolist()))
 
             st.markdown(f"""
             <div style="display:flex;align-items:center;gap:0;margin:1rem 0 1.5rem">
@@ -876,7 +1204,7 @@ with tabs[5]:
                     )
 
             st.markdown('<p class="section-label" style="margin-top:1.2rem">RADAR OVERLAY</p>', unsafe_allow_html=True)
-            st.plotly_chart(make_radar([ma, mb]), use_container_width=True, config={"displayModeBar": False})
+            st.plotly_chart(chart(make_radar, store, [ia, ib]), use_container_width=True, config={"displayModeBar": False})
 
             st.markdown('<p class="section-label">SPEC SHEET</p>', unsafe_allow_html=True)
             specs = [
@@ -890,19 +1218,20 @@ with tabs[5]:
             st.dataframe(pd.DataFrame(specs, columns=["Spec", ma["name"], mb["name"]]),
                          use_container_width=True, hide_index=True)
 
-# ── TAB 6: TIMELINE ─────────────────────────────────
-with tabs[6]:
+# ── TAB 7: TIMELINE ─────────────────────────────────
+def render_timeline():
     st.markdown('<p class="section-label">RELEASE TIMELINE</p>', unsafe_allow_html=True)
-    tl_fig = make_timeline(models)
+    tl_fig = chart(make_timeline, store, range(len(store)), st.session_state.max_points, extra=[m.get("release_date") for m in models])
     if tl_fig:
         st.plotly_chart(tl_fig, use_container_width=True, config={"displayModeBar": False})
     else:
         st.info("Add release dates to models to see the timeline.")
-    tl_data = sorted([m for m in models if m.get("release_date")], key=lambda m: m["release_date"])
-    if tl_data:
+    tl_rows = sorted((i for i, m in enumerate(models) if m.get("release_date")), key=lambda i: store[i]["release_date"])
+    if tl_rows:
         st.markdown('<p class="section-label" style="margin-top:1rem">CHRONOLOGICAL ORDER</p>', unsafe_allow_html=True)
-        for m in tl_data:
-            c = col_(models.index(m))
+        for i in tl_rows:
+            m = store[i]
+            c = col_(i)
             st.markdown(
                 f'<div style="display:flex;align-items:center;gap:1rem;padding:.6rem 0;border-bottom:1px solid var(--border)">'
                 f'<span class="timeline-dot" style="background:{c}"></span>'
@@ -913,12 +1242,13 @@ with tabs[6]:
                 unsafe_allow_html=True
             )
 
-# ── TAB 7: DEEP DIVE ────────────────────────────────
-with tabs[7]:
+# ── TAB 8: DEEP DIVE ────────────────────────────────
+def render_deep_dive():
     st.markdown('<p class="section-label">SELECT MODEL FOR DEEP DIVE</p>', unsafe_allow_html=True)
-    dive_name = st.selectbox("Model", [m["name"] for m in models], key="dive_sel")
-    dm = next(m for m in models if m["name"] == dive_name)
-    dc = col_(models.index(dm))
+    dive_name = st.selectbox("Model", store.names(), key="dive_sel")
+    di = store.row(dive_name)
+    dm = store[di]
+    dc = col_(di)
 
     dd1, dd2, dd3 = st.columns([2, 1, 1])
     with dd1:
@@ -968,8 +1298,8 @@ with tabs[7]:
 
     if len(models) > 1:
         st.markdown('<p class="section-label" style="margin-top:1.2rem">VS. FIELD RADAR</p>', unsafe_allow_html=True)
-        field_models = [dm] + [m for m in sorted_models[:4] if m["name"] != dm["name"]]
-        st.plotly_chart(make_radar(field_models), use_container_width=True, config={"displayModeBar": False})
+        field_rows = [di] + [i for i in store.top(4) if store[i]["name"] != dm["name"]]
+        st.plotly_chart(chart(make_radar, store, field_rows), use_container_width=True, config={"displayModeBar": False})
 
     if dm.get("public_resp"):
         st.markdown('<p class="section-label" style="margin-top:1rem">SAMPLE RESPONSE</p>', unsafe_allow_html=True)
@@ -980,67 +1310,65 @@ with tabs[7]:
             unsafe_allow_html=True
         )
 
-# ── TAB 8: FULL DATA ────────────────────────────────
-with tabs[8]:
+# ── TAB 9: FULL DATA ────────────────────────────────
+def render_full_data():
+    order = ranked_rows()
     st.markdown('<p class="section-label">FULL COMPARISON TABLE</p>', unsafe_allow_html=True)
-    df_full = pd.DataFrame([{
-        "Model": m["name"], "Provider": m["provider"], "Version": m.get("version",""),
-        "Category": m.get("category",""), "Overall": m["overall"],
-        "Accuracy": m.get("accuracy",0), "Speed": m.get("speed",0), "Reasoning": m.get("reasoning",0),
-        "Creativity": m.get("creativity",0), "Safety": m.get("safety",0), "Cost Eff.": m.get("cost_eff",0),
-        "Multilingual": m.get("multilingual",0), "Instruction": m.get("instruction",0),
-        "MMLU %": m.get("mmlu",0), "GSM8K %": m.get("gsm8k",0), "HumanEval %": m.get("humaneval",0),
-        "In $/1M": m.get("price_in",0), "Out $/1M": m.get("price_out",0),
-        "Context (K)": m.get("context",0)//1000, "License": m.get("license",""),
-        "Release": m.get("release_date",""), "OSS": "✅" if m.get("open_source") else "❌",
-        "Tags": ", ".join(m.get("tags",[])),
-    } for m in sorted_models])
+    df_full = pd.DataFrame(table_columns(store, order))
 
     num_cols = ["Overall","Accuracy","Speed","Reasoning","Creativity","Safety","Cost Eff.","Multilingual","Instruction"]
 
-    def color_cells(val, col_min, col_max):
-        if not isinstance(val, (int, float)):
-            return ""
-        ratio = (val - col_min) / (col_max - col_min + 1e-9)
-        ratio = max(0.0, min(1.0, ratio))
-        # interpolate from dark purple (#1a1535) → bright purple (#7c6fff)
-        r = int(26  + ratio * (124 - 26))
-        g = int(21  + ratio * (111 - 21))
-        b = int(53  + ratio * (255 - 53))
-        text = "#eeeef8" if ratio > 0.3 else "#8888b0"
-        return f"background-color: rgb({r},{g},{b}); color: {text}; font-weight: 600;"
-
-    styler = df_full.style
-    for col in num_cols:
-        if col in df_full.columns:
-            col_min = df_full[col].min()
-            col_max = df_full[col].max()
-            try:
-                # pandas >= 2.1
-                styler = styler.map(
-                    lambda val, mn=col_min, mx=col_max: color_cells(val, mn, mx),
-                    subset=[col]
-                )
-            except AttributeError:
-                # pandas < 2.1 fallback
-                styler = styler.applymap(
-                    lambda val, mn=col_min, mx=col_max: color_cells(val, mn, mx),
-                    subset=[col]
-                )
-
-    st.dataframe(styler, use_container_width=True, hide_index=True, height=420)
-
-    dl1, dl2, dl3 = st.columns(3)
-    dl1.download_button("⬇ CSV", df_full.to_csv(index=False), "ai_arena.csv", "text/csv", use_container_width=True)
-    dl2.download_button("⬇ JSON", json.dumps(models, indent=2), "ai_arena.json", "application/json", use_container_width=True)
-    def df_to_markdown(df):
-        cols = list(df.columns)
-        header = "| " + " | ".join(str(c) for c in cols) + " |"
-        sep    = "| " + " | ".join("---" for _ in cols) + " |"
-        rows   = ["| " + " | ".join(str(v) for v in row) + " |" for row in df.itertuples(index=False)]
-        return "\n".join([header, sep] + rows)
+    # Only the visible page is styled and shipped; the gradient bounds come
+    # from the whole column so colours don't shift between pages.
+    lo, hi = df_full[num_cols].min(), df_full[num_cols].max()
+    fd1, fd2, fd3 = st.columns([1, 1, 2])
+    page_size = fd1.selectbox("Rows per page", [50, 100, 250, 500], key="fd_page_size")
+    n_pages = (len(df_full) - 1) // page_size + 1
+    if st.session_state.get("fd_page", 1) > n_pages:
+        st.session_state.fd_page = n_pages
+    page = fd2.number_input("Page", 1, n_pages, step=1, key="fd_page")
+    start = (page - 1) * page_size
+    view = df_full.iloc[start:start + page_size]
+    fd3.markdown(
+        f'<div style="font-family:JetBrains Mono,monospace;font-size:.72rem;color:#5a5a80;padding-top:2.1rem">'
+        f'rows {start+1}–{start+len(view)} of {len(df_full)}</div>',
+        unsafe_allow_html=True
+    )
 
-    dl3.download_button("⬇ Markdown", df_to_markdown(df_full), "ai_arena.md", "text/markdown", use_container_width=True)
+    def style_page(frame):
+        css = pd.DataFrame("", index=frame.index, columns=frame.columns)
+        for c in num_cols:
+            css[c] = gradient_css(frame[c].to_numpy(dtype=np.float64), lo[c], hi[c])
+        return css
+
+    st.dataframe(view.style.apply(style_page, axis=None), use_container_width=True, hide_index=True, height=420)
+
+    # Downloads are built on click and cached until the models change, so
+    # paging or sorting never re-serializes the whole Arena.
+    ex1, ex2 = st.columns([3, 1])
+    proj = ex1.multiselect("Export columns", list(TABLE_COLUMNS), key="fd_export_cols",
+                           placeholder="All columns", help="CSV / Markdown / NDJSON include only these columns.")
+    gz = ex2.toggle("gzip downloads", key="fd_gzip")
+    proj = tuple(proj) or tuple(TABLE_COLUMNS)
+    ext, exports, v = (".gz" if gz else ""), st.session_state.exports, store.version
+    def mime(m): return GZIP_MIME if gz else m
+    def table_export(fmt, chunks):
+        # rows are streamed from the store in chunks; df_full is never serialized
+        return lazy(exports, v, (fmt, proj, gz), lambda: render(write_chunks, chunks(store, order, proj), gz=gz))
+    dl1, dl2, dl3, dl4, dl5 = st.columns(5)
+    dl1.download_button("⬇ CSV", table_export("csv", csv_chunks),
+                        "ai_arena.csv" + ext, mime("text/csv"), use_container_width=True)
+    dl2.download_button("⬇ JSON", lazy(exports, v, ("json", gz), lambda: render(write_json, store.records, gz=gz)),
+                        "ai_arena.json" + ext, mime("application/json"), use_container_width=True)
+    dl3.download_button("⬇ Markdown", table_export("md", markdown_chunks),
+                        "ai_arena.md" + ext, mime("text/markdown"), use_container_width=True)
+    dl4.download_button("⬇ NDJSON", table_export("ndjson", ndjson_chunks),
+                        "ai_arena.ndjson" + ext, mime("application/x-ndjson"), use_container_width=True)
+    dl5.download_button("⬇ Snapshot", lazy(exports, v, ("arena", gz),
+                                          lambda: render_bytes(lambda: snapshot.dumps(store.records), gz=gz)),
+                        "ai_arena" + snapshot.SUFFIX + ext, mime("application/octet-stream"),
+                        use_container_width=True,
+                        help="Binary columnar snapshot; load it back through the Data Hub uploader.")
 
     st.markdown('<p class="section-label" style="margin-top:1.5rem">STATISTICAL SUMMARY</p>', unsafe_allow_html=True)
     st.dataframe(
@@ -1048,6 +1376,43 @@ with tabs[8]:
         use_container_width=True
     )
 
+TAB_VIEWS = [
+    ("📊 Leaderboard", render_leaderboard), ("🕸 Radar & Heat", render_radar_heat),
+    ("📈 Analytics", render_analytics),     ("💰 Cost Lab", render_cost_lab),
+    ("💬 Responses", render_responses),     ("⏱ Response Stats", render_response_stats),
+    ("⚔️ Head-to-Head", render_head_to_head), ("📅 Timeline", render_timeline),
+    ("🔬 Deep Dive", render_deep_dive),     ("📋 Full Data", render_full_data),
+]
+# Lazy mode: switching tabs reruns the script and only the open tab's body
+# executes, so a rerun costs one tab instead of ten.
+lazy_tabs = st.session_state.lazy_tabs
+tabs = st.tabs([label for label, _ in TAB_VIEWS], key="arena_tab",
+               on_change="rerun" if lazy_tabs else "ignore")
+for tab, (_, view) in zip(tabs, TAB_VIEWS):
+    if tab.open is False:
+        continue
+    with tab:
+        view()
+
+with st.sidebar:
+    with st.expander("⚡ Figure Cache"):
+        fc = figure_cache().stats()
+        fc1, fc2 = st.columns(2)
+        fc1.metric("Hits", fc["hits"])
+        fc2.metric("Misses", fc["misses"])
+        st.caption(f'{fc["entries"]} figures · {fc["bytes"]/2**20:.1f} MB · '
+                   f'{fc["hit_rate"]:.0%} hit rate · {fc["evictions"]} evicted')
+    with st.expander("💾 Response Cache"):
+        rc = response_cache().stats()
+        rc1, rc2 = st.columns(2)
+        rc1.metric("Hit Rate", f'{rc["hit_rate"]:.0%}')
+        rc2.metric("Saved", f'${rc["saved_usd"]:,.4f}')
+        st.caption(f'{rc["hits"]:,} hits ({rc["disk_hits"]:,} from disk) · {rc["misses"]:,} misses · '
+                   f'{rc["saved_ms"]/1000:,.1f} s of latency saved · {rc["entries"]:,} in memory')
+        if st.button("Clear response cache", use_container_width=True, key="rc_clear"):
+            response_cache().clear()
+            st.rerun()
+
 st.markdown("""
 <div style="text-align:center;padding:3rem 0 1.5rem;border-top:1px solid #1f1f38;margin-top:2rem">
   <div style="font-family:'JetBrains Mono',monospace;font-size:.65rem;color:#2a2a50;letter-spacing:.15em">
@@ -4,7 +4,8 @@ AI Model Arena — Data Uploader & API Key Manager
 Run alongside app1.py. This page lets you:
   1. Store API keys (saved to session state, never persisted to disk)
   2. Upload CSV / JSON datasets of model benchmark data
-  3. Preview, validate, and push the data into the Arena (app1.py session state)
+  3. Preview, validate, and push the data into the Arena (shared with app1.py via arena.db)
+  4. Bulk-import response logs (NDJSON / JSON / CSV eval output) into the Responses tab
 
 Usage:
     Add this file next to app1.py and run:
@@ -17,6 +18,12 @@ import pandas as pd
 import json
 import io
 from datetime import datetime
+from arena_store import ModelStore, DIMS, DIM_LABELS
+from arena_ingest import ingest, ingest_responses, RESPONSE_SUFFIXES
+import arena_snapshot as snapshot
+from arena_export import ExportCache, lazy, render, render_bytes, write_chunks, write_json, records_csv_chunks, GZIP_MIME
+from arena_db import ArenaDB, sync, wrote
+from arena_scheduler import PROVIDERS
 
 # ═══════════════════════════════════════════════════════
 # PAGE CONFIG
@@ -103,115 +110,44 @@ section[data-testid="stSidebar"] *{color:var(--text)!important}
 # ═══════════════════════════════════════════════════════
 # CONSTANTS
 # ═══════════════════════════════════════════════════════
-DIMS       = ["accuracy","speed","reasoning","creativity","safety","cost_eff","multilingual","instruction"]
-DIM_LABELS = ["Accuracy","Speed","Reasoning","Creativity","Safety","Cost Eff.","Multilingual","Instruction"]
-
 # Required columns for CSV/JSON upload
 REQUIRED_COLS = ["name"]
 NUMERIC_COLS  = DIMS + ["price_in","price_out","context","mmlu","gsm8k","humaneval"]
 OPTIONAL_COLS = ["provider","version","category","release_date","license","modalities",
                  "tags","notes","benchmark","public_resp","open_source"] + NUMERIC_COLS
+MAX_ERRORS    = 200    # validation messages kept per upload
+SHOW_ERRORS   = 50     # … of which rendered as warnings
+PREVIEW_ROWS  = 1000   # rows shown in the upload preview table
+PREVIEW_CARDS = 30     # model cards shown on the Sync tab
 
 # ═══════════════════════════════════════════════════════
 # SESSION STATE INIT
 # ═══════════════════════════════════════════════════════
+@st.cache_resource
+def arena_db():
+    return ArenaDB()   # shared SQLite catalog; see arena_db.py
+
 for k, v in {
-    "models":        [],          # shared with app1.py if multipage
+    "models":        ModelStore(),  # shared with app1.py through arena.db
     "api_keys":      {},          # {"OpenAI": "sk-...", ...}
     "upload_log":    [],          # history of uploads
     "preview_data":  None,        # parsed but not yet committed
+    "exports_hub":   ExportCache(),  # Manage-tab download payloads for the current store.version
+    "ingest":        None,        # streamed parse of the current upload, keyed by file_id
+    "resp_import":   None,        # outcome of the last response-log import
 }.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+db = arena_db()
+sync(st.session_state, db, {
+    "models":  ("models",     lambda: ModelStore(db.load_models())),
+    "uploads": ("upload_log", db.load_uploads),
+})
+
 # ═══════════════════════════════════════════════════════
 # HELPERS
 # ═══════════════════════════════════════════════════════
-def compute_overall(m):
-    w = dict(accuracy=.25,speed=.15,reasoning=.22,creativity=.10,
-             safety=.10,cost_eff=.10,multilingual=.05,instruction=.03)
-    return round(sum(m.get(k,0)*v for k,v in w.items()), 1)
-
-def safe_float(val, default=0.0):
-    try:    return float(val)
-    except: return default
-
-def safe_int(val, default=0):
-    try:    return int(float(val))
-    except: return default
-
-def safe_list(val):
-    """Turn a string like 'Text,Image' or ['Text','Image'] into a list."""
-    if isinstance(val, list):
-        return [str(v).strip() for v in val if str(v).strip()]
-    if isinstance(val, str):
-        return [v.strip() for v in val.split(",") if v.strip()]
-    return []
-
-def row_to_model(row: dict) -> dict:
-    """Normalise a raw dict (from CSV/JSON row) into the Arena model schema."""
-    m = {}
-    m["name"]         = str(row.get("name","")).strip()
-    m["provider"]     = str(row.get("provider","")).strip()
-    m["version"]      = str(row.get("version","")).strip()
-    m["category"]     = str(row.get("category","General")).strip() or "General"
-    m["release_date"] = str(row.get("release_date","")).strip()
-    m["license"]      = str(row.get("license","Proprietary")).strip() or "Proprietary"
-    m["modalities"]   = safe_list(row.get("modalities","Text"))
-    m["tags"]         = safe_list(row.get("tags",""))
-    m["notes"]        = str(row.get("notes","")).strip()
-    m["benchmark"]    = str(row.get("benchmark","")).strip()
-    m["public_resp"]  = str(row.get("public_resp","")).strip()
-    m["open_source"]  = str(row.get("open_source","false")).lower() in ("true","1","yes","open source")
-    # numeric perf scores
-    for d in DIMS:
-        m[d] = min(100, max(0, safe_int(row.get(d, 0))))
-    # pricing / context / benchmarks
-    m["price_in"]   = safe_float(row.get("price_in",  0.0))
-    m["price_out"]  = safe_float(row.get("price_out", 0.0))
-    m["context"]    = safe_int(row.get("context", 128000))
-    m["mmlu"]       = safe_float(row.get("mmlu",      0.0))
-    m["gsm8k"]      = safe_float(row.get("gsm8k",     0.0))
-    m["humaneval"]  = safe_float(row.get("humaneval",  0.0))
-    m["added_at"]   = datetime.now().strftime("%Y-%m-%d %H:%M")
-    m["overall"]    = compute_overall(m)
-    return m
-
-def validate_models(models: list) -> tuple[list, list]:
-    """Return (valid_models, error_messages)."""
-    valid, errors = [], []
-    seen_names = set()
-    for i, m in enumerate(models):
-        row_errors = []
-        if not m.get("name"):
-            row_errors.append("Missing 'name'")
-        elif m["name"] in seen_names:
-            row_errors.append(f"Duplicate name '{m['name']}'")
-        else:
-            seen_names.add(m["name"])
-        # warn if all performance scores are 0
-        if all(m.get(d, 0) == 0 for d in DIMS):
-            row_errors.append("All performance scores are 0 — did you map the columns?")
-        if row_errors:
-            errors.append(f"Row {i+1} ({m.get('name','?')}): " + "; ".join(row_errors))
-        else:
-            valid.append(m)
-    return valid, errors
-
-def parse_csv(file) -> list[dict]:
-    df = pd.read_csv(file)
-    df.columns = [c.strip().lower().replace(" ","_") for c in df.columns]
-    return df.to_dict(orient="records")
-
-def parse_json(file) -> list[dict]:
-    data = json.load(file)
-    if isinstance(data, dict):
-        # maybe it's {"models": [...]}
-        data = data.get("models", [data])
-    if isinstance(data, list):
-        return data
-    raise ValueError("JSON must be a list of model objects or {'models': [...]}")
-
 def mask_key(k: str) -> str:
     if len(k) <= 8:
         return "•" * len(k)
@@ -236,7 +172,7 @@ n_keys   = len(st.session_state.api_keys)
 s1,s2,s3,s4 = st.columns(4)
 s1.metric("Models in Arena", n_models)
 s2.metric("API Keys Stored", n_keys)
-s3.metric("Uploads This Session", len(st.session_state.upload_log))
+s3.metric("Uploads Logged", len(st.session_state.upload_log))
 s4.metric("Preview Pending", "Yes" if st.session_state.preview_data else "No")
 
 st.markdown("<div style='height:.5rem'></div>", unsafe_allow_html=True)
@@ -244,7 +180,8 @@ st.markdown("<div style='height:.5rem'></div>", unsafe_allow_html=True)
 # ═══════════════════════════════════════════════════════
 # TABS
 # ═══════════════════════════════════════════════════════
-tabs = st.tabs(["🔑 API Keys", "📂 Upload Dataset", "🔄 Sync & Preview", "📋 Schema Guide", "🗑️ Manage Arena"])
+tabs = st.tabs(["🔑 API Keys", "📂 Upload Dataset", "🔄 Sync & Preview", "📋 Schema Guide", "🗑️ Manage Arena",
+                "💬 Import Responses"])
 
 # ══════════════════════════════════════════
 # TAB 0 — API KEYS
@@ -263,10 +200,7 @@ with tabs[0]:
     with st.form("add_key_form", clear_on_submit=True):
         st.markdown('<p class="section-label">ADD / UPDATE KEY</p>', unsafe_allow_html=True)
         k1, k2 = st.columns([1, 2])
-        key_provider = k1.selectbox("Provider", [
-            "OpenAI", "Anthropic", "Google", "Meta", "Mistral",
-            "Cohere", "Together AI", "Groq", "HuggingFace", "Custom"
-        ])
+        key_provider = k1.selectbox("Provider", PROVIDERS)   # same names the eval rate limits use
         custom_provider = k1.text_input("Custom provider name", placeholder="e.g. MyOrg")
         api_key_val = k2.text_input("API Key", type="password", placeholder="sk-... or key-...")
         key_label   = k2.text_input("Label (optional)", placeholder="e.g. prod-key, personal")
@@ -319,59 +253,82 @@ with tabs[1]:
       <div style="font-family:'Outfit',sans-serif;font-size:.88rem;color:#8888b0;line-height:1.8">
         <strong style="color:#eeeef8">CSV</strong> — one row per model, column headers match schema (see Schema Guide tab)<br>
         <strong style="color:#eeeef8">JSON</strong> — array of model objects <code style="color:#7c6fff">[ {...}, {...} ]</code>
-        or <code style="color:#7c6fff">{"models": [{...}]}</code>
+        or <code style="color:#7c6fff">{"models": [{...}]}</code><br>
+        <strong style="color:#eeeef8">.arena</strong> — binary snapshot exported from the Arena (loads without re-parsing)
       </div>
     </div>""", unsafe_allow_html=True)
 
     uploaded_file = st.file_uploader(
         "Drop your dataset here",
-        type=["csv","json"],
-        help="CSV or JSON file. See Schema Guide tab for column definitions."
+        type=["csv","json",snapshot.SUFFIX.lstrip(".")],
+        help="CSV, JSON or .arena snapshot. See Schema Guide tab for column definitions."
     )
 
     col_mode = st.radio(
         "On upload, models should:",
-        ["Replace all current Arena models", "Merge with existing Arena models (skip duplicates)", "Append all (allow duplicates)"],
+        ["Replace all current Arena models", "Merge with existing Arena models (skip duplicates)",
+         "Update existing models in place (add new ones)", "Append all (allow duplicates)"],
         horizontal=True
     )
 
     if uploaded_file is not None:
         st.markdown('<p class="section-label" style="margin-top:1rem">RAW PARSE</p>', unsafe_allow_html=True)
         try:
-            if uploaded_file.name.endswith(".csv"):
-                raw_rows = parse_csv(uploaded_file)
-            else:
-                raw_rows = parse_json(uploaded_file)
-
-            st.success(f"✓ Parsed {len(raw_rows)} row(s) from **{uploaded_file.name}**")
+            ing = st.session_state.ingest
+            if (ing is None or ing["file_id"] != uploaded_file.file_id) and uploaded_file.name.endswith(snapshot.SUFFIX):
+                # snapshots are exported Arenas: decode the columns directly, no row_to_model / validation
+                models, X = snapshot.loads(uploaded_file.getbuffer())
+                ing = dict(file_id=uploaded_file.file_id, raw_head=models[:5], models=models, X=X,
+                           errors=[], n_errors=0, rows=len(models))
+                st.session_state.ingest = ing
+            elif ing is None or ing["file_id"] != uploaded_file.file_id:
+                # stream the file chunk by chunk; only valid models and the first few raw rows are kept
+                uploaded_file.seek(0)
+                ing = dict(file_id=uploaded_file.file_id, raw_head=[], models=[], errors=[], n_errors=0, rows=0)
+                bar = st.progress(0.0, text=f"Reading {uploaded_file.name}…")
+                for chunk in ingest(uploaded_file, uploaded_file.name):
+                    ing["raw_head"] += chunk["head"][:5 - len(ing["raw_head"])]
+                    ing["models"]   += chunk["models"]
+                    ing["errors"]   += chunk["errors"][:MAX_ERRORS - len(ing["errors"])]
+                    ing["n_errors"] += len(chunk["errors"])
+                    ing["rows"]      = chunk["rows"]
+                    bar.progress(chunk["progress"],
+                                 text=f"{ing['rows']:,} rows read · {len(ing['models']):,} valid")
+                bar.empty()
+                st.session_state.ingest = ing
+
+            st.success(f"✓ Parsed {ing['rows']:,} row(s) from **{uploaded_file.name}**")
 
             # show raw preview
             with st.expander("👁 Raw parsed rows (first 5)"):
-                st.json(raw_rows[:5])
+                st.json(ing["raw_head"])
 
-            # normalise
-            parsed_models = [row_to_model(r) for r in raw_rows]
-            valid_models, errors = validate_models(parsed_models)
+            valid_models, errors = ing["models"], ing["errors"]
 
             if errors:
                 st.markdown('<p class="section-label" style="margin-top:.8rem;color:#ff5e7d">VALIDATION ISSUES</p>', unsafe_allow_html=True)
-                for e in errors:
+                for e in errors[:SHOW_ERRORS]:
                     st.warning(e)
+                if ing["n_errors"] > SHOW_ERRORS:
+                    st.caption(f"… and {ing['n_errors'] - SHOW_ERRORS:,} more row(s) with issues")
 
             if valid_models:
-                st.markdown(f'<p class="section-label" style="margin-top:.8rem">PREVIEW ({len(valid_models)} valid models)</p>', unsafe_allow_html=True)
+                st.markdown(f'<p class="section-label" style="margin-top:.8rem">PREVIEW ({len(valid_models):,} valid models)</p>', unsafe_allow_html=True)
                 preview_df = pd.DataFrame([{
                     "Name": m["name"], "Provider": m["provider"],
                     "Overall": m["overall"],
                     **{l: m.get(d,0) for d,l in zip(DIMS, DIM_LABELS)},
                     "Context(K)": m.get("context",0)//1000,
                     "In$/1M": m.get("price_in",0),
-                } for m in valid_models])
+                } for m in valid_models[:PREVIEW_ROWS]])
                 st.dataframe(preview_df, use_container_width=True, hide_index=True)
+                if len(valid_models) > PREVIEW_ROWS:
+                    st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(valid_models):,} models.")
 
                 # stash for Sync tab
                 st.session_state.preview_data = {
                     "models": valid_models,
+                    "X": ing.get("X"),             # precomputed score matrix (snapshots only)
                     "mode": col_mode,
                     "filename": uploaded_file.name,
                     "timestamp": datetime.now().strftime("%H:%M:%S"),
@@ -407,7 +364,7 @@ with tabs[2]:
         st.markdown('<p class="section-label">MODELS TO IMPORT</p>', unsafe_allow_html=True)
         PALETTE = ["#7c6fff","#00d4aa","#ff5e7d","#ffb340","#4dc9f6","#a78bfa","#34d399","#f87171","#60a5fa","#fbbf24"]
         cols_p = st.columns(min(3, len(pd_data["models"])))
-        for i, m in enumerate(pd_data["models"]):
+        for i, m in enumerate(pd_data["models"][:PREVIEW_CARDS]):
             c = PALETTE[i % len(PALETTE)]
             with cols_p[i % len(cols_p)]:
                 tag_html = "".join([f'<span class="glow-chip chip-purple">{t}</span>' for t in m.get("tags",[])])
@@ -421,6 +378,8 @@ with tabs[2]:
                   <div style="font-family:'JetBrains Mono',monospace;font-size:.65rem;color:#5a5a80">Overall Score</div>
                   <div style="margin-top:.5rem;display:flex;flex-wrap:wrap;gap:.2rem">{tag_html}</div>
                 </div>""", unsafe_allow_html=True)
+        if len(pd_data["models"]) > PREVIEW_CARDS:
+            st.caption(f"… and {len(pd_data['models']) - PREVIEW_CARDS:,} more model(s)")
 
         st.markdown("<div style='height:.5rem'></div>", unsafe_allow_html=True)
         commit_col, discard_col = st.columns(2)
@@ -429,21 +388,29 @@ with tabs[2]:
             new_models = pd_data["models"]
             mode = pd_data["mode"]
 
+            store = st.session_state.models
             if "Replace" in mode:
-                st.session_state.models = new_models
+                store.replace(new_models, pd_data.get("X"))
+                wrote(st.session_state, "models", db.save_models(store.records), replaced=True)
             elif "Merge" in mode:
-                existing_names = {m["name"] for m in st.session_state.models}
-                added = [m for m in new_models if m["name"] not in existing_names]
-                st.session_state.models.extend(added)
+                added = [m for m in new_models if m["name"] not in store]   # O(1) name index
+                store.extend(added)
+                wrote(st.session_state, "models", db.add_models(added))
+            elif "Update" in mode:
+                store.upsert_many(new_models)
+                wrote(st.session_state, "models", db.save_models(store.records), replaced=True)
             else:  # Append all
-                st.session_state.models.extend(new_models)
+                store.extend(new_models, pd_data.get("X"))
+                wrote(st.session_state, "models", db.add_models(new_models))
 
-            st.session_state.upload_log.append({
+            entry = {
                 "file": pd_data["filename"],
                 "count": len(new_models),
                 "mode": mode,
                 "time": pd_data["timestamp"],
-            })
+            }
+            st.session_state.upload_log.append(entry)
+            wrote(st.session_state, "uploads", db.log_upload(entry))
             st.session_state.preview_data = None
             st.success(f"✓ {len(new_models)} model(s) synced to Arena! Switch to app1.py to see the updated dashboard.")
             st.rerun()
@@ -461,7 +428,7 @@ with tabs[2]:
                 f'font-family:JetBrains Mono,monospace;font-size:.75rem">'
                 f'<span style="color:#5a5a80">{entry["time"]}</span>'
                 f'<span style="color:#eeeef8">{entry["file"]}</span>'
-                f'<span class="glow-chip chip-green">{entry["count"]} models</span>'
+                f'<span class="glow-chip chip-green">{entry["count"]} {"responses" if entry["mode"] == "Responses" else "models"}</span>'
                 f'<span style="color:#5a5a80">{entry["mode"].split()[0]}</span>'
                 f'</div>',
                 unsafe_allow_html=True
@@ -552,15 +519,16 @@ with tabs[4]:
     else:
         PALETTE = ["#7c6fff","#00d4aa","#ff5e7d","#ffb340","#4dc9f6","#a78bfa","#34d399","#f87171","#60a5fa","#fbbf24"]
         # table view
-        manage_df = pd.DataFrame([{
-            "Name": m["name"],
-            "Provider": m.get("provider",""),
-            "Category": m.get("category",""),
-            "Overall": m.get("overall",0),
-            "Price In": f"${m.get('price_in',0):.2f}",
-            "Context": f"{m.get('context',0)//1000}K",
-            "Added": m.get("added_at",""),
-        } for m in st.session_state.models])
+        store = st.session_state.models
+        manage_df = pd.DataFrame({
+            "Name": store.names(),
+            "Provider": [m.get("provider","") for m in store],
+            "Category": [m.get("category","") for m in store],
+            "Overall": store.col("overall", decimals=1),
+            "Price In": [f"${v:.2f}" for v in store.col("price_in", decimals=4).tolist()],
+            "Context": [f"{v//1000}K" for v in store.col("context").astype(int).tolist()],
+            "Added": [m.get("added_at","") for m in store],
+        })
         st.dataframe(manage_df, use_container_width=True, hide_index=True)
 
         st.markdown('<p class="section-label" style="margin-top:1rem">REMOVE INDIVIDUAL MODELS</p>', unsafe_allow_html=True)
@@ -578,28 +546,100 @@ with tabs[4]:
                 unsafe_allow_html=True
             )
             if col_b.button("🗑", key=f"rm_{i}_{m['name']}"):
-                st.session_state.models = [x for x in st.session_state.models if x["name"] != m["name"]]
+                st.session_state.models.remove(m["name"])
+                wrote(st.session_state, "models", db.remove_model(m["name"]))
                 st.rerun()
 
         st.markdown("<div style='height:1rem'></div>", unsafe_allow_html=True)
-        da, db, dc = st.columns(3)
+        da, dj, dc, dsn = st.columns(4)
         if da.button("🗑 Clear All Models", use_container_width=True):
-            st.session_state.models = []
+            st.session_state.models.clear()
+            wrote(st.session_state, "models", db.save_models([]), replaced=True)
             st.rerun()
 
-        # export current arena
-        export_json = json.dumps(st.session_state.models, indent=2)
-        db.download_button(
+        # export current arena — built on click, cached until the models change
+        gz = st.toggle("gzip downloads", key="manage_gzip")
+        ext, exports, v = (".gz" if gz else ""), st.session_state.exports_hub, store.version
+        def mime(m): return GZIP_MIME if gz else m
+        dj.download_button(
             "⬇ Export Arena JSON",
-            export_json, "arena_export.json", "application/json",
+            lazy(exports, v, ("json", gz), lambda: render(write_json, store.records, gz=gz)),
+            "arena_export.json" + ext, mime("application/json"),
             use_container_width=True
         )
-        export_csv_df = pd.DataFrame(st.session_state.models)
         dc.download_button(
             "⬇ Export Arena CSV",
-            export_csv_df.to_csv(index=False), "arena_export.csv", "text/csv",
+            lazy(exports, v, ("csv", gz), lambda: render(write_chunks, records_csv_chunks(store.records), gz=gz)),
+            "arena_export.csv" + ext, mime("text/csv"),
             use_container_width=True
         )
+        dsn.download_button(
+            "⬇ Export Snapshot",
+            lazy(exports, v, ("arena", gz), lambda: render_bytes(lambda: snapshot.dumps(store.records), gz=gz)),
+            "arena_export" + snapshot.SUFFIX + ext, mime("application/octet-stream"),
+            use_container_width=True, help="Binary columnar snapshot — re-imports without parsing."
+        )
+
+# ══════════════════════════════════════════
+# TAB 5 — IMPORT RESPONSES
+# ══════════════════════════════════════════
+# Eval-harness output goes straight into the shared response log: the file is
+# streamed a chunk at a time, each chunk's valid rows are committed in one
+# transaction, and the page reruns once when the whole file is in.
+with tabs[5]:
+    st.markdown('<p class="section-label">IMPORT RESPONSE LOGS</p>', unsafe_allow_html=True)
+    st.markdown("""
+    <div class="glass-card">
+      <div style="font-family:'JetBrains Mono',monospace;font-size:.72rem;color:#00d4aa;margin-bottom:.6rem">SUPPORTED FORMATS</div>
+      <div style="font-family:'Outfit',sans-serif;font-size:.88rem;color:#8888b0;line-height:1.8">
+        <strong style="color:#eeeef8">NDJSON / JSONL</strong> — one response object per line<br>
+        <strong style="color:#eeeef8">JSON</strong> — array of response objects <code style="color:#7c6fff">[ {...}, {...} ]</code><br>
+        <strong style="color:#eeeef8">CSV</strong> — one row per response with a header row<br>
+        Fields: <code style="color:#7c6fff">model</code> and <code style="color:#7c6fff">response</code> (required),
+        <code style="color:#7c6fff">prompt</code>, <code style="color:#7c6fff">latency</code> (ms),
+        <code style="color:#7c6fff">tokens</code>, <code style="color:#7c6fff">rating</code> (1–10),
+        <code style="color:#7c6fff">notes</code>, <code style="color:#7c6fff">ts</code>
+      </div>
+    </div>""", unsafe_allow_html=True)
+
+    last = st.session_state.resp_import
+    if last:
+        st.success(f"✓ Imported {last['count']:,} of {last['rows']:,} response(s) from **{last['file']}** "
+                   f"in {last['batches']} batch(es). Open the 💬 Responses tab in app1.py to browse them.")
+        if last["failed"]:
+            st.error(f"Import stopped early: {last['failed']}")
+        for e in last["errors"][:SHOW_ERRORS]:
+            st.warning(e)
+        if last["n_errors"] > SHOW_ERRORS:
+            st.caption(f"… and {last['n_errors'] - SHOW_ERRORS:,} more row(s) skipped")
+
+    resp_file = st.file_uploader(
+        "Drop a response log here",
+        type=[x.lstrip(".") for x in RESPONSE_SUFFIXES], key="resp_upload",
+        help="Rows that fail validation are skipped and listed; every valid row is imported."
+    )
+    if resp_file is not None and st.button("⬆ Import responses", type="primary", use_container_width=True):
+        res = dict(file=resp_file.name, count=0, rows=0, batches=0, errors=[], n_errors=0, failed=None)
+        bar = st.progress(0.0, text=f"Importing {resp_file.name}…")
+        resp_file.seek(0)
+        try:
+            for chunk in ingest_responses(resp_file, resp_file.name.lower()):
+                if chunk["entries"]:
+                    db.log_responses(chunk["entries"])         # one transaction per chunk
+                    res["batches"] += 1
+                res["count"]    += len(chunk["entries"])
+                res["rows"]      = chunk["rows"]
+                res["errors"]   += chunk["errors"][:MAX_ERRORS - len(res["errors"])]
+                res["n_errors"] += len(chunk["errors"])
+                bar.progress(chunk["progress"], text=f"{res['rows']:,} rows read · {res['count']:,} imported")
+        except Exception as ex:                               # earlier batches stay committed
+            res["failed"] = f"after row {res['rows']:,}: {ex}"
+        entry = dict(file=resp_file.name, count=res["count"], mode="Responses",
+                     time=datetime.now().strftime("%H:%M:%S"))
+        st.session_state.upload_log.append(entry)
+        wrote(st.session_state, "uploads", db.log_upload(entry))
+        st.session_state.resp_import = res
+        st.rerun()
 
 # ═══════════════════════════════════════════════════════
 # FOOTER
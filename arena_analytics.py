@@ -0,0 +1,169 @@
+"""
+AI Model Arena — Incremental Response Analytics
+===============================================
+Per-model latency / throughput / rating aggregates over the response log,
+kept up to date one entry at a time so nothing ever rescans history.
+
+Each model carries running sums (responses, tokens, rating) and a streaming
+latency quantile sketch. The sketch is a log-bucketed histogram (the
+DDSketch idea): a latency ``x`` lands in bucket ``ceil(log_γ x)`` with
+``γ = (1+α)/(1−α)``, so every quantile it reports is within ``α`` (1 %)
+relative error. It needs a few hundred counters at most over the
+1 ms … 2 min range, and it serializes to a small JSON dict, which is how
+``ArenaDB`` stores it next to the log.
+"""
+
+import math
+
+ALPHA       = 0.01       # relative accuracy of reported quantiles
+MIN_SAMPLES = 5          # responses needed before a measured speed is used
+QUANTILES   = (0.5, 0.9, 0.99)
+
+
+# ═══════════════════════════════════════════════════════
+# QUANTILE SKETCH
+# ═══════════════════════════════════════════════════════
+class QuantileSketch:
+    """Streaming quantiles with bounded relative error (values ≤ 0 count as 0)."""
+
+    def __init__(self, alpha: float = ALPHA, counts: dict = None, zeros: int = 0):
+        self.alpha = alpha
+        self._gamma = math.log((1 + alpha) / (1 - alpha))
+        self.counts = counts or {}       # bucket key → count
+        self.zeros = zeros
+        self.n = zeros + sum(self.counts.values())
+
+    def add(self, x: float, count: int = 1):
+        if x > 0:
+            k = math.ceil(math.log(x) / self._gamma)
+            self.counts[k] = self.counts.get(k, 0) + count
+        else:
+            self.zeros += count
+        self.n += count
+
+    def merge(self, other: "QuantileSketch"):
+        for k, c in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + c
+        self.zeros += other.zeros
+        self.n += other.n
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile ``q`` (0–1); NaN while empty."""
+        if not self.n:
+            return math.nan
+        rank = q * (self.n - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.counts):
+            seen += self.counts[k]
+            if rank < seen:
+                # bucket k holds (γ^(k-1), γ^k]; its midpoint is within α of either end
+                return 2 * math.exp(k * self._gamma) / (1 + math.exp(self._gamma))
+        return 2 * math.exp(max(self.counts) * self._gamma) / (1 + math.exp(self._gamma))
+
+    def to_dict(self) -> dict:
+        return dict(alpha=self.alpha, zeros=self.zeros, counts={str(k): c for k, c in self.counts.items()})
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "QuantileSketch":
+        return cls(d["alpha"], {int(k): c for k, c in d["counts"].items()}, d["zeros"])
+
+
+# ═══════════════════════════════════════════════════════
+# PER-MODEL AGGREGATES
+# ═══════════════════════════════════════════════════════
+class ModelStats:
+    """Running aggregates for one model's logged responses."""
+
+    def __init__(self):
+        self.n = 0
+        self.latency = QuantileSketch()
+        self.latency_sum = 0.0
+        self.tokens_sum = 0
+        self.timed_tokens = 0            # tokens / ms over responses with a latency,
+        self.timed_ms = 0.0              # so tokens/sec isn't skewed by 0 ms entries
+        self.rated = 0
+        self.rating_sum = 0.0
+
+    def add(self, entry: dict):
+        latency = entry.get("latency") or 0
+        tokens = entry.get("tokens") or 0
+        self.n += 1
+        self.latency.add(latency)
+        self.latency_sum += latency
+        self.tokens_sum += tokens
+        if latency > 0:
+            self.timed_tokens += tokens
+            self.timed_ms += latency
+        if entry.get("rating") is not None:
+            self.rated += 1
+            self.rating_sum += entry["rating"]
+
+    def quantile(self, q: float) -> float:
+        return self.latency.quantile(q)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_sum / self.n if self.n else math.nan
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.timed_tokens / self.timed_ms * 1000 if self.timed_ms else math.nan
+
+    @property
+    def mean_rating(self) -> float:
+        return self.rating_sum / self.rated if self.rated else math.nan
+
+    def to_dict(self) -> dict:
+        d = {k: v for k, v in vars(self).items() if k != "latency"}
+        return dict(d, latency=self.latency.to_dict())
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ModelStats":
+        s = cls()
+        vars(s).update(d, latency=QuantileSketch.from_dict(d["latency"]))
+        return s
+
+
+def update(stats: dict, entries) -> set:
+    """Fold ``entries`` into ``stats`` (``{model: ModelStats}``) in place.
+
+    Returns the names of the models that changed.
+    """
+    touched = set()
+    for e in entries:
+        stats.setdefault(e["model"], ModelStats()).add(e)
+        touched.add(e["model"])
+    return touched
+
+
+# ═══════════════════════════════════════════════════════
+# SPEED DIMENSION
+# ═══════════════════════════════════════════════════════
+def speed_score(p50_ms: float) -> int:
+    """Measured median latency → Arena speed score (0–100, log scale):
+    ≤100 ms → 100, 1 s → 70, 10 s → 40, 100 s → 10."""
+    if math.isnan(p50_ms):
+        return 0
+    return int(max(0, min(100, round(100 - 30 * math.log10(max(p50_ms, 100) / 100)))))
+
+
+def measured_speeds(stats: dict, min_samples: int = MIN_SAMPLES) -> dict:
+    """``{model: speed score}`` for every model with enough logged responses."""
+    return {name: speed_score(s.quantile(0.5)) for name, s in stats.items() if s.n >= min_samples}
+
+
+def summary_rows(stats: dict) -> list[dict]:
+    """One row per model for the analytics table, busiest model first."""
+    rows = []
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1].n):
+        rows.append({
+            "Model": name, "Responses": s.n,
+            **{f"p{round(q * 100)} ms": round(s.quantile(q), 1) for q in QUANTILES},
+            "Mean ms": round(s.mean_latency, 1),
+            "Tokens/s": round(s.tokens_per_sec, 1),
+            "Mean rating": round(s.mean_rating, 2),
+            "Measured speed": speed_score(s.quantile(0.5)),
+        })
+    return rows
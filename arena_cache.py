@@ -0,0 +1,243 @@
+"""
+AI Model Arena — Content-Addressed Caches
+=========================================
+A small thread-safe LRU with an entry cap, a byte budget, an optional TTL
+and hit/miss counters, plus ``fingerprint`` for building keys from the data
+a result was computed from (NumPy slices, names, chart parameters). Identical
+inputs hash to the same key, so anything rebuilt on each Streamlit rerun
+can be looked up instead.
+
+``ResponseCache`` puts the same LRU in front of an optional SQLite tier for
+model responses, so re-running a prompt against a model costs neither the
+latency nor the tokens again — across reruns, sessions and restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def fingerprint(*parts) -> str:
+    """Stable 128-bit hex digest of arrays, bytes, strings and plain values."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        if isinstance(p, np.ndarray):
+            h.update(f"{p.dtype.str}{p.shape}".encode())
+            h.update(np.ascontiguousarray(p).view(np.uint8))
+        elif isinstance(p, (bytes, bytearray, memoryview)):
+            h.update(p)
+        elif isinstance(p, str):
+            h.update(p.encode())
+        else:
+            h.update(repr(p).encode())
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and total bytes.
+
+    With ``ttl`` (seconds) entries older than that count as misses and are
+    dropped when next looked up.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 2**20, ttl: float = None):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.ttl         = ttl
+        self.hits = self.misses = self.evictions = 0
+        self.nbytes = 0
+        self._data = OrderedDict()       # key → (value, nbytes, stored at)
+        self._lock = threading.RLock()
+
+    def _live(self, key) -> bool:
+        if key not in self._data:
+            return False
+        if self.ttl is not None and time.monotonic() - self._data[key][2] > self.ttl:
+            self.nbytes -= self._data.pop(key)[1]
+            self.evictions += 1
+            return False
+        return True
+
+    def get(self, key, default=None):
+        with self._lock:
+            if self._live(key):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, nbytes: int = 0):
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._data.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return                  # never cache something bigger than the whole budget
+            self._data[key] = (value, nbytes, time.monotonic())
+            self.nbytes += nbytes
+            while len(self._data) > self.max_entries or self.nbytes > self.max_bytes:
+                self.nbytes -= self._data.popitem(last=False)[1][1]
+                self.evictions += 1
+
+    def get_or_build(self, key, build, sizeof=None):
+        """Return the cached value for ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            if self._live(key):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+        value = build()
+        self.put(key, value, sizeof(value) if sizeof else 0)
+        return value
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                    entries=len(self._data), bytes=self.nbytes,
+                    hit_rate=self.hits / lookups if lookups else 0.0)
+
+
+# ═══════════════════════════════════════════════════════
+# RESPONSE CACHE
+# ═══════════════════════════════════════════════════════
+def response_key(model: str, prompt: str, params: dict = None) -> str:
+    """Content address of one model call: same model, prompt and params → same key."""
+    return fingerprint("response", model, prompt, sorted((params or {}).items()))
+
+
+class SQLiteTier:
+    """On-disk cache tier: JSON values in one SQLite table.
+
+    Entries expire after ``ttl`` seconds (wall clock, so it holds across
+    restarts); past ``max_bytes`` the least recently used ones are deleted.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS response_cache (
+        key     TEXT PRIMARY KEY,
+        value   TEXT NOT NULL,
+        nbytes  INTEGER NOT NULL,
+        created REAL NOT NULL,
+        used    REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_response_cache_used ON response_cache(used);
+    """
+
+    def __init__(self, path: str, ttl: float = None, max_bytes: int = 256 * 2**20):
+        self.ttl, self.max_bytes = ttl, max_bytes
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE response_cache SET used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        data = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?)",
+                               (key, data, len(data), now, now))
+            self._puts += 1
+            if self._puts % 64 == 0:                    # size check is a table scan: amortise it
+                self._trim()
+
+    def _trim(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM response_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least-recently-used rows until ~10% under the cap
+        excess, freed = total - self.max_bytes * 0.9, 0
+        doomed = []
+        for key, n in self._conn.execute("SELECT key, nbytes FROM response_cache ORDER BY used"):
+            doomed.append((key,))
+            freed += n
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM response_cache WHERE key = ?", doomed)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+
+
+class ResponseCache:
+    """Memory LRU (TTL, size cap) in front of an optional ``SQLiteTier``.
+
+    Disk hits are promoted into memory. ``hit(saved_usd, saved_ms)`` records
+    what a hit saved, for the hit-rate / savings report in ``stats()``.
+    """
+
+    def __init__(self, memory: LRUCache = None, disk: SQLiteTier = None):
+        self.memory = memory or LRUCache(max_entries=10_000, max_bytes=32 * 2**20, ttl=24 * 3600)
+        self.disk = disk
+        self.disk_hits = 0
+        self.saved_usd = self.saved_ms = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value, len(json.dumps(value)))
+        return value
+
+    def put(self, key, value):
+        data = json.dumps(value)
+        self.memory.put(key, value, len(data))
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def hit(self, saved_usd: float, saved_ms: float):
+        with self._lock:
+            self.saved_usd += saved_usd
+            self.saved_ms += saved_ms
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        mem = self.memory.stats()
+        hits = mem["hits"] + self.disk_hits
+        misses = mem["misses"] - self.disk_hits        # a disk hit was first a memory miss
+        lookups = hits + misses
+        return dict(hits=hits, memory_hits=mem["hits"], disk_hits=self.disk_hits, misses=misses,
+                    hit_rate=hits / lookups if lookups else 0.0, entries=mem["entries"],
+                    evictions=mem["evictions"], saved_usd=self.saved_usd, saved_ms=self.saved_ms)
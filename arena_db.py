@@ -0,0 +1,379 @@
+"""
+AI Model Arena — SQLite Storage Backend
+=======================================
+One local SQLite database (WAL mode) shared by every Streamlit session and
+worker process, so a catalog committed once in the Data Hub (app2.py) is
+what every Arena page (app1.py) reads — no re-uploading per browser tab.
+
+Tables:
+    models     one row per Arena model; the full record is kept as JSON in
+               ``data``, with name / provider / category / release_date /
+               overall lifted into indexed columns for querying
+    responses  responses logged in the Responses tab, indexed on model (+
+               rating), rating and latency, with an FTS5 full-text index
+               (``responses_fts``) over prompt, response text and notes
+    response_stats
+               per-model latency / token / rating aggregates (see
+               arena_analytics), updated in the same transaction as each
+               logged response so reading them never rescans the log
+    uploads    Data Hub upload history
+    meta       per-table revision counters
+
+Every write bumps its table's revision, so a session can compare the numbers
+it last loaded with ``revision(table)`` — one indexed read per rerun — and
+only re-load what another session changed.
+
+The response log is never loaded wholesale by the Arena: ``query_responses``
+filters, searches and pages it in SQL, so the Responses tab only ever holds
+one page of it. Where SQLite was built without FTS5 the search falls back to
+``LIKE`` scans.
+
+The database lives at ``$ARENA_DB_PATH`` (default ``arena.db`` in the working
+directory).
+"""
+
+import json
+import os
+import queue
+import re
+import sqlite3
+from contextlib import contextmanager
+
+from arena_analytics import ModelStats, update
+
+DB_PATH = os.environ.get("ARENA_DB_PATH", "arena.db")
+TABLES  = ("models", "responses", "uploads")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id           INTEGER PRIMARY KEY,         -- insertion order = Arena order
+    name         TEXT NOT NULL,
+    provider     TEXT,
+    category     TEXT,
+    release_date TEXT,
+    overall      REAL,
+    data         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_models_name     ON models(name);
+CREATE INDEX IF NOT EXISTS ix_models_provider ON models(provider);
+CREATE INDEX IF NOT EXISTS ix_models_category ON models(category);
+CREATE INDEX IF NOT EXISTS ix_models_release  ON models(release_date);
+
+CREATE TABLE IF NOT EXISTS responses (
+    id       INTEGER PRIMARY KEY,
+    prompt   TEXT NOT NULL,
+    model    TEXT NOT NULL,
+    response TEXT,
+    latency  REAL,
+    tokens   INTEGER,
+    rating   INTEGER,
+    notes    TEXT,
+    ts       TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_responses_prompt ON responses(prompt);
+DROP INDEX IF EXISTS ix_responses_model;
+CREATE INDEX IF NOT EXISTS ix_responses_model_rating ON responses(model, rating);
+CREATE INDEX IF NOT EXISTS ix_responses_rating  ON responses(rating);
+CREATE INDEX IF NOT EXISTS ix_responses_latency ON responses(latency);
+
+CREATE TABLE IF NOT EXISTS response_stats (
+    model TEXT PRIMARY KEY,
+    data  TEXT NOT NULL                       -- ModelStats.to_dict() as JSON
+);
+
+CREATE TABLE IF NOT EXISTS uploads (
+    id    INTEGER PRIMARY KEY,
+    file  TEXT,
+    count INTEGER,
+    mode  TEXT,
+    time  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# External-content FTS5 index over the responses table, kept in step by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS responses_fts USING fts5(
+    prompt, response, notes, content='responses', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS responses_ai AFTER INSERT ON responses BEGIN
+    INSERT INTO responses_fts(rowid, prompt, response, notes) VALUES (new.id, new.prompt, new.response, new.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS responses_ad AFTER DELETE ON responses BEGIN
+    INSERT INTO responses_fts(responses_fts, rowid, prompt, response, notes)
+    VALUES ('delete', old.id, old.prompt, old.response, old.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS responses_au AFTER UPDATE ON responses BEGIN
+    INSERT INTO responses_fts(responses_fts, rowid, prompt, response, notes)
+    VALUES ('delete', old.id, old.prompt, old.response, old.notes);
+    INSERT INTO responses_fts(rowid, prompt, response, notes) VALUES (new.id, new.prompt, new.response, new.notes);
+END;
+"""
+
+RESPONSE_FIELDS = ["model","response","latency","tokens","rating","notes","ts"]
+UPLOAD_FIELDS   = ["file","count","mode","time"]
+RESPONSE_ORDER  = {
+    "Newest":       "r.id DESC",
+    "Oldest":       "r.id",
+    "Best rated":   "r.rating DESC, r.id DESC",
+    "Fastest":      "r.latency, r.id DESC",
+}
+
+def fts_query(text: str) -> str:
+    """Free text → FTS5 query: every word must appear, each as a prefix
+    (``hallucinat`` matches "hallucinated")."""
+    return " ".join(f'"{w}"*' for w in re.findall(r"\w+", text))
+
+
+class ConnectionPool:
+    """A small pool of SQLite connections handed out one thread at a time.
+
+    Connections are opened lazily, configured for WAL on open, and up to
+    ``size`` idle ones are kept for reuse; extras are closed on release.
+    """
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 30.0):
+        self.path, self.timeout = path, timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class ArenaDB:
+    """Models, logged responses and upload history in one SQLite file."""
+
+    def __init__(self, path: str = DB_PATH, pool_size: int = 4):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            self.fts = self._init_fts(conn)
+        with self._write() as conn:               # one-off backfill for logs that predate the aggregates
+            if not conn.execute("SELECT 1 FROM response_stats LIMIT 1").fetchone():
+                rows = conn.execute(f"SELECT {', '.join(RESPONSE_FIELDS)} FROM responses ORDER BY id")
+                self._add_stats(conn, (dict(zip(RESPONSE_FIELDS, r)) for r in rows))
+
+    @staticmethod
+    def _init_fts(conn) -> bool:
+        new = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'responses_fts'").fetchone()
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:          # SQLite built without FTS5
+            return False
+        if new:                                   # index responses logged before it existed
+            conn.execute("INSERT INTO responses_fts(responses_fts) VALUES ('rebuild')")
+        return True
+
+    @contextmanager
+    def _write(self):
+        """Immediate write transaction (takes the write lock up front)."""
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump(conn, table: str) -> int:
+        conn.execute("INSERT INTO meta(key, value) VALUES (?, 1) "
+                     "ON CONFLICT(key) DO UPDATE SET value = value + 1", (table,))
+        return conn.execute("SELECT value FROM meta WHERE key = ?", (table,)).fetchone()[0]
+
+    def revision(self, table: str) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+    # ── models ───────────────────────────────────────
+    @staticmethod
+    def _model_rows(models):
+        for m in models:
+            yield (m["name"], m.get("provider",""), m.get("category",""), m.get("release_date",""),
+                   m.get("overall", 0), json.dumps(m))
+
+    def load_models(self) -> list[dict]:
+        with self.pool.connection() as conn:
+            return [json.loads(d) for (d,) in conn.execute("SELECT data FROM models ORDER BY id")]
+
+    def save_models(self, models) -> int:
+        """Replace the whole catalog; returns the new models revision."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM models")
+            conn.executemany("INSERT INTO models(name, provider, category, release_date, overall, data) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", self._model_rows(models))
+            return self._bump(conn, "models")
+
+    def add_models(self, models) -> int:
+        """Append models after the existing ones; returns the new revision."""
+        with self._write() as conn:
+            conn.executemany("INSERT INTO models(name, provider, category, release_date, overall, data) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", self._model_rows(models))
+            return self._bump(conn, "models")
+
+    def remove_model(self, name: str) -> int:
+        with self._write() as conn:
+            conn.execute("DELETE FROM models WHERE name = ?", (name,))
+            return self._bump(conn, "models")
+
+    # ── responses ────────────────────────────────────
+    def load_responses(self) -> dict:
+        """``{prompt: [entry, …]}`` in logging order, as the Responses tab keeps them."""
+        out = {}
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"SELECT prompt, {', '.join(RESPONSE_FIELDS)} FROM responses ORDER BY id")
+            for prompt, *vals in rows:
+                out.setdefault(prompt, []).append(dict(zip(RESPONSE_FIELDS, vals)))
+        return out
+
+    def log_response(self, prompt: str, entry: dict) -> int:
+        with self._write() as conn:
+            conn.execute(f"INSERT INTO responses(prompt, {', '.join(RESPONSE_FIELDS)}) "
+                         f"VALUES (?{', ?' * len(RESPONSE_FIELDS)})",
+                         [prompt] + [entry.get(f) for f in RESPONSE_FIELDS])
+            self._add_stats(conn, [entry])
+            return self._bump(conn, "responses")
+
+    def log_responses(self, entries) -> int:
+        """Log a batch of entries (each with its ``prompt``) in one transaction."""
+        entries = list(entries)
+        with self._write() as conn:
+            conn.executemany(f"INSERT INTO responses(prompt, {', '.join(RESPONSE_FIELDS)}) "
+                             f"VALUES (?{', ?' * len(RESPONSE_FIELDS)})",
+                             ([e["prompt"]] + [e.get(f) for f in RESPONSE_FIELDS] for e in entries))
+            self._add_stats(conn, entries)
+            return self._bump(conn, "responses")
+
+    @staticmethod
+    def _add_stats(conn, entries):
+        """Fold new entries into the stored per-model aggregates."""
+        entries = list(entries)
+        models = sorted({e["model"] for e in entries})
+        stats = {}
+        for i in range(0, len(models), 500):              # stay under SQLite's variable limit
+            part = models[i:i + 500]
+            stats.update((m, ModelStats.from_dict(json.loads(d))) for m, d in conn.execute(
+                f"SELECT model, data FROM response_stats WHERE model IN ({', '.join('?' * len(part))})", part))
+        update(stats, entries)
+        conn.executemany("INSERT OR REPLACE INTO response_stats(model, data) VALUES (?, ?)",
+                         [(m, json.dumps(s.to_dict())) for m, s in stats.items()])
+
+    def load_response_stats(self) -> dict:
+        """``{model: ModelStats}`` — one small row per model."""
+        with self.pool.connection() as conn:
+            return {m: ModelStats.from_dict(json.loads(d))
+                    for m, d in conn.execute("SELECT model, data FROM response_stats ORDER BY model")}
+
+    def _response_filter(self, text, model, min_rating, max_latency, prompt):
+        where, args = [], []
+        if fts_query(text):
+            if self.fts:
+                where.append("r.id IN (SELECT rowid FROM responses_fts WHERE responses_fts MATCH ?)")
+                args.append(fts_query(text))
+            else:
+                for w in re.findall(r"\w+", text):
+                    like = "%" + w.replace("_", "\\_") + "%"      # \w+ words: only "_" is special
+                    where.append("(r.prompt LIKE ? ESCAPE '\\' OR r.response LIKE ? ESCAPE '\\' "
+                                 "OR r.notes LIKE ? ESCAPE '\\')")
+                    args += [like] * 3
+        for cond, val in (("r.model = ?", model), ("r.rating >= ?", min_rating),
+                          ("r.latency <= ?", max_latency), ("r.prompt = ?", prompt)):
+            if val is not None:
+                where.append(cond)
+                args.append(val)
+        return (" WHERE " + " AND ".join(where) if where else ""), args
+
+    def query_responses(self, text: str = "", model: str = None, min_rating: int = None,
+                        max_latency: float = None, prompt: str = None, order: str = "Newest",
+                        limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
+        """One page of logged responses matching every given filter, plus the
+        total match count. ``text`` is searched in prompt, response and notes;
+        ``order`` is a key of ``RESPONSE_ORDER``.
+
+        e.g. ``query_responses("hallucinat", model="GPT-4o", min_rating=8)``
+        """
+        where, args = self._response_filter(text, model, min_rating, max_latency, prompt)
+        with self.pool.connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM responses r{where}", args).fetchone()[0]
+            rows = conn.execute(f"SELECT r.id, r.prompt, {', '.join('r.' + f for f in RESPONSE_FIELDS)} "
+                                f"FROM responses r{where} ORDER BY {RESPONSE_ORDER[order]} LIMIT ? OFFSET ?",
+                                args + [limit, offset]).fetchall()
+        return [dict(zip(["id", "prompt"] + RESPONSE_FIELDS, r)) for r in rows], total
+
+    def response_models(self) -> list[str]:
+        """Distinct models with logged responses (an index-only scan)."""
+        with self.pool.connection() as conn:
+            return [m for (m,) in conn.execute("SELECT DISTINCT model FROM responses ORDER BY model")]
+
+    def clear_responses(self) -> int:
+        with self._write() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM response_stats")
+            return self._bump(conn, "responses")
+
+    # ── uploads ──────────────────────────────────────
+    def load_uploads(self) -> list[dict]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"SELECT {', '.join(UPLOAD_FIELDS)} FROM uploads ORDER BY id")
+            return [dict(zip(UPLOAD_FIELDS, r)) for r in rows]
+
+    def log_upload(self, entry: dict) -> int:
+        with self._write() as conn:
+            conn.execute(f"INSERT INTO uploads({', '.join(UPLOAD_FIELDS)}) VALUES (?, ?, ?, ?)",
+                         [entry.get(f) for f in UPLOAD_FIELDS])
+            return self._bump(conn, "uploads")
+
+
+# ═══════════════════════════════════════════════════════
+# SESSION SYNC
+# ═══════════════════════════════════════════════════════
+def sync(state, db: ArenaDB, loaders: dict):
+    """Reload into ``state`` every table another session has written since
+    this one last looked. ``loaders`` maps table → ``(state_key, load)``,
+    e.g. ``{"models": ("models", lambda: ModelStore(db.load_models()))}``.
+    """
+    seen = state.setdefault("db_rev", {})
+    for table, (key, load) in loaders.items():
+        rev = db.revision(table)
+        if seen.get(table) != rev:
+            state[key] = load()
+            seen[table] = rev
+
+def wrote(state, table: str, rev: int, replaced: bool = False):
+    """Record a write this session made so ``sync`` doesn't reload it.
+
+    An incremental write is only known to match local state if nobody else
+    wrote in between (``rev`` is exactly one ahead); a full replace always is.
+    """
+    seen = state.setdefault("db_rev", {})
+    if replaced or seen.get(table) == rev - 1:
+        seen[table] = rev
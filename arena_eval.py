@@ -0,0 +1,392 @@
+"""
+AI Model Arena — Offline Evaluation Runner
+==========================================
+Fans prompts out to Arena models concurrently (asyncio) and turns each
+answer into a response-log entry with its measured latency and token count,
+ready for ``ArenaDB.log_responses``.
+
+Every model is served by a ``Backend``:
+
+    EchoBackend   in-process mock: echoes the prompt back after a simulated
+                  latency — no network, no server
+    HTTPBackend   any OpenAI-compatible ``/v1/chat/completions`` endpoint on
+                  the local machine (llama.cpp, Ollama, vLLM … or the echo
+                  server below), over pooled keep-alive connections
+
+Each backend instance carries its own concurrency limit, so a slow local
+server is never sent more requests at once than it can take. Jobs go through
+``arena_scheduler.Scheduler`` for per-provider rate limits, retries with
+backoff and coalescing of repeated (model, prompt) pairs. With a
+``ResponseCache`` a (model, prompt, backend params) call that was already
+answered is served from the cache and not sent — or logged — again.
+
+A stand-in server needs nothing but the standard library:
+
+    python arena_eval.py serve [port] [rpm]    # default 8799, no limit
+
+With ``rpm`` it behaves like a rate-limited provider: over that many
+requests in a rolling minute it answers 429 with a ``Retry-After``.
+"""
+
+import asyncio
+import collections
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from arena_cache import ResponseCache, response_key
+from arena_scheduler import Scheduler
+
+ECHO_PORT = 8799
+
+
+def count_tokens(text: str) -> int:
+    """Whitespace token estimate, for backends that don't report usage."""
+    return len(text.split())
+
+def call_cost(model: dict, prompt: str, completion_tokens: int) -> float:
+    """Dollar cost of one call at the model's ``price_in`` / ``price_out`` ($/1M tokens)."""
+    return (count_tokens(prompt) * (model.get("price_in") or 0)
+            + completion_tokens * (model.get("price_out") or 0)) / 1e6
+
+
+# ═══════════════════════════════════════════════════════
+# BACKENDS
+# ═══════════════════════════════════════════════════════
+class Backend:
+    """Interface: ``await complete(model, prompt) -> dict(text, tokens)``.
+
+    ``model`` is the Arena record (a dict with at least ``name``).
+    ``concurrency`` caps how many ``complete`` calls run at once.
+    """
+
+    name = "backend"
+    max_tokens = 256                      # completion budget, used to estimate tokens/min cost
+
+    def __init__(self, concurrency: int = 4):
+        self.concurrency = concurrency
+        self._sem = None
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # created lazily so it binds to the loop that actually runs the eval
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        return self._sem
+
+    def params(self) -> dict:
+        """Everything besides model and prompt that shapes the answer (cache key)."""
+        return dict(backend=self.name, max_tokens=self.max_tokens)
+
+    async def complete(self, model: dict, prompt: str) -> dict:
+        raise NotImplementedError
+
+    async def close(self):
+        self._sem = None
+
+
+class EchoBackend(Backend):
+    """Mock backend: answers ``"[model] prompt"`` after ``latency_ms`` (lo, hi)."""
+
+    name = "echo"
+
+    def __init__(self, concurrency: int = 32, latency_ms: tuple = (20, 200), seed: int = None):
+        super().__init__(concurrency)
+        self.latency_ms = latency_ms
+        self._rng = random.Random(seed)
+
+    async def complete(self, model: dict, prompt: str) -> dict:
+        await asyncio.sleep(self._rng.uniform(*self.latency_ms) / 1000)
+        text = f"[{model['name']}] {prompt}"
+        return dict(text=text, tokens=count_tokens(text))
+
+
+class HTTPError(RuntimeError):
+    """Non-200 reply; ``status`` and ``retry_after`` (seconds) drive retries."""
+
+    def __init__(self, status: int, body: bytes, retry_after: float = None):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        self.status, self.retry_after = status, retry_after
+
+
+def _retry_after(value: str) -> float | None:
+    """``Retry-After`` in seconds — delta-seconds or an HTTP-date; None if unusable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        # small request/response pairs: don't let Nagle + delayed ACK stall each one
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def close(self):
+        self.writer.close()
+
+
+class HTTPBackend(Backend):
+    """OpenAI-compatible chat endpoint over pooled HTTP/1.1 keep-alive connections.
+
+    Up to ``concurrency`` connections are opened and reused; a connection the
+    server closes (or answers with ``Connection: close``) is dropped and the
+    next request opens a fresh one. If a pooled connection turns out to have
+    been closed while idle, the pool is discarded and the request is retried
+    once on a new connection.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str = f"http://127.0.0.1:{ECHO_PORT}", concurrency: int = 4,
+                 timeout: float = 60.0, api_key: str = None, max_tokens: int = 512):
+        super().__init__(concurrency)
+        url = urlsplit(base_url)
+        if url.scheme != "http":
+            raise ValueError("HTTPBackend talks plain http to local servers only")
+        self.host, self.port = url.hostname, url.port or 80
+        self.path = url.path.rstrip("/") + "/v1/chat/completions"
+        self.timeout, self.api_key, self.max_tokens = timeout, api_key, max_tokens
+        self._idle = []
+
+    def params(self) -> dict:
+        return dict(super().params(), url=f"{self.host}:{self.port}{self.path}")
+
+    async def _exchange(self, conn: _Connection, request: bytes) -> tuple[int, dict, bytes]:
+        conn.writer.write(request)
+        await conn.writer.drain()
+        parts = (await conn.reader.readline()).split()
+        if len(parts) < 2 or not parts[1].isdigit():                 # b"" = the server closed it
+            raise ConnectionError("connection closed before a status line")
+        status = int(parts[1])
+        headers = {}
+        while (line := await conn.reader.readline()) not in (b"\r\n", b"\n", b""):
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while size := int((await conn.reader.readline()).split(b";")[0], 16):
+                data += await conn.reader.readexactly(size)
+                await conn.reader.readline()
+            await conn.reader.readline()
+        else:
+            data = await conn.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, data
+
+    async def _request(self, body: bytes) -> tuple[int, dict, bytes]:
+        head = (f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                + (f"Authorization: Bearer {self.api_key}\r\n" if self.api_key else "")
+                + "Connection: keep-alive\r\n\r\n").encode() + body
+        pooled = bool(self._idle)
+        conn = self._idle.pop() if pooled else _Connection(*await asyncio.open_connection(self.host, self.port))
+        try:
+            status, headers, data = await self._exchange(conn, head)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn.close()
+            if not pooled:
+                raise
+            # the server dropped an idle keep-alive connection (and likely the
+            # rest of the pool with it): discard them and retry once on a fresh one
+            while self._idle:
+                self._idle.pop().close()
+            conn = _Connection(*await asyncio.open_connection(self.host, self.port))
+            try:
+                status, headers, data = await self._exchange(conn, head)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        if headers.get("connection", "").lower() == "close" or len(self._idle) >= self.concurrency:
+            conn.close()
+        else:
+            self._idle.append(conn)
+        return status, headers, data
+
+    async def complete(self, model: dict, prompt: str) -> dict:
+        body = json.dumps(dict(model=model["name"], max_tokens=self.max_tokens,
+                               messages=[dict(role="user", content=prompt)])).encode()
+        status, headers, data = await asyncio.wait_for(self._request(body), self.timeout)
+        if status != 200:
+            raise HTTPError(status, data, _retry_after(headers.get("retry-after")))
+        out = json.loads(data)
+        text = out["choices"][0]["message"]["content"]
+        tokens = (out.get("usage") or {}).get("completion_tokens")
+        return dict(text=text, tokens=tokens if tokens is not None else count_tokens(text))
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+        await super().close()
+
+
+# ═══════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════
+async def _one(backend: Backend, model: dict, prompt: str) -> dict:
+    async with backend.slots:
+        t0 = time.perf_counter()
+        out = await backend.complete(model, prompt)
+        latency = (time.perf_counter() - t0) * 1000
+    return dict(prompt=prompt, model=model["name"], response=out["text"],
+                latency=round(latency, 1), tokens=int(out["tokens"]), rating=None,
+                notes=f"auto · {backend.name}", ts=datetime.now().strftime("%H:%M:%S"))
+
+async def run_eval(models, prompts, backend_for, on_result=None, scheduler: Scheduler = None,
+                   cache: ResponseCache = None) -> tuple[list, list]:
+    """Run every prompt against every model through ``scheduler``.
+
+    ``backend_for(model) -> Backend``; ``on_result(done, total)`` is called as
+    each job finishes. Returns ``(entries, errors)`` — log entries for the
+    calls actually made and ``"model · prompt: error"`` messages for the rest;
+    cache hits only show up in ``cache.stats()``. The default scheduler
+    applies the per-provider ``RATE_LIMITS``.
+    """
+    scheduler = scheduler or Scheduler(usage=lambda e: e["tokens"] + count_tokens(e["prompt"]))
+    backends, total, done = {}, len(models) * len(prompts), 0
+
+    async def call(b, m, p, key):
+        entry = await _one(b, m, p)
+        if cache is not None:
+            cache.put(key, entry)
+        return entry
+
+    def jobs():
+        for p in prompts:
+            for m in models:
+                b = backend_for(m)
+                backends[id(b)] = b
+                key = response_key(m["name"], p, b.params()) if cache is not None else None
+                if key and (hit := cache.get(key)) is not None:
+                    cache.hit(call_cost(m, p, hit["tokens"]), hit["latency"])
+                    progress(None, hit, None)
+                    continue
+                yield ((m["name"], p), m.get("provider") or "Custom", count_tokens(p) + b.max_tokens,
+                       lambda b=b, m=m, p=p, key=key: call(b, m, p, key))
+
+    def progress(job, result, error):
+        nonlocal done
+        done += 1
+        if on_result:
+            on_result(done, total)
+
+    try:
+        entries, failed = await scheduler.map(jobs(), progress)
+    finally:
+        for b in backends.values():
+            await b.close()
+    errors = [f"{key[0]} · {key[1][:40]}: {type(ex).__name__}: {ex}" for (key, *_), ex in failed]
+    return entries, errors
+
+def evaluate(models, prompts, backend_for, on_result=None, scheduler: Scheduler = None,
+             cache: ResponseCache = None) -> tuple[list, list]:
+    """Blocking wrapper around ``run_eval`` (e.g. for a Streamlit button)."""
+    return asyncio.run(run_eval(list(models), list(prompts), backend_for, on_result, scheduler, cache))
+
+def read_prompts(file) -> list[str]:
+    """Prompts from an uploaded file: one per line (.txt), or JSON lines /
+    a JSON array of strings or ``{"prompt": ...}`` objects."""
+    data = file.read() if hasattr(file, "read") else file
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        values = json.loads(stripped)
+    elif stripped.startswith("{"):
+        values = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        values = text.splitlines()
+    prompts = [v.get("prompt", "") if isinstance(v, dict) else str(v) for v in values]
+    return [p.strip() for p in prompts if p.strip()]
+
+
+# ═══════════════════════════════════════════════════════
+# LOCAL ECHO SERVER
+# ═══════════════════════════════════════════════════════
+class EchoHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat endpoint that echoes the last message."""
+
+    protocol_version = "HTTP/1.1"           # keep-alive, so pooled clients reuse sockets
+    disable_nagle_algorithm = True
+    rpm = None                              # requests per rolling minute before 429s
+    _window = collections.deque()
+    _lock = threading.Lock()
+
+    def _over_limit(self) -> float:
+        """Seconds until a slot frees up, or 0 if this request is allowed."""
+        if not self.rpm:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if len(self._window) >= self.rpm:
+                return 60 - (now - self._window[0])
+            self._window.append(now)
+            return 0
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if wait := self._over_limit():
+            body = b'{"error": "rate limit exceeded"}'
+            self.send_response(429)
+            self.send_header("Retry-After", f"{wait:.2f}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        prompt = (req.get("messages") or [{}])[-1].get("content", "")
+        text = f"[{req.get('model', 'echo')}] {prompt}"
+        body = json.dumps(dict(
+            object="chat.completion", model=req.get("model"),
+            choices=[dict(index=0, message=dict(role="assistant", content=text), finish_reason="stop")],
+            usage=dict(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(text)),
+        )).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def echo_server(port: int = ECHO_PORT, host: str = "127.0.0.1", rpm: int = None) -> ThreadingHTTPServer:
+    """An echo server (not yet serving); ``rpm`` makes it rate-limit like a provider."""
+    handler = type("Handler", (EchoHandler,), dict(rpm=rpm, _window=collections.deque()))
+    return ThreadingHTTPServer((host, port), handler)
+
+def serve(port: int = ECHO_PORT, host: str = "127.0.0.1", rpm: int = None):
+    server = echo_server(port, host, rpm)
+    print(f"Arena echo server on http://{host}:{port}/v1/chat/completions"
+          + (f" · {rpm} requests/min" if rpm else ""))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else ECHO_PORT,
+              rpm=int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    else:
+        print(__doc__)
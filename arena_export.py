@@ -0,0 +1,206 @@
+"""
+AI Model Arena — Lazy, Cached Exports
+=====================================
+Download payloads (CSV / JSON / Markdown / snapshot) are built only when a
+download is actually requested and then kept until the dataset changes, so
+reruns triggered by unrelated widgets never re-serialize the Arena.
+
+Writers stream into a (optionally gzip-compressed) in-memory sink instead of
+building one big string first and encoding it afterwards.
+
+Table exports (CSV / Markdown / NDJSON) are generators over the store: each
+step pulls ``CHUNK_ROWS`` rows of only the projected columns straight from
+``ModelStore`` and yields one text chunk, so memory stays flat however big
+the Arena is and no full DataFrame is ever built.
+"""
+
+import csv
+import gzip
+import io
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+from arena_store import DIMS, DIM_LABELS
+
+GZIP_MIME  = "application/gzip"
+CHUNK_ROWS = 5_000
+
+
+# ═══════════════════════════════════════════════════════
+# TABLE COLUMNS  — label → (store, rows) → values, in Full Data order
+# ═══════════════════════════════════════════════════════
+def _rec(key, fmt=None):
+    return lambda s, rows: [fmt(m.get(key, "")) if fmt else m.get(key, "") for m in s.take(rows)]
+
+def _num(field, decimals):
+    return lambda s, rows: s.col(field, rows, decimals=decimals)
+
+TABLE_COLUMNS = {
+    "Model":       lambda s, rows: s.names(rows),
+    "Provider":    _rec("provider"),
+    "Version":     _rec("version"),
+    "Category":    _rec("category"),
+    "Overall":     _num("overall", 1),
+    **{l: (lambda d: lambda s, rows: s.col(d, rows).astype(int))(d) for d, l in zip(DIMS, DIM_LABELS)},
+    "MMLU %":      _num("mmlu", 2),
+    "GSM8K %":     _num("gsm8k", 2),
+    "HumanEval %": _num("humaneval", 2),
+    "In $/1M":     _num("price_in", 4),
+    "Out $/1M":    _num("price_out", 4),
+    "Context (K)": lambda s, rows: s.col("context", rows).astype(np.int64) // 1000,
+    "License":     _rec("license"),
+    "Release":     _rec("release_date"),
+    "OSS":         lambda s, rows: np.where(s.col("open_source", rows) > 0, "✅", "❌"),
+    "Tags":        _rec("tags", ", ".join),
+}
+
+def table_columns(store, rows, columns=None) -> dict:
+    """``{label: values}`` for ``rows`` — the Full Data table, or a projection of it."""
+    rows = np.asarray(rows, dtype=np.int64)
+    return {c: TABLE_COLUMNS[c](store, rows) for c in (columns or TABLE_COLUMNS)}
+
+_KEEP = object()
+
+def _plain(c, nan_as):
+    if not isinstance(c, np.ndarray):
+        return c
+    if nan_as is not _KEEP and c.dtype.kind == "f":
+        nan = np.isnan(c)
+        if nan.any():
+            c = c.astype(object)
+            c[nan] = nan_as
+    return c.tolist()
+
+def _blocks(store, rows, columns, chunk, nan_as=_KEEP):
+    """Yield row-major lists of plain Python values, ``chunk`` rows at a time
+    (NaN replaced by ``nan_as`` when given)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    for i in range(0, len(rows), chunk):
+        cols = table_columns(store, rows[i:i + chunk], columns).values()
+        yield list(zip(*(_plain(c, nan_as) for c in cols)))
+
+
+# ═══════════════════════════════════════════════════════
+# CHUNK GENERATORS
+# ═══════════════════════════════════════════════════════
+def csv_chunks(store, rows, columns=None, chunk: int = CHUNK_ROWS):
+    """Same text ``pd.DataFrame(table_columns(...)).to_csv(index=False)`` gives."""
+    columns = list(columns or TABLE_COLUMNS)
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(columns)
+    yield buf.getvalue()
+    for block in _blocks(store, rows, columns, chunk, nan_as=None):     # csv writes None as ""
+        buf.seek(0); buf.truncate()
+        w.writerows(block)
+        yield buf.getvalue()
+
+def markdown_chunks(store, rows, columns=None, chunk: int = CHUNK_ROWS):
+    columns = list(columns or TABLE_COLUMNS)
+    yield "| " + " | ".join(columns) + " |\n" + "| " + " | ".join("---" for _ in columns) + " |"
+    for block in _blocks(store, rows, columns, chunk):
+        yield "".join("\n| " + " | ".join(str(v) for v in r) + " |" for r in block)
+
+def ndjson_chunks(store, rows, columns=None, chunk: int = CHUNK_ROWS):
+    """One JSON object per line; NaN becomes null so every line is strict JSON."""
+    columns = list(columns or TABLE_COLUMNS)
+    for block in _blocks(store, rows, columns, chunk, nan_as=None):
+        yield "".join(json.dumps(dict(zip(columns, r))) + "\n" for r in block)
+
+def records_csv_chunks(records, chunk: int = CHUNK_ROWS):
+    """Raw records as CSV (``pd.DataFrame(records).to_csv``), one slice at a time."""
+    keys = list(dict.fromkeys(k for m in records for k in m))
+    for i in range(0, len(records), chunk):
+        yield pd.DataFrame(records[i:i + chunk], columns=keys).to_csv(index=False, header=i == 0)
+    if not records:
+        yield pd.DataFrame(columns=keys).to_csv(index=False)
+
+
+# ═══════════════════════════════════════════════════════
+# WRITERS  — each takes a text stream as its last argument
+# ═══════════════════════════════════════════════════════
+def write_json(records, out):
+    """Same bytes as ``json.dumps(records, indent=2)``, emitted piecewise."""
+    for chunk in json.JSONEncoder(indent=2).iterencode(records):
+        out.write(chunk)
+
+def write_chunks(chunks, out):
+    """Drain a chunk generator into any text file-like object."""
+    for c in chunks:
+        out.write(c)
+
+def render(write, *args, gz: bool = False) -> io.BytesIO:
+    """Run ``write(*args, text_stream)`` into memory; gzip-compress if asked.
+
+    The buffer itself is returned (``st.download_button`` takes it as is), so
+    the finished export is never copied out into a second ``bytes`` object.
+    """
+    buf  = io.BytesIO()
+    sink = gzip.GzipFile(fileobj=buf, mode="wb", mtime=0) if gz else buf
+    text = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+    write(*args, text)
+    text.flush()
+    text.detach()
+    if gz:
+        sink.close()
+    buf.seek(0)
+    return buf
+
+def render_bytes(build, gz: bool = False) -> bytes:
+    """For builders that already produce bytes (e.g. snapshots)."""
+    data = build()
+    return gzip.compress(data, mtime=0) if gz else data
+
+
+# ═══════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════
+class ExportCache:
+    """Finished export payloads for one dataset version.
+
+    ``get(version, key, build)`` returns the cached payload for ``key`` while
+    ``version`` (e.g. ``ModelStore.version``) is unchanged; a new version
+    drops everything built for the old one.
+
+    Lazy downloads call ``get`` from Streamlit's download thread while the
+    script thread uses the cache too, so every access holds a lock. The
+    build itself runs outside it; a payload built for a version that was
+    replaced meanwhile is returned but not stored.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _sync(self, version):
+        if version != self.version:
+            self._data.clear()
+            self.version = version
+
+    def get(self, version, key, build):
+        with self._lock:
+            self._sync(version)
+            if key in self._data:
+                return self._data[key]
+        payload = build()
+        with self._lock:
+            if version == self.version:
+                payload = self._data.setdefault(key, payload)
+        return payload
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+def lazy(cache: ExportCache, version, key, build):
+    """A zero-arg callable for ``st.download_button(data=...)``: nothing is
+    built until the user clicks, and repeat clicks reuse the payload."""
+    return lambda: cache.get(version, key, build)
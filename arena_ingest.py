@@ -0,0 +1,454 @@
+"""
+AI Model Arena — Streaming Dataset Ingestion
+============================================
+Reads uploaded CSV / JSON model datasets a chunk at a time instead of
+materialising the whole file: CSV goes through ``pd.read_csv(chunksize=…)``
+and JSON arrays are decoded element by element from a bounded text buffer.
+Each chunk is normalised into the Arena schema and validated before the next
+one is read, so peak memory is one chunk of raw rows plus the models kept.
+
+Response logs (eval-harness output for the Responses tab) use the same
+readers — CSV, JSON arrays and NDJSON — and are validated against the log's
+fields so each chunk can be committed to the database as it arrives.
+"""
+
+import codecs
+import json
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from arena_store import DIMS
+from arena_scoring import compute_overall, score_dims
+
+CHUNK_ROWS      = 5_000           # rows normalised per step
+CHUNK_BYTES     = 1 << 20         # bytes read per JSON buffer refill
+MAX_VALUE_BYTES = 32 << 20        # a single JSON element larger than this is rejected
+
+
+# ═══════════════════════════════════════════════════════
+# ROW NORMALISATION
+# ═══════════════════════════════════════════════════════
+def safe_float(val, default=0.0):
+    try:    return float(val)
+    except: return default
+
+def safe_int(val, default=0):
+    try:    return int(float(val))
+    except: return default
+
+def safe_list(val):
+    """Turn a string like 'Text,Image' or ['Text','Image'] into a list."""
+    if isinstance(val, list):
+        return [str(v).strip() for v in val if str(v).strip()]
+    if isinstance(val, str):
+        return [v.strip() for v in val.split(",") if v.strip()]
+    return []
+
+def row_to_model(row: dict) -> dict:
+    """Normalise a raw dict (from CSV/JSON row) into the Arena model schema."""
+    m = {}
+    m["name"]         = str(row.get("name","")).strip()
+    m["provider"]     = str(row.get("provider","")).strip()
+    m["version"]      = str(row.get("version","")).strip()
+    m["category"]     = str(row.get("category","General")).strip() or "General"
+    m["release_date"] = str(row.get("release_date","")).strip()
+    m["license"]      = str(row.get("license","Proprietary")).strip() or "Proprietary"
+    m["modalities"]   = safe_list(row.get("modalities","Text"))
+    m["tags"]         = safe_list(row.get("tags",""))
+    m["notes"]        = str(row.get("notes","")).strip()
+    m["benchmark"]    = str(row.get("benchmark","")).strip()
+    m["public_resp"]  = str(row.get("public_resp","")).strip()
+    m["open_source"]  = str(row.get("open_source","false")).lower() in ("true","1","yes","open source")
+    # numeric perf scores
+    for d in DIMS:
+        m[d] = min(100, max(0, safe_int(row.get(d, 0))))
+    # pricing / context / benchmarks
+    m["price_in"]   = safe_float(row.get("price_in",  0.0))
+    m["price_out"]  = safe_float(row.get("price_out", 0.0))
+    m["context"]    = safe_int(row.get("context", 128000))
+    m["mmlu"]       = safe_float(row.get("mmlu",      0.0))
+    m["gsm8k"]      = safe_float(row.get("gsm8k",     0.0))
+    m["humaneval"]  = safe_float(row.get("humaneval",  0.0))
+    m["added_at"]   = datetime.now().strftime("%Y-%m-%d %H:%M")
+    m["overall"]    = compute_overall(m)
+    return m
+
+# ── batch path: one DataFrame chunk at a time ──────
+# (field, default) pairs in row_to_model's key order
+STR_FIELDS   = [("name",""),("provider",""),("version",""),("category","General"),
+                ("release_date",""),("license","Proprietary")]
+LIST_FIELDS  = [("modalities","Text"),("tags","")]
+TEXT_FIELDS  = [("notes",""),("benchmark",""),("public_resp","")]
+FLOAT_FIELDS = [("price_in",0.0),("price_out",0.0)]
+BENCH_FIELDS = [("mmlu",0.0),("gsm8k",0.0),("humaneval",0.0)]
+TRUTHY       = ["true","1","yes","open source"]
+
+def _strs(s: pd.Series) -> pd.Series:
+    # str(v) for every cell, NaN → "nan" exactly like the per-row path
+    return s.map(str)
+
+def _str_col(df, field, default) -> list:
+    if field not in df:
+        return [default] * len(df)
+    out = _strs(df[field]).str.strip()
+    if default:                                   # `... .strip() or "General"`
+        out = out.mask(out.eq(""), default)
+    return out.tolist()
+
+def _list_col(df, field, default) -> list:
+    n = len(df)
+    if field not in df:
+        return [safe_list(default) for _ in range(n)]
+    s = df[field]
+    out = [[] for _ in range(n)]
+    if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+        return out                                # numbers / bools / all-NaN → []
+    # object columns can mix strings with bools / numbers / lists (`true,` reads
+    # as a bool cell), and .str fails on those, so only the str cells are split
+    text = s.map(type).eq(str).to_numpy()
+    tok = s[text].astype(object).str.split(",").explode().str.strip()
+    tok = tok[tok.notna() & tok.ne("")]
+    # explode keeps row order, so each row's tokens form one contiguous run
+    rows, vals = tok.index.to_numpy(), tok.tolist()
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else rows
+    for i, a, b in zip(rows[starts].tolist(), starts.tolist(), np.r_[starts[1:], len(rows)].tolist()):
+        out[i] = vals[a:b]
+    for i in np.flatnonzero(~text & s.notna().to_numpy()):   # lists and other scalars, as per row
+        out[i] = safe_list(s.iat[i])
+    return out
+
+def _num_col(df, field):
+    """(values, bad): float64 values plus a mask of cells ``float()`` rejects."""
+    n = len(df)
+    if field not in df:
+        return np.zeros(n), np.ones(n, dtype=bool)
+    s = df[field]
+    bad = np.zeros(n, dtype=bool)
+    if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+        return s.to_numpy(dtype=np.float64, na_value=np.nan), bad
+    # text column: object → float64 calls float() per cell in C, so values match
+    # the per-row path bit for bit; only if some cell fails do we look closer
+    obj = s.to_numpy(dtype=object)
+    try:
+        return obj.astype(np.float64), bad
+    except (TypeError, ValueError):
+        pass
+    v  = np.full(n, np.nan)
+    ok = pd.to_numeric(s, errors="coerce").notna().to_numpy()
+    v[ok] = obj[ok].astype(np.float64)
+    for i in np.flatnonzero(~ok):               # "nan", None, "abc", …
+        f = safe_float(obj[i], None)
+        if f is None: bad[i] = True
+        else:         v[i] = f
+    return v, bad
+
+def _float_col(df, field, default) -> np.ndarray:
+    v, bad = _num_col(df, field)
+    return np.where(bad, 0.0, v) if field in df else np.full(len(df), default)
+
+def _int_col(df, field, default, lo=None, hi=None) -> np.ndarray:
+    """``safe_int`` per cell: unparseable / nan / inf → 0, missing column → ``default``."""
+    if field not in df:
+        return np.full(len(df), default, dtype=np.int64)
+    v, bad = _num_col(df, field)
+    bad |= ~np.isfinite(v)
+    if lo is not None:
+        v = np.clip(v, lo, hi)
+    return np.where(bad, 0, np.trunc(v)).astype(np.int64)
+
+def normalize_frame(df: pd.DataFrame) -> list[dict]:
+    """Vectorised ``row_to_model`` over a whole DataFrame chunk.
+
+    Produces exactly the dicts ``[row_to_model(r) for r in df.to_dict("records")]``
+    would: numbers go through ``pd.to_numeric`` + ``clip``, lists through
+    ``str.split``/``explode`` and ``open_source`` through one ``isin``.
+    """
+    df = df.reset_index(drop=True)
+    n = len(df)
+    cols = {f: _str_col(df, f, d) for f, d in STR_FIELDS}
+    cols.update({f: _list_col(df, f, d) for f, d in LIST_FIELDS})
+    cols.update({f: _str_col(df, f, d) for f, d in TEXT_FIELDS})
+    cols["open_source"] = (_strs(df["open_source"]).str.lower().isin(TRUTHY).tolist()
+                           if "open_source" in df else [False] * n)
+    D = np.column_stack([_int_col(df, d, 0, 0, 100) for d in DIMS]) if n else np.zeros((0, len(DIMS)))
+    cols.update({d: D[:, j].tolist() for j, d in enumerate(DIMS)})
+    cols.update({f: _float_col(df, f, d).tolist() for f, d in FLOAT_FIELDS})
+    cols["context"] = _int_col(df, "context", 128000).tolist()
+    cols.update({f: _float_col(df, f, d).tolist() for f, d in BENCH_FIELDS})
+    cols["added_at"] = [datetime.now().strftime("%Y-%m-%d %H:%M")] * n
+    cols["overall"]  = score_dims(D).tolist()
+    keys = list(cols)
+    return [dict(zip(keys, vals)) for vals in zip(*cols.values())]
+
+def validate_models(models: list, seen_names: set = None, start: int = 0) -> tuple[list, list]:
+    """Return (valid_models, error_messages).
+
+    Pass the same ``seen_names`` set and a running ``start`` row offset for
+    every chunk of one file so duplicates and row numbers span chunks.
+    """
+    valid, errors = [], []
+    seen_names = set() if seen_names is None else seen_names
+    for i, m in enumerate(models, start):
+        row_errors = []
+        if not m.get("name"):
+            row_errors.append("Missing 'name'")
+        elif m["name"] in seen_names:
+            row_errors.append(f"Duplicate name '{m['name']}'")
+        else:
+            seen_names.add(m["name"])
+        # warn if all performance scores are 0
+        if all(m.get(d, 0) == 0 for d in DIMS):
+            row_errors.append("All performance scores are 0 — did you map the columns?")
+        if row_errors:
+            errors.append(f"Row {i+1} ({m.get('name','?')}): " + "; ".join(row_errors))
+        else:
+            valid.append(m)
+    return valid, errors
+
+
+# ═══════════════════════════════════════════════════════
+# CHUNKED READERS
+# ═══════════════════════════════════════════════════════
+def iter_csv_frames(file, chunksize: int = CHUNK_ROWS):
+    """Yield DataFrames of up to ``chunksize`` rows from a CSV file."""
+    for df in pd.read_csv(file, chunksize=chunksize):
+        df.columns = [c.strip().lower().replace(" ","_") for c in df.columns]
+        yield df
+
+
+class _JsonStream:
+    """Pull-style reader over a binary JSON file with a bounded text buffer."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, file, chunk_bytes: int = CHUNK_BYTES):
+        self.file = file
+        self.chunk_bytes = chunk_bytes
+        self.utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = ""
+        while not data:
+            raw = self.file.read(self.chunk_bytes)
+            data = self.utf8.decode(raw, final=not raw) if isinstance(raw, bytes) else raw
+            if not raw:
+                break
+        self.eof = not data
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return bool(data)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected '{ch}' in JSON, found '{got or 'end of file'}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, refilling until it fits."""
+        self.peek()
+        while True:
+            try:
+                v, end = self._decoder.raw_decode(self.buf, self.pos)
+                # a number ending exactly at the buffer edge may continue in the next read
+                if end < len(self.buf) or not self._fill():
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError:
+                if len(self.buf) - self.pos > MAX_VALUE_BYTES or not self._fill():
+                    raise
+
+
+def _array_chunks(s: _JsonStream, chunksize: int):
+    s.expect("[")
+    if s.peek() == "]":
+        s.pos += 1
+        return
+    batch = []
+    while True:
+        batch.append(s.value())
+        if len(batch) >= chunksize:
+            yield batch
+            batch = []
+        c = s.peek()
+        s.pos += 1
+        if c == "]":
+            break
+        if c != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found '{c or 'end of file'}'")
+    if batch:
+        yield batch
+
+
+def iter_json_rows(file, chunksize: int = CHUNK_ROWS, chunk_bytes: int = CHUNK_BYTES):
+    """Yield lists of up to ``chunksize`` objects from a JSON array,
+    ``{"models": [...]}`` or a single model object."""
+    s = _JsonStream(file, chunk_bytes)
+    c = s.peek()
+    if c == "[":
+        yield from _array_chunks(s, chunksize)
+        return
+    if c != "{":
+        raise ValueError("JSON must be a list of model objects or {'models': [...]}")
+    s.pos += 1
+    obj = {}
+    while (c := s.peek()) != "}":
+        if not c:
+            raise ValueError("Unexpected end of JSON object")
+        key = s.value()
+        s.expect(":")
+        if key == "models" and s.peek() == "[":
+            yield from _array_chunks(s, chunksize)
+            return
+        obj[key] = s.value()
+        if s.peek() == ",":
+            s.pos += 1
+    if "models" in obj:
+        raise ValueError("JSON must be a list of model objects or {'models': [...]}")
+    yield [obj]
+
+
+# ═══════════════════════════════════════════════════════
+# PIPELINE
+# ═══════════════════════════════════════════════════════
+def _size(file) -> int:
+    size = getattr(file, "size", None)
+    if size is None:
+        pos = file.tell()
+        size = file.seek(0, 2)
+        file.seek(pos)
+    return size or 1
+
+def ingest(file, filename: str, chunksize: int = CHUNK_ROWS, head: int = 5):
+    """Stream ``file`` through read → normalise → validate, one chunk at a time.
+
+    Yields ``dict(head, models, errors, rows, progress)`` per chunk: the first
+    ``head`` raw rows of that chunk, its valid models and error messages, the
+    running row count and the fraction of the file consumed so far (0–1).
+    CSV chunks are normalised column-wise by ``normalize_frame``; JSON rows
+    keep the per-row path since their keys and value types vary per object.
+    """
+    size = _size(file)
+    csv = filename.endswith(".csv")
+    reader = iter_csv_frames(file, chunksize) if csv else iter_json_rows(file, chunksize)
+    seen, rows = set(), 0
+    for raw in reader:
+        if csv:
+            models, sample = normalize_frame(raw), raw.head(head).to_dict(orient="records")
+        else:
+            models, sample = [row_to_model(r) for r in raw], raw[:head]
+        valid, errors = validate_models(models, seen, rows)
+        rows += len(raw)
+        yield dict(head=sample, models=valid, errors=errors, rows=rows,
+                   progress=min(1.0, file.tell() / size))
+
+
+# ═══════════════════════════════════════════════════════
+# RESPONSE LOGS
+# ═══════════════════════════════════════════════════════
+RESPONSE_SUFFIXES = (".ndjson", ".jsonl", ".json", ".csv")
+
+def _number(row: dict, key: str, default, integer: bool = False, lo=None, hi=None):
+    v = row.get(key)
+    if v is None or (isinstance(v, str) and not v.strip()):
+        return default
+    try:
+        if isinstance(v, bool):
+            raise ValueError
+        x = float(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be a number, got {v!r}") from None
+    if math.isnan(x) or (lo is not None and x < lo) or (hi is not None and x > hi):
+        raise ValueError(f"'{key}' out of range: {v!r}")
+    if integer:
+        if not x.is_integer():
+            raise ValueError(f"'{key}' must be a whole number, got {v!r}")
+        return int(x)
+    return x
+
+def row_to_response(row: dict) -> dict:
+    """One raw record → a response-log entry (with its ``prompt``).
+
+    ``model`` and ``response`` are required; ``latency`` (ms) and ``tokens``
+    must be non-negative numbers, ``rating`` a whole number 1–10 when given.
+    Raises ValueError naming the offending field.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {type(row).__name__}")
+    model = str(row.get("model") or "").strip()
+    if not model:
+        raise ValueError("Missing 'model'")
+    response = row.get("response")
+    if response is None or not str(response).strip():
+        raise ValueError("Missing 'response'")
+    return dict(
+        prompt=str(row.get("prompt") or "").strip() or "general",
+        model=model,
+        response=str(response),
+        latency=_number(row, "latency", 0.0, lo=0),
+        tokens=_number(row, "tokens", 0, integer=True, lo=0),
+        rating=_number(row, "rating", None, integer=True, lo=1, hi=10),
+        notes=str(row.get("notes") or ""),
+        ts=str(row.get("ts") or ""),
+    )
+
+def validate_responses(rows: list, start: int = 0) -> tuple[list, list]:
+    """Return (entries, error_messages); ``start`` keeps row numbers running across chunks."""
+    entries, errors = [], []
+    for i, r in enumerate(rows, start):
+        try:
+            entries.append(row_to_response(r))
+        except ValueError as ex:
+            model = (r.get("model") or "?") if isinstance(r, dict) else "?"
+            errors.append(f"Row {i+1} ({model}): {ex}")
+    return entries, errors
+
+def iter_ndjson_rows(file, chunksize: int = CHUNK_ROWS, chunk_bytes: int = CHUNK_BYTES):
+    """Yield lists of up to ``chunksize`` values from NDJSON (one JSON value
+    per line — any whitespace between values works) or a single JSON array."""
+    s = _JsonStream(file, chunk_bytes)
+    if s.peek() == "[":
+        yield from _array_chunks(s, chunksize)
+        return
+    batch = []
+    while s.peek():
+        batch.append(s.value())
+        if len(batch) >= chunksize:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _csv_rows(file, chunksize: int):
+    # everything as text: row_to_response does the typing and reports bad cells
+    for df in pd.read_csv(file, chunksize=chunksize, dtype=str, keep_default_na=False):
+        df.columns = [c.strip().lower().replace(" ","_") for c in df.columns]
+        yield df.to_dict(orient="records")
+
+def ingest_responses(file, filename: str, chunksize: int = CHUNK_ROWS):
+    """Stream a response log through read → validate, one chunk at a time.
+
+    Yields ``dict(entries, errors, rows, progress)`` per chunk, like ``ingest``.
+    """
+    size = _size(file)
+    reader = _csv_rows(file, chunksize) if filename.endswith(".csv") else iter_ndjson_rows(file, chunksize)
+    rows = 0
+    for raw in reader:
+        entries, errors = validate_responses(raw, rows)
+        rows += len(raw)
+        yield dict(entries=entries, errors=errors, rows=rows, progress=min(1.0, file.tell() / size))
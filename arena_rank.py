@@ -0,0 +1,107 @@
+"""
+AI Model Arena — Incremental Rank Index
+=======================================
+Keeps Arena models ordered best-first by overall score across edits, so the
+leaderboard can read "top 25", "next 25", … without re-sorting every model
+on each Streamlit rerun.
+
+Entries are ``(-score, uid)`` keys held in a list of sorted buckets (the
+layout sortedcontainers uses): bisect finds the bucket and slot in O(log n)
+and an insert/delete only shifts one bucket of at most ``LOAD`` keys.
+Ties fall back to ``uid``, i.e. insertion order — the same order a stable
+``sorted(..., reverse=True)`` produced.
+"""
+
+from bisect import bisect_left, insort
+
+
+class RankIndex:
+    LOAD = 512
+
+    def __init__(self, items=()):
+        self._buckets = []           # sorted lists of (-score, uid)
+        self._maxes   = []           # last key of each bucket
+        self._score   = {}           # uid → score
+        self.rebuild(items)
+
+    # ── bulk ─────────────────────────────────────────
+    def rebuild(self, items):
+        """Replace the whole index from ``(uid, score)`` pairs in O(n log n)."""
+        self._score = {uid: float(s) for uid, s in items}
+        keys = sorted((-s, uid) for uid, s in self._score.items())
+        self._buckets = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes   = [b[-1] for b in self._buckets]
+
+    def add_many(self, items):
+        items = list(items)
+        if len(items) > max(len(self._score), self.LOAD):
+            self.rebuild(list(self._score.items()) + items)
+        else:
+            for uid, s in items:
+                self.add(uid, s)
+
+    # ── single-entry edits, O(log n) ─────────────────
+    def add(self, uid, score):
+        if uid in self._score:
+            self.discard(uid)
+        score = float(score)
+        self._score[uid] = score
+        key = (-score, uid)
+        if not self._buckets:
+            self._buckets, self._maxes = [[key]], [key]
+            return
+        b = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[b]
+        insort(bucket, key)
+        self._maxes[b] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            self._buckets[b:b + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self._maxes[b:b + 1]   = [bucket[self.LOAD - 1], bucket[-1]]
+
+    def discard(self, uid):
+        score = self._score.pop(uid, None)
+        if score is None:
+            return
+        key = (-score, uid)
+        b = bisect_left(self._maxes, key)
+        bucket = self._buckets[b]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[b] = bucket[-1]
+        else:
+            del self._buckets[b], self._maxes[b]
+
+    def update(self, uid, score):
+        self.add(uid, score)
+
+    # ── queries ──────────────────────────────────────
+    def __len__(self):
+        return len(self._score)
+
+    def __contains__(self, uid):
+        return uid in self._score
+
+    def page(self, start: int = 0, n: int = None) -> list:
+        """uids ranked ``start`` … ``start + n - 1`` (0-based, best first)."""
+        end = len(self._score) if n is None else start + n
+        out = []
+        for bucket in self._buckets:
+            if start >= len(bucket):
+                start -= len(bucket); end -= len(bucket)
+                continue
+            out.extend(k[1] for k in bucket[start:end])
+            end -= len(bucket)
+            start = 0
+            if end <= 0:
+                break
+        return out
+
+    def position(self, uid) -> int:
+        """0-based rank of ``uid``."""
+        key = (-self._score[uid], uid)
+        pos = 0
+        for b, mx in enumerate(self._maxes):
+            if key <= mx:
+                return pos + bisect_left(self._buckets[b], key)
+            pos += len(self._buckets[b])
+        raise KeyError(uid)
@@ -0,0 +1,237 @@
+"""
+AI Model Arena — Rate-Limited Request Scheduler
+===============================================
+Drives an evaluation fan-out as fast as each provider allows and no faster.
+
+    rate limits   one pair of token buckets per provider — requests/min and
+                  tokens/min — keyed by the provider names of the Data Hub's
+                  API Keys tab and the models' ``provider`` field
+    retries       429 / 5xx / connection errors are retried with exponential
+                  backoff and full jitter (or the server's ``Retry-After``,
+                  capped at ``max_delay`` like the backoff)
+    coalescing    identical (model, prompt) jobs share one request
+    bounded queue jobs are pulled from the caller's iterable through a queue of
+                  ``max_in_flight`` slots, so a 10k-prompt sweep never holds
+                  10k pending tasks
+
+Buckets refill at ``SAFETY`` × the published limit and hold at most one
+second's worth as burst, so no rolling minute can exceed the limit even
+when the sweep runs flat out. Token costs are estimated up front and
+settled against the real usage afterwards.
+"""
+
+import asyncio
+import random
+import time
+
+SAFETY        = 0.95
+BURST_SECONDS = 1.0
+
+# Default per-provider limits (requests/min, tokens/min) — entry-tier numbers;
+# edit to match your account. Unknown providers get DEFAULT_LIMIT.
+RATE_LIMITS = {
+    "OpenAI":      (500,   200_000),
+    "Anthropic":   (50,     40_000),
+    "Google":      (360,   120_000),
+    "Meta":        (600,   300_000),
+    "Mistral":     (300,   500_000),
+    "Cohere":      (100,   100_000),
+    "Together AI": (600,   180_000),
+    "Groq":        (30,      6_000),
+    "HuggingFace": (300,   100_000),
+}
+DEFAULT_LIMIT = (60, 60_000)
+PROVIDERS     = list(RATE_LIMITS) + ["Custom"]
+
+
+# ═══════════════════════════════════════════════════════
+# TOKEN BUCKETS
+# ═══════════════════════════════════════════════════════
+class TokenBucket:
+    """Continuous-refill bucket of ``per_min`` units a minute.
+
+    ``acquire(n)`` waits until the bucket holds ``min(n, capacity)`` and then
+    takes all ``n`` — a request bigger than the burst runs the bucket into
+    debt instead of waiting forever, and the debt is repaid before anyone
+    else goes.
+    """
+
+    def __init__(self, per_min: float, capacity: float = None, clock=time.monotonic):
+        self.rate = per_min * SAFETY / 60                       # units / second
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate * BURST_SECONDS)
+        self.level = self.capacity
+        self.clock = clock
+        self._t = clock()
+        self._lock = None
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self._t) * self.rate)
+        self._t = now
+
+    def wait_time(self, n: float) -> float:
+        self._refill()
+        need = min(n, self.capacity) - self.level
+        return max(0.0, need / self.rate)
+
+    async def acquire(self, n: float = 1):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:                                  # FIFO: big requests aren't starved
+            while (wait := self.wait_time(n)) > 0:
+                await asyncio.sleep(wait)
+            self.level -= n
+
+    def settle(self, n: float):
+        """Charge (or refund, if negative) the difference once the real cost is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level - n)
+
+
+class ProviderLimit:
+    """Requests/min and tokens/min buckets for one provider."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm, self.tpm = rpm, tpm
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def acquire(self, tokens: float):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+# ═══════════════════════════════════════════════════════
+# RETRIES
+# ═══════════════════════════════════════════════════════
+def retryable(ex: BaseException) -> bool:
+    """Rate limiting, server errors and dropped connections are worth retrying."""
+    status = getattr(ex, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(ex, (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError))
+
+def backoff(attempt: int, base: float, cap: float, rng=random) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base·2^attempt))."""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# ═══════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════
+class Scheduler:
+    """Runs jobs under per-provider limits with retries and coalescing.
+
+    A job is ``(key, provider, tokens, call)``: ``call()`` returns a fresh
+    awaitable, ``tokens`` is the estimated cost, and jobs with equal ``key``
+    run once. ``limits`` maps provider → ``(rpm, tpm)``; pass ``{}`` to run
+    unthrottled (only the in-flight bound applies). ``usage(result)`` gives
+    the real token cost the estimate is settled against (None = keep it).
+    A ``Retry-After`` is capped at ``max_delay`` so no server can park a
+    worker (and its in-flight slot) for longer; capped waits are counted in
+    ``stats["capped"]``.
+    """
+
+    def __init__(self, limits: dict = None, max_in_flight: int = 64, retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 30.0, rng=None, usage=None):
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.usage = usage or (lambda result: None)
+        self.max_in_flight = max_in_flight
+        self.retries, self.base_delay, self.max_delay = retries, base_delay, max_delay
+        self.rng = rng or random.Random()
+        self._providers = {}
+        self._pending = {}                                      # key → future of the one real request
+        self.stats = dict(requests=0, retries=0, coalesced=0, failed=0, capped=0, throttled_s=0.0)
+
+    def provider(self, name: str):
+        if not self.limits:
+            return None
+        if name not in self._providers:
+            self._providers[name] = ProviderLimit(*self.limits.get(name, DEFAULT_LIMIT))
+        return self._providers[name]
+
+    async def _attempt(self, provider, tokens, call):
+        limit = self.provider(provider)
+        for attempt in range(self.retries + 1):
+            if limit:
+                t0 = time.monotonic()
+                await limit.acquire(tokens)
+                self.stats["throttled_s"] += time.monotonic() - t0
+            self.stats["requests"] += 1
+            try:
+                result = await call()
+            except Exception as ex:
+                if attempt == self.retries or not retryable(ex):
+                    raise
+                self.stats["retries"] += 1
+                delay = getattr(ex, "retry_after", None)
+                if delay is not None and delay > self.max_delay:   # "come back in an hour"
+                    self.stats["capped"] += 1
+                    delay = self.max_delay
+                await asyncio.sleep(delay if delay is not None else
+                                    backoff(attempt, self.base_delay, self.max_delay, self.rng))
+                continue
+            used = self.usage(result)
+            if limit and used is not None:
+                limit.tokens.settle(used - tokens)
+            return result
+
+    async def submit(self, key, provider: str, tokens: float, call):
+        """Run one job (or join the identical one already running)."""
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(self._pending[key])
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[key] = fut
+        try:
+            result = await self._attempt(provider, tokens, call)
+        except BaseException as ex:
+            fut.set_exception(ex)
+            fut.exception()                                     # mark retrieved
+            raise
+        finally:
+            del self._pending[key]
+        fut.set_result(result)
+        return result
+
+    async def map(self, jobs, on_result=None) -> tuple[list, list]:
+        """Run every job through a bounded queue of ``max_in_flight`` workers.
+
+        ``on_result(job, result, error)`` fires per job. Returns
+        ``(results, errors)`` with ``(job, exception)`` pairs for failures.
+        Duplicate keys give one result.
+        """
+        queue = asyncio.Queue(self.max_in_flight)
+        results, errors, seen = [], [], set()
+
+        async def worker():
+            while (job := await queue.get()) is not None:
+                try:
+                    res = await self.submit(*job)
+                except Exception as ex:
+                    self.stats["failed"] += 1
+                    errors.append((job, ex))
+                    res, err = None, ex
+                else:
+                    results.append(res)
+                    err = None
+                if on_result:
+                    on_result(job, res, err)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_in_flight)]
+        try:
+            for job in jobs:
+                if job[0] in seen:                              # repeat of an earlier job: one request
+                    self.stats["coalesced"] += 1
+                    if on_result:
+                        on_result(job, None, None)
+                    continue
+                seen.add(job[0])
+                await queue.put(job)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+        return results, errors
@@ -0,0 +1,80 @@
+"""
+AI Model Arena — Batched Scoring Engine
+=======================================
+One place that turns performance dimensions into overall scores, shared by
+app1.py and app2.py. Scores for N models × K weight profiles come out of a
+single matrix product over the ModelStore matrix, and rankings come from
+argsort instead of ``sorted(models, key=...)``.
+
+A weight profile is a plain ``{dim: weight}`` dict; missing dims weigh 0.
+"""
+
+import numpy as np
+from arena_store import DIMS, DIM_COLS
+
+DEFAULT_WEIGHTS = dict(accuracy=.25,speed=.15,reasoning=.22,creativity=.10,
+                       safety=.10,cost_eff=.10,multilingual=.05,instruction=.03)
+
+
+def slider_weights(w: dict) -> dict:
+    """Sidebar slider values → profile (weights rescaled to sum to len(DIMS))."""
+    total = sum(w.get(d, 0) for d in DIMS) or 1
+    return {d: w.get(d, 0) / total * len(DIMS) for d in DIMS}
+
+
+def _round1(S: np.ndarray) -> np.ndarray:
+    # snap away float noise first so every code path rounds x.x5 the same way
+    return np.round(np.round(S, 6), 1)
+
+
+def profile_matrix(profiles) -> np.ndarray:
+    """Stack K profiles into a (K × len(DIMS)) weight matrix."""
+    return np.array([[p.get(d, 0) for d in DIMS] for p in profiles], dtype=np.float64)
+
+
+def score(X: np.ndarray, profiles) -> np.ndarray:
+    """Overall scores (N × K) for store matrix ``X`` under every profile."""
+    W = profile_matrix(profiles)
+    return _round1(X[:, DIM_COLS].astype(np.float64) @ W.T)
+
+
+def rank_order(scores: np.ndarray, k: int = None) -> np.ndarray:
+    """Row indices ordered best-first (ties keep insertion order).
+
+    With ``k`` only the top-k rows are returned, via argpartition, so large
+    arenas don't pay for a full sort.
+    """
+    scores = np.asarray(scores)
+    if k is not None and k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+        # stable tie-break on row number inside the selected block
+        return top[np.lexsort((top, -scores[top]))]
+    return np.argsort(-scores, kind="stable")
+
+
+def rank_of(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of every row (inverse of ``rank_order``)."""
+    out = np.empty(len(scores), dtype=np.int64)
+    out[rank_order(scores)] = np.arange(1, len(scores) + 1)
+    return out
+
+
+def score_dims(D: np.ndarray, weights: dict = DEFAULT_WEIGHTS) -> np.ndarray:
+    """Overall scores for an (N × len(DIMS)) matrix of dimension values."""
+    return _round1(np.asarray(D, dtype=np.float64) @ profile_matrix([weights]).T)[:, 0]
+
+
+def score_records(models: list, weights: dict = DEFAULT_WEIGHTS) -> np.ndarray:
+    """Overall scores for a list of model dicts in one product."""
+    X = np.array([[m.get(d, 0) for d in DIMS] for m in models], dtype=np.float64).reshape(-1, len(DIMS))
+    return score_dims(X, weights)
+
+
+def compute_overall(m: dict, weights: dict = DEFAULT_WEIGHTS) -> float:
+    """Overall score for a single model dict (forms, one-off rows)."""
+    return float(score_records([m], weights)[0])
+
+
+def rescore(store, weights: dict = DEFAULT_WEIGHTS):
+    """Recompute ``overall`` for every model in ``store`` under ``weights``."""
+    store.set_field("overall", score(store.X, [weights])[:, 0])
@@ -0,0 +1,195 @@
+"""
+AI Model Arena — Binary Columnar Snapshots
+==========================================
+A single-file ``.arena`` format for saving and re-loading a whole Arena
+without going back through JSON/CSV parsing and ``row_to_model``.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    b"ARNSNP01" | u64 header length | JSON header | sections…
+
+The header lists one entry per record key with its ``kind`` and where its
+sections live:
+
+    i8 / f8 / bool   one fixed-width array of n values
+    str / json       UTF-8 blob + n+1 code-point offsets (json = one
+                     ``json.dumps`` per row, for keys with mixed types)
+    list             list-of-str: UTF-8 blob + item offsets + n+1 row offsets
+    present          (optional, any kind) u8 mask for keys some records lack
+
+Loading maps the file (``mmap`` for paths, ``np.frombuffer`` over uploaded
+bytes), slices each blob once per column and hands the numeric columns to
+``ModelStore`` as a ready-made score matrix.
+"""
+
+import gc
+import io
+import json
+import mmap
+import struct
+
+import numpy as np
+from arena_store import NUM_FIELDS
+
+MAGIC   = b"ARNSNP01"
+SUFFIX  = ".arena"
+_DTYPES = {"i8": "<i8", "f8": "<f8", "bool": "u1"}
+
+
+# ═══════════════════════════════════════════════════════
+# WRITE
+# ═══════════════════════════════════════════════════════
+def _kind(values) -> str:
+    types = {type(v) for v in values}
+    if types == {bool}:
+        return "bool"
+    if types == {int} and all(-2**63 <= v < 2**63 for v in values):
+        return "i8"
+    if types == {float}:
+        return "f8"
+    if types == {str}:
+        return "str"
+    if types == {list} and all(type(x) is str for v in values for x in v):
+        return "list"
+    return "json"
+
+def _text(strings) -> tuple[bytes, np.ndarray]:
+    offs = np.zeros(len(strings) + 1, dtype="<i8")
+    np.cumsum([len(s) for s in strings], out=offs[1:])
+    return "".join(strings).encode("utf-8"), offs
+
+def _sections(values, kind) -> dict:
+    if kind in _DTYPES:
+        return {"values": np.asarray(values, dtype=_DTYPES[kind])}
+    if kind == "list":
+        data, item_offs = _text([x for v in values for x in v])
+        rows = np.zeros(len(values) + 1, dtype="<i8")
+        np.cumsum([len(v) for v in values], out=rows[1:])
+        return {"data": data, "offsets": item_offs, "rows": rows}
+    if kind == "json":
+        values = [json.dumps(v) for v in values]
+    data, offs = _text(values)
+    return {"data": data, "offsets": offs}
+
+def dump(records, fp):
+    """Write ``records`` (model dicts) as a snapshot to binary file ``fp``."""
+    n = len(records)
+    keys = list(dict.fromkeys(k for m in records for k in m))
+    columns, blobs = [], []
+    for key in keys:
+        present = np.fromiter((key in m for m in records), dtype=bool, count=n)
+        vals = [m[key] for m in records if key in m]
+        kind = _kind(vals)
+        secs = _sections(vals, kind)
+        if not present.all():
+            secs["present"] = present.astype("u1")
+        columns.append(dict(key=key, kind=kind, sections={}))
+        blobs.append(secs)
+
+    # header needs final offsets, and offsets depend on header size: lay out
+    # sections relative to the data start, then shift once the header is known
+    layout, pos = [], 0
+    for col, secs in zip(columns, blobs):
+        for name, arr in secs.items():
+            raw = arr if isinstance(arr, bytes) else arr.tobytes()
+            col["sections"][name] = [pos, len(raw)] + ([arr.dtype.str] if not isinstance(arr, bytes) else [])
+            layout.append(raw)
+            pos += len(raw) + (-len(raw)) % 8
+    def header(base):
+        cols = [dict(c, sections={k: [base + v[0]] + v[1:] for k, v in c["sections"].items()}) for c in columns]
+        return json.dumps(dict(n=n, columns=cols)).encode()
+    base = 16
+    while True:                                   # converges in ≤ 2 steps
+        h = header(base)
+        start = 16 + len(h) + (-(16 + len(h))) % 8
+        if start == base:
+            break
+        base = start
+    fp.write(MAGIC + struct.pack("<Q", len(h)) + h + b"\0" * (base - 16 - len(h)))
+    for raw in layout:
+        fp.write(raw + b"\0" * ((-len(raw)) % 8))
+
+def dumps(records) -> bytes:
+    buf = io.BytesIO()
+    dump(records, buf)
+    return buf.getvalue()
+
+def save(records, path: str):
+    with open(path, "wb") as f:
+        dump(records, f)
+
+
+# ═══════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════
+def _strings(buf, secs, data="data", offsets="offsets") -> list:
+    off, size = secs[data]
+    text = bytes(buf[off:off + size]).decode("utf-8")
+    o = np.frombuffer(buf, dtype=secs[offsets][2], count=secs[offsets][1] // 8, offset=secs[offsets][0]).tolist()
+    return [text[a:b] for a, b in zip(o, o[1:])]
+
+def _column(buf, kind, secs):
+    if kind in _DTYPES:
+        off, size, dt = secs["values"]
+        arr = np.frombuffer(buf, dtype=dt, count=size // np.dtype(dt).itemsize, offset=off)
+        return arr, (arr.astype(bool) if kind == "bool" else arr).tolist()
+    if kind == "list":
+        items = _strings(buf, secs)
+        off, size, dt = secs["rows"]
+        r = np.frombuffer(buf, dtype=dt, count=size // 8, offset=off).tolist()
+        return None, [items[a:b] for a, b in zip(r, r[1:])]
+    vals = _strings(buf, secs)
+    return None, ([json.loads(v) for v in vals] if kind == "json" else vals)
+
+def loads(buf) -> tuple[list, np.ndarray]:
+    """Decode a snapshot from any buffer → ``(records, X)``.
+
+    ``X`` is the (n × NUM_FIELDS) float32 score matrix ready for
+    ``ModelStore(records, X=X)``, or None if some numeric field had to be
+    stored as mixed-type JSON.
+    """
+    gc.disable()              # millions of fresh objects, none of them cyclic
+    try:
+        return _decode(memoryview(buf))
+    finally:
+        gc.enable()
+
+def _decode(buf) -> tuple[list, np.ndarray]:
+    if bytes(buf[:8]) != MAGIC:
+        raise ValueError("Not an Arena snapshot (bad magic)")
+    (hlen,) = struct.unpack("<Q", buf[8:16])
+    hdr = json.loads(bytes(buf[16:16 + hlen]))
+    n = hdr["n"]
+    keys, cols, X = [], [], np.zeros((n, len(NUM_FIELDS)), dtype=np.float32)
+    sparse = []                                   # (key, present mask) for keys some records lack
+    for c in hdr["columns"]:
+        arr, vals = _column(buf, c["kind"], c["sections"])
+        present = None
+        if "present" in c["sections"]:
+            off, size, dt = c["sections"]["present"]
+            present = np.frombuffer(buf, dtype=dt, count=size, offset=off).astype(bool)
+            full = [None] * n
+            for i, v in zip(np.flatnonzero(present).tolist(), vals):
+                full[i] = v
+            vals = full
+            sparse.append((c["key"], present))
+        if c["key"] in NUM_FIELDS and X is not None:
+            if arr is None:
+                X = None                          # mixed types: let the store compute rows
+            else:
+                j = NUM_FIELDS.index(c["key"])
+                X[:, j] = arr if present is None else 0
+                if present is not None:
+                    X[present, j] = arr
+        keys.append(c["key"])
+        cols.append(vals)
+    records = [dict(zip(keys, row)) for row in zip(*cols)] if cols else [{} for _ in range(n)]
+    for key, present in sparse:
+        for i in np.flatnonzero(~present).tolist():
+            del records[i][key]
+    return records, X
+
+def load(path: str) -> tuple[list, np.ndarray]:
+    """Memory-map ``path`` and decode it (see ``loads``)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return loads(mm)
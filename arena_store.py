@@ -0,0 +1,243 @@
+"""
+AI Model Arena — Columnar Model Store
+=====================================
+Shared by app1.py and app2.py. Models keep their original dict schema
+(strings, lists, numbers) in ``records``, and every numeric field is mirrored
+into a float32 matrix ``X`` (one row per model, one column per NUM_FIELDS
+entry) so charts, KPIs and tables can take column slices instead of walking
+the list of dicts with ``m.get(d, 0)``. ``index`` maps each name to its rows
+for O(1) lookups, upserts and deletes.
+
+The store is list-like (len, iteration, indexing, truthiness), so code that
+only reads models can keep treating it as a list. All writes must go through
+the store so the matrix, the records and the rank index stay in sync.
+"""
+
+import itertools
+
+import numpy as np
+from arena_rank import RankIndex
+
+DIMS       = ["accuracy","speed","reasoning","creativity","safety","cost_eff","multilingual","instruction"]
+DIM_LABELS = ["Accuracy","Speed","Reasoning","Creativity","Safety","Cost Eff.","Multilingual","Instruction"]
+BENCHMARKS = ["mmlu","gsm8k","humaneval"]
+
+# Column layout of the score matrix
+NUM_FIELDS = DIMS + ["price_in","price_out","context"] + BENCHMARKS + ["open_source","overall"]
+COL        = {f: j for j, f in enumerate(NUM_FIELDS)}
+DIM_COLS   = [COL[d] for d in DIMS]
+
+# Versions come from one process-wide counter, so (unlike a per-store
+# counter) no two stores or states ever share a version number and caches
+# can key on ``store.version`` alone.
+_versions = itertools.count(1)
+
+
+def _row(m: dict) -> list:
+    return [float(m.get(f, 0) or 0) for f in NUM_FIELDS]
+
+
+class ModelStore:
+    """Arena models as records + a float32 score matrix + a name → rows index.
+
+    ``rank`` orders models best-first by ``overall`` and is updated in
+    O(log n) per added/removed model; each row carries a stable ``uid`` so
+    the rank index survives rows shifting on removal.
+
+    Lookups, upserts and deletes by name are O(1) through ``index``. A delete
+    only tombstones its rows; the arrays are compacted once, on the next read,
+    so a burst of deletions costs one O(n) pass instead of one per delete.
+    """
+
+    def __init__(self, models=(), X=None):
+        self._records = []           # row → model dict (None once deleted)
+        self.index    = {}           # name → [rows], first occurrence first
+        self._uids    = []           # stable id per row
+        self.rank     = RankIndex()  # uid, best overall first
+        self.version  = next(_versions)  # changes on every write
+        self._uid_row = {}
+        self._next_uid = 0
+        self._dead = 0               # tombstoned rows awaiting compaction
+        self._X = np.zeros((0, len(NUM_FIELDS)), dtype=np.float32)
+        self.extend(models, X)
+
+    # ── read ─────────────────────────────────────────
+    @property
+    def records(self) -> list:
+        self._compact()
+        return self._records
+
+    @property
+    def uids(self) -> list:
+        self._compact()
+        return self._uids
+
+    @property
+    def X(self) -> np.ndarray:
+        """Live (n × NUM_FIELDS) view of the score matrix."""
+        self._compact()
+        return self._X[:len(self._records)]
+
+    def col(self, field: str, rows=None, decimals: int = None) -> np.ndarray:
+        """One numeric column, optionally restricted/reordered by ``rows``.
+
+        Pass ``decimals`` to get a float64 copy rounded for display, so float32
+        artefacts (0.9 → 0.8999999…) don't leak into labels and hovers.
+        """
+        c = self.X[:, COL[field]]
+        c = c if rows is None else c[rows]
+        return c if decimals is None else np.round(c.astype(np.float64), decimals)
+
+    def cols(self, fields, rows=None) -> np.ndarray:
+        X = self.X if rows is None else self.X[rows]
+        return X[:, [COL[f] for f in fields]]
+
+    def names(self, rows=None) -> list:
+        if rows is None:
+            return [m["name"] for m in self.records]
+        return [self.records[i]["name"] for i in rows]
+
+    def take(self, rows) -> list:
+        return [self.records[i] for i in rows]
+
+    def row(self, name: str):
+        self._compact()
+        rows = self.index.get(name)
+        return rows[0] if rows else None
+
+    def top(self, n: int = None, start: int = 0) -> list:
+        """Rows ranked ``start`` … ``start + n - 1`` by overall score."""
+        self._compact()
+        return [self._uid_row[u] for u in self.rank.page(start, n)]
+
+    def get(self, name: str, default=None):
+        i = self.row(name)
+        return default if i is None else self._records[i]
+
+    def __len__(self):
+        return len(self._records) - self._dead
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, i):
+        return self.records[i]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    # ── write ────────────────────────────────────────
+    def _reserve(self, n: int):
+        cap = self._X.shape[0]
+        if n > cap:
+            grown = np.zeros((max(n, cap * 2, 16), len(NUM_FIELDS)), dtype=np.float32)
+            grown[:len(self._records)] = self._X[:len(self._records)]
+            self._X = grown
+
+    def append(self, m: dict):
+        self.extend([m])
+
+    def extend(self, models, X=None):
+        """Append ``models``; ``X`` may carry their precomputed matrix rows
+        (e.g. from a snapshot) to skip the per-dict conversion."""
+        models = list(models)
+        if not models:
+            return
+        start = len(self._records)
+        self._reserve(start + len(models))
+        self._X[start:start + len(models)] = [_row(m) for m in models] if X is None else X
+        new_uids = range(self._next_uid, self._next_uid + len(models))
+        self._next_uid += len(models)
+        self._records.extend(models)
+        self._uids.extend(new_uids)
+        self._uid_row.update(zip(new_uids, range(start, start + len(models))))
+        for i, m in enumerate(models, start):
+            self.index.setdefault(m["name"], []).append(i)
+        self.rank.add_many(zip(new_uids, self._X[start:start + len(models), COL["overall"]].tolist()))
+        self.version = next(_versions)
+
+    def replace(self, models, X=None):
+        self._records, self.index, self._uids, self._uid_row = [], {}, [], {}
+        self._dead = 0
+        self.rank = RankIndex()
+        self._X = np.zeros((0, len(NUM_FIELDS)), dtype=np.float32)
+        self.extend(models, X)
+        self.version = next(_versions)
+
+    def clear(self):
+        self.replace([])
+
+    def upsert(self, m: dict) -> bool:
+        """Update the model called ``m["name"]`` in place, or append it.
+
+        Returns True when an existing model was updated. Its row, uid (and so
+        its tie-break position) are kept; the record dict is updated with ``m``.
+        """
+        rows = self.index.get(m["name"])
+        if not rows:
+            self.append(m)
+            return False
+        i = rows[0]
+        self._records[i].update(m)
+        self._X[i] = _row(self._records[i])
+        self.rank.update(self._uids[i], float(self._X[i, COL["overall"]]))
+        self.version = next(_versions)
+        return True
+
+    def upsert_many(self, models) -> tuple[int, int]:
+        """Upsert a batch; new models are appended in one ``extend``.
+
+        Returns ``(added, updated)``.
+        """
+        fresh, updated = {}, 0
+        for m in models:
+            if m["name"] in self.index:
+                self.upsert(m)
+                updated += 1
+            elif m["name"] in fresh:
+                fresh[m["name"]].update(m)
+            else:
+                fresh[m["name"]] = m
+        self.extend(fresh.values())
+        return len(fresh), updated
+
+    def remove(self, name: str) -> int:
+        """Drop every model called ``name``; returns how many rows went."""
+        rows = self.index.pop(name, [])
+        for i in rows:
+            self.rank.discard(self._uids[i])
+            self._records[i] = None
+        self._dead += len(rows)
+        if rows:
+            self.version = next(_versions)
+        return len(rows)
+
+    def set_field(self, field: str, values, decimals: int = 1):
+        """Overwrite one numeric column for every model (e.g. ``overall``)."""
+        vals = np.round(np.asarray(values, dtype=np.float64), decimals)
+        self.X[:, COL[field]] = vals
+        for m, v in zip(self._records, vals.tolist()):
+            m[field] = v
+        if field == "overall":
+            self.rank.rebuild(zip(self._uids, self.col("overall").tolist()))
+        self.version = next(_versions)
+
+    def _compact(self):
+        """Squeeze tombstoned rows out of the records, uids and matrix."""
+        if not self._dead:
+            return
+        keep = [i for i, m in enumerate(self._records) if m is not None]
+        self._X = self._X[keep]
+        self._records = [self._records[i] for i in keep]
+        self._uids    = [self._uids[i] for i in keep]
+        self._dead = 0
+        self._reindex()
+
+    def _reindex(self):
+        self.index, self._uid_row = {}, {}
+        for i, (m, u) in enumerate(zip(self._records, self._uids)):
+            self.index.setdefault(m["name"], []).append(i)
+            self._uid_row[u] = i
@@ -0,0 +1,281 @@
+"""
+AutoBot — Offline Intent Classifier
+===================================
+Classifies free-form chat messages ("pay the electricity bill friday",
+"move my meeting to tomorrow") into the chat intents, and pulls out the
+date and amount they mention. No network, no GPU, no model download: the
+model is built from the bundled ``autobot_examples.tsv`` when the app
+starts, in a few milliseconds.
+
+    features    word unigrams + character 3–4-grams of each word (so
+                "reschedule" and "schedules" share features with "schedule"),
+                sublinear TF × IDF, L2-normalised
+    model       one normalised centroid per intent (Rocchio); a message goes
+                to the nearest centroid by cosine, or to ``default`` when
+                nothing is close enough
+    entities    ``extract_date`` (today / tomorrow / weekdays / "in 3 days" /
+                ISO / "12 nov") and ``extract_amount`` (₹ / rs / inr / $ …)
+
+Benchmark (cross-validated accuracy and per-message latency):
+
+    python autobot_classifier.py bench
+"""
+
+import functools
+import math
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+EXAMPLES  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "autobot_examples.tsv")
+NGRAMS    = (3, 4)
+MIN_SCORE = 0.12         # best cosine below this → "default"
+DEFAULT   = "default"
+
+_WORD = re.compile(r"[a-z]+|\d+|₹|\$")
+
+
+# ═══════════════════════════════════════════════════════
+# FEATURES
+# ═══════════════════════════════════════════════════════
+@functools.lru_cache(maxsize=65536)
+def _terms(word: str) -> tuple:
+    """``w:word`` plus the char n-grams of `` word `` (cached — words repeat a lot)."""
+    padded = f" {word} "
+    return ("w:" + word,) + tuple("c:" + padded[i:i + n] for n in NGRAMS for i in range(len(padded) - n + 1))
+
+
+def features(text: str) -> dict:
+    """Raw term counts: ``w:word`` for every word, ``c:gram`` for its char n-grams."""
+    counts = {}
+    for word in _WORD.findall(text.lower()):
+        for term in _terms("0" if word.isdigit() else word):   # numbers are interchangeable
+            counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def read_examples(path: str = EXAMPLES) -> list[tuple[str, str]]:
+    """``[(intent, text), …]`` from a TSV file (``#`` lines are comments)."""
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                intent, text = line.split("\t", 1)
+                out.append((intent.strip(), text.strip()))
+    return out
+
+
+# ═══════════════════════════════════════════════════════
+# CLASSIFIER
+# ═══════════════════════════════════════════════════════
+class IntentClassifier:
+    """Nearest-centroid TF-IDF classifier over ``(intent, text)`` examples."""
+
+    def __init__(self, examples: list, min_score: float = MIN_SCORE):
+        self.min_score = min_score
+        docs = [features(text) for _, text in examples]
+        self.vocab = {}
+        df = []
+        for d in docs:
+            for term in d:
+                if term not in self.vocab:
+                    self.vocab[term] = len(df)
+                    df.append(0)
+                df[self.vocab[term]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + np.asarray(df, dtype=float))) + 1
+        self.labels = sorted({intent for intent, _ in examples})
+        row = {label: i for i, label in enumerate(self.labels)}
+        centroids = np.zeros((len(self.labels), len(self.vocab)))
+        for (intent, _), d in zip(examples, docs):
+            idx, w = self._vector(d)
+            centroids[row[intent], idx] += w
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = centroids / np.where(norms, norms, 1)
+
+    @classmethod
+    def load(cls, path: str = EXAMPLES, **kw) -> "IntentClassifier":
+        return cls(read_examples(path), **kw)
+
+    def _vector(self, counts: dict) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse TF-IDF vector (known terms only) as ``(indices, weights)``."""
+        idx, tf = [], []
+        for term, n in counts.items():
+            i = self.vocab.get(term)
+            if i is not None:
+                idx.append(i)
+                tf.append(n)
+        idx = np.array(idx, dtype=np.intp)
+        w = np.log(np.array(tf, dtype=float))
+        w += 1
+        w *= self.idf[idx]
+        norm = math.sqrt(w @ w)
+        return idx, (w / norm if norm else w)
+
+    def scores(self, text: str) -> dict:
+        """Cosine similarity of ``text`` to every intent."""
+        idx, w = self._vector(features(text))
+        return dict(zip(self.labels, (self.centroids[:, idx] @ w).tolist()))
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """``(intent, score)``; ``default`` when no intent scores ``min_score``."""
+        idx, w = self._vector(features(text))
+        if not len(idx):
+            return DEFAULT, 0.0
+        sims = self.centroids[:, idx] @ w
+        best = int(sims.argmax())
+        score = float(sims[best])
+        return (self.labels[best] if score >= self.min_score else DEFAULT), score
+
+
+# ═══════════════════════════════════════════════════════
+# ENTITIES
+# ═══════════════════════════════════════════════════════
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+_MONTHS   = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_MONTH_RE = (r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)"
+             r"(?:uary|ruary|ch|il|e|y|ust|t|tember|ober|ember)?\.?")
+
+_DATE_PATTERNS = [
+    ("iso",      re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")),
+    ("dmy",      re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")),
+    ("day_mon",  re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?(?: of)? " + _MONTH_RE + r"\b")),
+    ("mon_day",  re.compile(r"\b" + _MONTH_RE + r" (\d{1,2})(?:st|nd|rd|th)?\b")),
+    ("relative", re.compile(r"\b(day after tomorrow|tomorrow|tmrw|today|tonight|yesterday)\b")),
+    ("in_n",     re.compile(r"\bin (\d+|a|one|two|three) (day|week)s?\b")),
+    ("weekday",  re.compile(r"\b(next |this )?(mon|tue|wed|thu|fri|sat|sun)"
+                            r"(?:day|s|sday|nesday|rsday|urday)?\b")),
+    ("next_wk",  re.compile(r"\bnext week\b")),
+]
+_RELATIVE = {"today": 0, "tonight": 0, "tomorrow": 1, "tmrw": 1, "day after tomorrow": 2, "yesterday": -1}
+_SMALL    = {"a": 1, "one": 1, "two": 2, "three": 3}
+
+
+def _calendar(year: int, month: int, day: int, today: date, roll: bool) -> date | None:
+    try:
+        d = date(year, month, day)
+    except ValueError:
+        return None
+    if roll and d < today:                                      # "12 nov" already passed → next year
+        d = d.replace(year=year + 1)
+    return d
+
+
+def _resolve(kind: str, m: re.Match, today: date) -> date | None:
+    if kind == "iso":
+        return _calendar(int(m[1]), int(m[2]), int(m[3]), today, roll=False)
+    if kind == "dmy":
+        year = int(m[3]) if m[3] else today.year
+        return _calendar(year + 2000 if year < 100 else year, int(m[2]), int(m[1]), today, roll=not m[3])
+    if kind == "day_mon":
+        return _calendar(today.year, _MONTHS.index(m[2]) + 1, int(m[1]), today, roll=True)
+    if kind == "mon_day":
+        return _calendar(today.year, _MONTHS.index(m[1]) + 1, int(m[2]), today, roll=True)
+    if kind == "relative":
+        return today + timedelta(days=_RELATIVE[m[1]])
+    if kind == "in_n":
+        n = int(m[1]) if m[1].isdigit() else _SMALL[m[1]]
+        return today + timedelta(days=n * (7 if m[2] == "week" else 1))
+    if kind == "weekday":
+        ahead = (_WEEKDAYS.index(m[2]) - today.weekday()) % 7
+        return today + timedelta(days=ahead + (7 if m[1] == "next " and ahead == 0 else 0))
+    return today + timedelta(days=7)
+
+
+def find_date(text: str, today: date = None) -> tuple[date, tuple[int, int]] | None:
+    """``(date, (start, end))`` for the first date phrase in ``text``; None if none.
+
+    "First" is by position: every pattern is tried and the earliest valid
+    match wins (the longer one on a tie), so "friday, not 12 nov" is Friday.
+    """
+    today = today or date.today()
+    s = text.lower()
+    found = sorted((m.start(), -len(m[0]), n, m)
+                   for n, (_, pattern) in enumerate(_DATE_PATTERNS) for m in pattern.finditer(s))
+    for _, _, n, m in found:
+        d = _resolve(_DATE_PATTERNS[n][0], m, today)
+        if d:
+            return d, m.span()
+    return None
+
+
+def extract_date(text: str, today: date = None) -> date | None:
+    """First date mentioned in ``text``, resolved against ``today``; None if none."""
+    found = find_date(text, today)
+    return found[0] if found else None
+
+
+_AMOUNT = re.compile(
+    r"(?P<pre>₹|\$|€|£|\brs\.?|\binr|\busd)\s?(?P<a>\d[\d,]*(?:\.\d+)?)"
+    r"|(?P<b>\d[\d,]*(?:\.\d+)?)\s?(?P<post>rupees|rs\b|inr\b|dollars|bucks|usd\b|euros?)",
+    re.IGNORECASE,
+)
+_SYMBOL = {"₹": "₹", "rs": "₹", "rs.": "₹", "inr": "₹", "rupees": "₹",
+           "$": "$", "usd": "$", "dollars": "$", "bucks": "$",
+           "€": "€", "euro": "€", "euros": "€", "£": "£"}
+
+
+def find_amount(text: str) -> tuple[str, tuple[int, int]] | None:
+    """``(amount, (start, end))`` for the first currency amount in ``text``; None if none."""
+    m = _AMOUNT.search(text)
+    if not m:
+        return None
+    unit = (m["pre"] or m["post"]).lower()
+    value = (m["a"] or m["b"]).replace(",", "")
+    return _SYMBOL[unit] + value, m.span()
+
+
+def extract_amount(text: str) -> str | None:
+    """First currency amount in ``text`` in the dashboard's format ("₹800"); None if none.
+
+    Bare numbers are left alone — "at 5" or "in 3 days" aren't money.
+    """
+    found = find_amount(text)
+    return found[0] if found else None
+
+
+def entities(text: str, today: date = None) -> dict:
+    return dict(date=extract_date(text, today), amount=extract_amount(text))
+
+
+# ═══════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════
+def benchmark(path: str = EXAMPLES, folds: int = 5, repeat: int = 2000) -> dict:
+    """Cross-validated accuracy, load time and per-message latency."""
+    examples = read_examples(path)
+    hits = 0
+    for k in range(folds):
+        train = [e for i, e in enumerate(examples) if i % folds != k]
+        test = [e for i, e in enumerate(examples) if i % folds == k]
+        model = IntentClassifier(train)
+        hits += sum(model.predict(text)[0] == intent for intent, text in test)
+
+    t0 = time.perf_counter()
+    model = IntentClassifier.load(path)
+    load_ms = (time.perf_counter() - t0) * 1000
+    texts = [text for _, text in examples]
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        model.predict(texts[i % len(texts)])
+    predict_us = (time.perf_counter() - t0) / repeat * 1e6
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        entities(texts[i % len(texts)])
+    entities_us = (time.perf_counter() - t0) / repeat * 1e6
+    return dict(examples=len(examples), accuracy=hits / len(examples), load_ms=load_ms,
+                predict_us=predict_us, entities_us=entities_us)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        r = benchmark()
+        print(f"{r['examples']} examples · {r['accuracy']:.1%} 5-fold accuracy · "
+              f"load {r['load_ms']:.1f} ms · predict {r['predict_us']:.0f} µs/msg · "
+              f"entities {r['entities_us']:.0f} µs/msg")
+    else:
+        print(__doc__)
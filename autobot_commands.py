@@ -0,0 +1,215 @@
+"""
+AutoBot — Chat Commands
+=======================
+Turns chat messages into real edits of the task and payment stores:
+
+    add task finish the report tomorrow
+    add bill Netflix ₹499 due friday
+    mark netflix paid                      (or unpaid / pending)
+    mark all bills due this week paid
+    complete finish the report
+    complete all tasks overdue
+
+Several commands can go in one message, separated by ``;`` or new lines.
+``parse`` only reads the message; ``run`` applies the whole batch at once
+and reports what changed, so the app can apply it in one place before any
+widget is drawn and rerun once, instead of flipping a checkbox per item.
+"""
+
+import re
+from datetime import date, timedelta
+
+from autobot_classifier import find_amount, find_date
+
+PAYMENT_DUE_DAYS = 3     # default due date for payments added from chat (as the form)
+
+_I = re.IGNORECASE
+_COMMANDS = [
+    ("add_task",     re.compile(r"(?:add|new|create)\s+(?:a\s+)?(?:task|to-?do)\b\s*:?\s*(?P<rest>.+)", _I)),
+    ("add_payment",  re.compile(r"(?:add|new|create)\s+(?:a\s+)?(?:payment|bill)\b\s*:?\s*(?P<rest>.+)", _I)),
+    ("mark_all",     re.compile(r"(?:mark|set)\s+all\s+(?:(?:the|my)\s+)?(?:pending\s+|unpaid\s+)?"
+                                r"(?:bills|payments|dues)\b(?P<scope>.*?)\s+(?:as\s+)?(?P<state>paid|unpaid|pending)", _I)),
+    ("mark",         re.compile(r"(?:mark|set)\s+(?:the\s+|my\s+)?(?P<name>.+?)\s+(?:as\s+)?(?P<state>paid|unpaid|pending)", _I)),
+    ("complete_all", re.compile(r"(?:complete|finish|clear|check\s+off|tick\s+off)\s+all\s+(?:(?:the|my)\s+)?"
+                                r"(?:open\s+)?tasks?\b(?P<scope>.*)", _I)),
+    ("complete",     re.compile(r"(?:complete|finish|check\s+off|tick\s+off|done\s+with)\s+(?:task\s+)?"
+                                r"(?:the\s+)?(?P<name>.+)", _I)),
+]
+_CONNECTOR = re.compile(r"\s*\b(?:on|for|by|due(?:\s+on)?|of)\s*$", _I)
+_LEADING   = re.compile(r"^\s*(?:of|for)\b\s*", _I)
+_VAGUE     = {"it", "this", "that", "them", "these", "those", "everything", "something", "all"}
+
+
+# ═══════════════════════════════════════════════════════
+# PARSING
+# ═══════════════════════════════════════════════════════
+def _cut(text: str, span: tuple[int, int]) -> str:
+    """``text`` without ``span`` and the "on" / "for" / "due" that introduced it."""
+    left = _CONNECTOR.sub("", text[:span[0]])
+    joined = " ".join(f"{left} {text[span[1]:]}".split())
+    return re.sub(r" ([,;:])", r"\1", joined).strip(" ,:-")
+
+
+def _scope(text: str, today: date) -> tuple[date, date] | None:
+    """Date range ``[start, end)`` named by a bulk command's scope phrase."""
+    s = " ".join(text.lower().split())
+    s = re.sub(r"^(?:due|for|from|on)\s+", "", s)
+    if s in ("", "all"):
+        return date.min, date.max
+    if s in ("overdue", "past"):
+        return date.min, today
+    if s.endswith("this week"):
+        monday = today - timedelta(days=today.weekday())
+        return monday, monday + timedelta(days=7)
+    if s.endswith("next week"):
+        monday = today - timedelta(days=today.weekday()) + timedelta(days=7)
+        return monday, monday + timedelta(days=7)
+    found = find_date(s, today)
+    if not found:
+        return None
+    day = found[0]
+    if s.startswith("before"):
+        return date.min, day
+    if s.startswith(("by", "until", "till")):
+        return date.min, day + timedelta(days=1)
+    return day, day + timedelta(days=1)
+
+
+def parse(message: str, today: date = None, day: date = None) -> list[dict]:
+    """Commands in ``message`` as op dicts; ``[]`` if it is plain chat.
+
+    ``day`` is where undated tasks go (the date selected in the dashboard).
+    """
+    today = today or date.today()
+    day = day or today
+    ops = []
+    for part in re.split(r"[;\n]+", message):
+        part = part.strip(" .!")
+        for kind, pattern in _COMMANDS:
+            m = pattern.fullmatch(part)
+            if m:
+                op = _build(kind, m, today, day)
+                if op:
+                    ops.append(op)
+                break
+    return ops
+
+
+def _build(kind: str, m: re.Match, today: date, day: date) -> dict | None:
+    """The op for one matched command; None if it is just chat ("done with it")."""
+    if kind == "add_task":
+        text = m["rest"]
+        found = find_date(text, today)
+        if found:
+            day, text = found[0], _cut(text, found[1])
+        return dict(op="add_task", day=day, text=text) if text else dict(op="error", text="That task has no text.")
+
+    if kind == "add_payment":
+        text = m["rest"]
+        amount = find_amount(text)
+        if not amount:
+            return dict(op="error", text=f"Payment '{text}' needs an amount, e.g. ₹500.")
+        text = _cut(text, amount[1])
+        due = today + timedelta(days=PAYMENT_DUE_DAYS)
+        found = find_date(text, today)
+        if found:
+            due, text = found[0], _cut(text, found[1])
+        name = _LEADING.sub("", text)
+        if not name:
+            return dict(op="error", text="That payment has no name.")
+        return dict(op="add_payment", name=name[:1].upper() + name[1:], amount=amount[0], due=due)
+
+    if kind in ("mark_all", "complete_all"):
+        span = _scope(m["scope"], today)
+        if span is None:
+            return dict(op="error", text=f"I couldn't tell which dates '{m['scope'].strip()}' means.")
+        op = dict(op=kind, start=span[0], end=span[1])
+        if kind == "mark_all":
+            op["paid"] = m["state"].lower() == "paid"
+        return op
+
+    if kind == "mark":
+        return dict(op="mark", name=m["name"], paid=m["state"].lower() == "paid")
+
+    if m["name"].strip().lower() in _VAGUE or find_date(m["name"], today):   # "finish it by friday"
+        return None                                                          # is a plan, not a command
+    return dict(op="complete", name=m["name"].strip())
+
+
+# ═══════════════════════════════════════════════════════
+# EXECUTION
+# ═══════════════════════════════════════════════════════
+def _matching(payments, name: str) -> list[int]:
+    """Indices of payments whose name contains ``name`` (case-insensitive)."""
+    needle = name.lower()
+    hits = [i for i, p in enumerate(payments) if needle in p["name"].lower()]
+    if not hits and needle.endswith((" bill", " payment")):                  # "mark the gas bill paid"
+        return _matching(payments, needle.rsplit(" ", 1)[0])
+    return hits
+
+
+def _task_matching(tasks, name: str) -> list[tuple[date, int, str]]:
+    """``(day, index, task)`` of open tasks containing ``name`` as whole words;
+    a task that *is* ``name`` wins over ones that merely contain it."""
+    word = re.compile(r"(?<!\w)" + re.escape(name) + r"(?!\w)", _I)
+    hits = [(day, i, t) for day, day_tasks in tasks.between(date.min, date.max)
+            for i, t in enumerate(day_tasks) if word.search(t)]
+    exact = [h for h in hits if h[2].strip().lower() == name.lower()]
+    return exact if len(exact) == 1 else hits
+
+
+def run(ops: list[dict], tasks, payments) -> dict:
+    """Apply every op to the ``TaskStore`` / ``PaymentStore`` in one batch.
+
+    Returns ``dict(lines, payments)``: one reply line per op, and the indices
+    of payments whose paid state changed (their checkbox state is stale).
+    """
+    lines, changed = [], set()
+    for op in ops:
+        kind = op["op"]
+        if kind == "error":
+            lines.append(f"⚠️ {op['text']}")
+
+        elif kind == "add_task":
+            tasks.add(op["day"], op["text"])
+            lines.append(f"🗓️ Task '{op['text']}' added for {op['day']:%a %d %b}")
+
+        elif kind == "add_payment":
+            payments.add(op["name"], op["amount"], op["due"])
+            lines.append(f"💰 Payment '{op['name']}' ({op['amount']}) added, due {op['due']:%a %d %b}")
+
+        elif kind == "mark":
+            hits = _matching(payments, op["name"])
+            state = "paid" if op["paid"] else "pending"
+            if len(hits) != 1:
+                names = ", ".join(payments.items[i]["name"] for i in hits)
+                lines.append(f"⚠️ Which payment? {names}" if hits else f"⚠️ No payment matches '{op['name']}'.")
+            elif payments.set_paid(hits[0], op["paid"]):
+                changed.add(hits[0])
+                lines.append(f"✅ {payments.items[hits[0]]['name']} marked {state}")
+            else:
+                lines.append(f"{payments.items[hits[0]]['name']} was already {state}")
+
+        elif kind == "mark_all":
+            state = "paid" if op["paid"] else "pending"
+            done = []
+            for i in payments.due_indices(op["start"], op["end"]):
+                if payments.set_paid(i, op["paid"]):
+                    changed.add(i)
+                    done.append(payments.items[i]["name"])
+            lines.append(f"✅ {len(done)} payment(s) marked {state}: {', '.join(done)}" if done
+                         else f"No payments in that range to mark {state}.")
+
+        elif kind == "complete_all":
+            done = tasks.complete_between(op["start"], op["end"])
+            lines.append(f"✅ Completed {len(done)} task(s)" if done else "No open tasks in that range.")
+
+        elif kind == "complete":
+            hits = _task_matching(tasks, op["name"])
+            if len(hits) != 1:
+                names = ", ".join(f"'{t}' ({day:%a %d %b})" for day, _, t in hits)
+                lines.append(f"⚠️ Which task? {names}" if hits else f"⚠️ No open task matches '{op['name']}'.")
+            else:
+                day, i, _ = hits[0]
+                lines.append(f"✅ Completed '{tasks.complete(day, i)}' ({day:%a %d %b})")
+    return dict(lines=lines, payments=changed)
@@ -0,0 +1,101 @@
+"""
+AutoBot — Compiled Intent Matcher
+=================================
+Maps a chat message to an intent with one precompiled regex instead of
+substring checks in a loop: every intent's keywords become one named
+alternation group inside a single ``\\b…\\b`` pattern, so "hi" no longer
+fires inside "this" or "schedule", and the cost of a message doesn't grow
+with the number of intents.
+
+The intent table is plain data — pass your own list to ``IntentMatcher``.
+Each entry has a ``name``, its ``keywords`` and response ``templates``;
+earlier entries win when a message matches several. Templates are
+``str.format`` strings (or callables taking the context) over a lazy
+context, so only the fields of the one template picked are ever computed.
+"""
+
+import random
+import re
+
+DEFAULT_INTENT = "default"
+
+INTENTS = [
+    dict(name="greeting", keywords=["hi", "hii", "hello", "hey"], templates=[
+        "Hii! How can I help you today?",
+        "Hello {user}! What would you like to do?",
+        "Hey there! Ready to manage your tasks and payments?",
+    ]),
+    dict(name="schedule", keywords=["schedule", "schedules", "scheduled", "scheduling"], templates=[
+        lambda c: f"Meeting scheduled. Your tasks for {c['day']}: {c['tasks']}" if c["tasks"]
+                  else "Meeting scheduled! Your calendar is free today.",
+        "Meeting confirmed 📅",
+        "Scheduled successfully! Check your agenda 🗓️",
+    ]),
+    dict(name="remind", keywords=["remind", "reminds", "reminder", "reminders"], templates=[
+        "Reminder set. Pending payments: {pending}",
+        "Got it! I will remind you at the scheduled time ⏰",
+        "Reminder confirmed! You won't forget this task ✅",
+    ]),
+    dict(name="payment", keywords=["payment", "payments"], templates=[
+        "Payment info: {payments}",
+        "Payment scheduled successfully 💳",
+        "Payment recorded in your dashboard ✅",
+    ]),
+    dict(name="task", keywords=["task", "tasks"], templates=[
+        lambda c: f"Task list updated for {c['day']}: {c['tasks']}" if c["tasks"]
+                  else "No tasks yet, but new task added ✅",
+        "New task added to your list 📝",
+        "Task logged successfully! Stay productive 💪",
+    ]),
+    dict(name=DEFAULT_INTENT, keywords=[], templates=[
+        "Got it! ✅",
+        "Understood! Logged successfully 🗒️",
+        "Noted! I’ll keep track of this 📝",
+        "Okay! Added to your dashboard 📌",
+        "Message received! You’re all set 🌟",
+        "Done! Your instructions are saved ✅",
+    ]),
+]
+
+
+class LazyContext(dict):
+    """Template fields computed on first use: ``LazyContext(tasks=lambda: …)``."""
+
+    def __init__(self, **sources):
+        super().__init__()
+        self._sources = sources
+
+    def __missing__(self, key):
+        value = self[key] = self._sources[key]()
+        return value
+
+
+class IntentMatcher:
+    """One compiled word-boundary regex over every intent's keywords."""
+
+    def __init__(self, intents: list = INTENTS):
+        self.intents = {i["name"]: i for i in intents}
+        self._rank = {name: r for r, name in enumerate(self.intents)}
+        self._groups = {}                                     # regex group → intent name
+        alts = []
+        for n, intent in enumerate(intents):
+            if intent["keywords"]:
+                words = sorted(intent["keywords"], key=len, reverse=True)
+                self._groups[f"i{n}"] = intent["name"]
+                alts.append(f"(?P<i{n}>{'|'.join(map(re.escape, words))})")
+        self._pattern = re.compile(r"\b(?:" + "|".join(alts) + r")\b", re.IGNORECASE) if alts else None
+
+    def match(self, text: str) -> str:
+        """Name of the highest-priority intent mentioned in ``text``."""
+        if self._pattern is None:
+            return DEFAULT_INTENT
+        found = {self._groups[m.lastgroup] for m in self._pattern.finditer(text)}
+        return min(found, key=self._rank.__getitem__) if found else DEFAULT_INTENT
+
+    def render(self, intent: str, context: dict, rng=random) -> str:
+        """One of ``intent``'s templates, filled from ``context``."""
+        template = rng.choice(self.intents[intent]["templates"])
+        return template(context) if callable(template) else template.format_map(context)
+
+    def reply(self, text: str, context: dict, rng=random) -> str:
+        return self.render(self.match(text), context, rng)
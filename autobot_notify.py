@@ -0,0 +1,153 @@
+"""
+AutoBot — Notification Log
+==========================
+The dashboard's notifications, bounded in memory and kept on disk.
+
+Only the newest ``MAXLEN`` notifications live in session state, in a
+``collections.deque(maxlen=…)`` that drops the oldest as new ones arrive.
+Every notification is also appended, as one JSON line, to an append-only
+log file, so nothing is lost when the deque evicts it and the history
+survives restarts. The "older notifications" view reads that file back one
+page at a time, walking backwards from its end: page ``k`` reads past the
+``k`` newer pages first, so its cost grows with how deep you page, not with
+how long the log has grown.
+
+Each user has their own log file, ``<name>-<hash>.jsonl`` under
+``$AUTOBOT_LOG_DIR`` (default ``autobot_notifications/`` in the working
+directory), so one user's history never shows up for another. Sessions of
+the same user share it: before every read the log checks the file size and,
+if someone else appended, counts only the new bytes and reloads the deque
+from the tail, so the deque is always the newest lines on disk. Only whole
+lines are read: a line still being written (or cut short when a process
+died) is left for later, and lines that don't parse are skipped.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+LOG_DIR = os.environ.get("AUTOBOT_LOG_DIR", "autobot_notifications")
+MAXLEN  = 50            # notifications kept in memory
+BLOCK   = 64 * 1024     # bytes read per step when walking the log backwards
+
+
+def log_path(user: str, directory: str = LOG_DIR) -> str:
+    """The per-user log file (readable name plus a hash, so names never collide)."""
+    slug = re.sub(r"[^a-z0-9]+", "-", user.lower()).strip("-") or "user"
+    digest = hashlib.sha1(user.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(directory, f"{slug}-{digest}.jsonl")
+
+
+class NotificationLog:
+    """One user's recent notifications, backed by their append-only JSONL file."""
+
+    def __init__(self, user: str, directory: str = LOG_DIR, maxlen: int = MAXLEN):
+        self.path = log_path(user, directory)
+        self.recent = collections.deque(maxlen=maxlen)          # dict(t, text), oldest first
+        self.total = 0                                          # lines in the file
+        self._size = 0                                          # file size those lines cover
+        self._refresh()
+
+    def _file_size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def _refresh(self):
+        """Catch up with lines another session of this user appended."""
+        size = self._file_size()
+        if size == self._size:
+            return
+        if size < self._size:                                   # file was replaced: recount
+            self.total, self._size = 0, 0
+        pos = end = self._size
+        with open(self.path, "rb") as f:
+            f.seek(pos)
+            while block := f.read(BLOCK):
+                if (lines := block.count(b"\n")):
+                    self.total += lines
+                    end = pos + block.rindex(b"\n") + 1
+                pos += len(block)
+        if end == self._size:                                   # nothing but a partial line
+            return
+        self._size = end                                        # whole lines only
+        self.recent.clear()
+        self.recent.extend(_entries(_tail(self.path, self.recent.maxlen, end)))
+
+    # ── writing ──────────────────────────────────────
+    def extend(self, texts):
+        entries = [dict(t=datetime.now().isoformat(timespec="seconds"), text=t) for t in texts]
+        if not entries:
+            return
+        self._refresh()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+        # appends are one write each, so a partial last line is one whose writer
+        # died: end it, or our first entry would be glued onto it
+        if self._file_size() > self._size:
+            data = b"\n" + data
+        with open(self.path, "ab") as f:
+            f.write(data)
+        if self._file_size() == self._size + len(data):         # nobody else wrote in between
+            self.recent.extend(entries)
+            self.total += len(entries)
+            self._size += len(data)
+        else:
+            self._refresh()
+
+    def append(self, text: str):
+        self.extend([text])
+
+    # ── reading ──────────────────────────────────────
+    def latest(self, n: int) -> list[str]:
+        """Texts of the newest ``n`` notifications, oldest first (from memory)."""
+        self._refresh()
+        start = max(0, len(self.recent) - n)
+        return [e["text"] for i, e in enumerate(self.recent) if i >= start]
+
+    def __len__(self):
+        self._refresh()
+        return self.total
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def page(self, page: int, size: int = 10, skip: int = 0) -> list[dict]:
+        """Page ``page`` (0 = newest) of the on-disk log, newest first, after
+        skipping the ``skip`` newest lines. Reads only the tail it needs."""
+        self._refresh()
+        newer = skip + page * size
+        lines = _tail(self.path, newer + size, self._size)
+        older = lines[:max(0, len(lines) - newer)]
+        return _entries(reversed(older[-size:]))
+
+    def pages(self, size: int = 10, skip: int = 0) -> int:
+        return max(0, -(-(len(self) - skip) // size))
+
+
+def _entries(lines) -> list[dict]:
+    """Parsed log lines; ones that aren't a whole ``{"t", "text"}`` record are skipped."""
+    out = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and "t" in entry and "text" in entry:
+            out.append(entry)
+    return out
+
+
+def _tail(path: str, n: int, end: int) -> list[bytes]:
+    """The last ``n`` lines of ``path`` before byte ``end`` (oldest first), read backwards in blocks."""
+    if n <= 0 or end <= 0 or not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        buf, pos = b"", end
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    return buf.splitlines()[-n:]
@@ -0,0 +1,147 @@
+"""
+AutoBot — Date-Indexed Task & Payment Stores
+============================================
+Tasks and payments keyed by real ``date`` objects instead of "%Y-%m-%d"
+strings, with the dashboard's sidebar counters kept up to date on every
+add / complete / toggle, so reading them is O(1) however many years of
+tasks a user has.
+
+Dates live in a sorted list next to the per-date dict, so range queries
+("next 7 days") bisect to the first day and walk only the days in range.
+The counters split at ``today``; when the date changes, ``roll`` moves just
+the days that crossed the boundary.
+"""
+
+import bisect
+from datetime import date, timedelta
+
+
+class TaskStore:
+    """Open tasks per day, plus completed / upcoming counters.
+
+    A task counts as completed once it is checked off, or once its day has
+    passed (as the dashboard has always treated past days); upcoming are the
+    open tasks from ``today`` on.
+    """
+
+    def __init__(self, today: date = None):
+        self.today = today or date.today()
+        self._days = []                 # sorted dates with at least one open task
+        self._tasks = {}                # date → [task, …]
+        self.checked = 0                # tasks checked off
+        self.past = 0                   # open tasks on days before today
+        self.upcoming = 0               # open tasks on today or later
+
+    # ── queries ──────────────────────────────────────
+    @property
+    def completed(self) -> int:
+        return self.checked + self.past
+
+    def on(self, day: date) -> list:
+        """Open tasks for ``day`` (a copy — change them through the store)."""
+        return list(self._tasks.get(day, ()))
+
+    def between(self, start: date, end: date) -> list:
+        """``[(day, tasks), …]`` for start ≤ day < end, in date order."""
+        lo = bisect.bisect_left(self._days, start)
+        hi = bisect.bisect_left(self._days, end, lo)
+        return [(d, list(self._tasks[d])) for d in self._days[lo:hi]]
+
+    def next_days(self, n: int = 7) -> list:
+        return self.between(self.today, self.today + timedelta(days=n))
+
+    def __len__(self):
+        return self.past + self.upcoming
+
+    # ── updates ──────────────────────────────────────
+    def _count(self, day: date, n: int):
+        if day < self.today:
+            self.past += n
+        else:
+            self.upcoming += n
+
+    def add(self, day: date, task: str):
+        if day not in self._tasks:
+            bisect.insort(self._days, day)
+            self._tasks[day] = []
+        self._tasks[day].append(task)
+        self._count(day, 1)
+
+    def complete(self, day: date, index: int) -> str:
+        """Check off the ``index``-th open task of ``day``; returns its text."""
+        tasks = self._tasks[day]
+        task = tasks.pop(index)
+        if not tasks:
+            del self._tasks[day]
+            del self._days[bisect.bisect_left(self._days, day)]
+        self._count(day, -1)
+        self.checked += 1
+        return task
+
+    def complete_between(self, start: date, end: date) -> list:
+        """Check off every open task with start ≤ day < end in one go; returns ``[(day, task), …]``."""
+        lo = bisect.bisect_left(self._days, start)
+        hi = bisect.bisect_left(self._days, end, lo)
+        done = []
+        for day in self._days[lo:hi]:
+            tasks = self._tasks.pop(day)
+            self._count(day, -len(tasks))
+            done.extend((day, t) for t in tasks)
+        del self._days[lo:hi]
+        self.checked += len(done)
+        return done
+
+    def roll(self, today: date):
+        """Move the counters to a new ``today`` (only days that crossed it are touched)."""
+        if today == self.today:
+            return
+        lo, hi = sorted((self.today, today))
+        moved = sum(len(tasks) for _, tasks in self.between(lo, hi))
+        if today > self.today:
+            self.upcoming -= moved
+            self.past += moved
+        else:
+            self.past -= moved
+            self.upcoming += moved
+        self.today = today
+
+
+class PaymentStore:
+    """Payments in the order they were added, indexed by due date, with a
+    pending counter maintained on add / toggle."""
+
+    def __init__(self):
+        self.items = []                 # dict(name, amount, due: date, paid), insertion order
+        self._by_due = []               # sorted (due, position)
+        self.pending = 0
+
+    def add(self, name: str, amount: str, due: date, paid: bool = False):
+        self.items.append(dict(name=name, amount=amount, due=due, paid=paid))
+        bisect.insort(self._by_due, (due, len(self.items) - 1))
+        self.pending += not paid
+
+    def set_paid(self, index: int, paid: bool) -> bool:
+        """Mark payment ``index`` paid / pending; returns True if it changed."""
+        p = self.items[index]
+        if p["paid"] == paid:
+            return False
+        p["paid"] = paid
+        self.pending += -1 if paid else 1
+        return True
+
+    def due_indices(self, start: date, end: date) -> list:
+        """Positions of the payments with start ≤ due < end, earliest first."""
+        lo = bisect.bisect_left(self._by_due, (start, -1))
+        hi = bisect.bisect_left(self._by_due, (end, -1), lo)
+        return [i for _, i in self._by_due[lo:hi]]
+
+    def due_between(self, start: date, end: date, unpaid_only: bool = False) -> list:
+        """Payments with start ≤ due < end, earliest first."""
+        out = [self.items[i] for i in self.due_indices(start, end)]
+        return [p for p in out if not p["paid"]] if unpaid_only else out
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)